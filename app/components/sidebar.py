@@ -7,6 +7,8 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import THEME
+from utils.common import filter_by_date_range
+from utils.perf import span
 
 
 def render_sidebar(df, authenticator, name):
@@ -57,7 +59,8 @@ def render_sidebar(df, authenticator, name):
     # 필터링된 데이터 반환
     if isinstance(date_range, tuple) and len(date_range) == 2:
         start, end = date_range
-        filtered_df = df[(df['date'].dt.date >= start) & (df['date'].dt.date <= end)]
+        with span('sidebar.filter'):
+            filtered_df = filter_by_date_range(df, start, end)
         selected_days = (end - start).days + 1
     else:
         filtered_df = df
@@ -9,14 +9,43 @@ PROJECT_ROOT = os.path.dirname(APP_DIR)
 
 # 파일 경로
 ICON_PATH = os.path.join(PROJECT_ROOT, 'assets', 'logo.ico')
-CONFIG_PATH = os.path.join(PROJECT_ROOT, 'config.yaml')
+CONFIG_PATH = os.getenv('KILOSTONE_CONFIG', os.path.join(PROJECT_ROOT, 'config.yaml'))
 DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
 BLOCKED_USERS_FILE = os.path.join(DATA_DIR, 'blocked_users.json')
 LOGIN_ATTEMPTS_FILE = os.path.join(DATA_DIR, 'login_attempts.json')
+METRICS_FILE = os.path.join(DATA_DIR, 'metrics.prom')
+PROFILE_DIR = os.path.join(DATA_DIR, 'profiles')
 
 # 로그인 설정
 MAX_LOGIN_ATTEMPTS = 5
 
+# 로그인 이후에만 필요한 무거운 모듈 (plotly, pandas, sqlalchemy 등)
+# 로그인 화면 첫 렌더링을 늦추지 않도록 인증 성공 후에 import 한다. (main.py / scripts/import_report.py 공용)
+DEFERRED_MODULES = (
+    'services.data_loader',
+    'components.sidebar',
+    'views.overview',
+    'views.vehicle',
+)
+
+# 관리자 계정 (성능 모니터 탭 노출 대상, 쉼표로 구분)
+ADMIN_USERNAMES = [u.strip() for u in os.getenv('ADMIN_USERNAMES', '').split(',') if u.strip()]
+
+# 성능 지표 파일 저장 최소 간격 (초)
+METRICS_FLUSH_INTERVAL = 15
+
+# 프로파일링 설정 (KILOSTONE_PROFILE=1 또는 관리자 + ?profile=1 일 때만 동작)
+PROFILE_KEEP = 50                 # 보관할 최근 프로파일 수
+PROFILE_SAMPLE_INTERVAL = 0.005   # 스택 샘플링 간격 (초)
+
+# 데이터 캐시 설정 (초)
+# - PROBE_INTERVAL: 변경 감지 쿼리(COUNT/MAX) 실행 간격. 지문이 바뀔 때만 다시 로드한다.
+# - CACHE_TTL: 지문이 그대로여도 이 시간이 지나면 전체 재로드 (제자리 UPDATE 대비 안전망)
+# - REFRESH_AHEAD: 변경 감지를 쓰지 않을 때, TTL 만료 몇 초 전에 미리 갱신할지
+DATA_PROBE_INTERVAL = 5
+DATA_CACHE_TTL = 3600
+DATA_REFRESH_AHEAD = 60
+
 # Google AI Studio 스타일 팔레트
 THEME = {
     "bg_main": "#121212",       
@@ -2,9 +2,10 @@
 KiloStone Dashboard - Main Entry Point
 """
 import streamlit as st
-import streamlit_authenticator as stauth
 import yaml
 from yaml.loader import SafeLoader
+import importlib
+import threading
 import sys
 import os
 
@@ -12,16 +13,17 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # 내부 모듈
-from config import ICON_PATH, CONFIG_PATH, THEME, LABEL_MAP, MAX_LOGIN_ATTEMPTS
+from config import (
+    ICON_PATH, CONFIG_PATH, THEME, LABEL_MAP, MAX_LOGIN_ATTEMPTS,
+    ADMIN_USERNAMES, METRICS_FILE, METRICS_FLUSH_INTERVAL, DEFERRED_MODULES
+)
 from styles import get_css
+from utils.perf import span, flush_prometheus
+from utils.profiling import maybe_profile
 from auth.login_guard import (
     get_client_ip, is_blocked, get_login_attempts,
     increment_login_attempts, reset_login_attempts, block_user
 )
-from components.sidebar import render_sidebar
-from views.overview import render_overview_tab
-from views.vehicle import render_vehicle_tab
-from services.data_loader import load_data
 
 
 # -----------------------------------------------------------------------------
@@ -38,6 +40,27 @@ st.set_page_config(
 st.markdown(get_css(), unsafe_allow_html=True)
 
 
+# -----------------------------------------------------------------------------
+# 지연 import (Cold Start 최적화)
+# -----------------------------------------------------------------------------
+def _import_deferred_modules():
+    """대시보드 모듈 import (config.DEFERRED_MODULES, 모듈별 시간은 scripts/import_report.py 로 확인)"""
+    for name in DEFERRED_MODULES:
+        importlib.import_module(name)
+
+
+@st.cache_resource(show_spinner=False)
+def _prewarm_dashboard_modules():
+    """
+    프로세스당 1회, 백그라운드 스레드에서 대시보드 모듈을 미리 import
+    - 사용자가 로그인 폼을 입력하는 동안 plotly 등을 적재해 둔다.
+    - 로그인 화면 렌더링은 이 작업을 기다리지 않는다.
+    """
+    thread = threading.Thread(target=_import_deferred_modules, name="kilostone-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
 # -----------------------------------------------------------------------------
 # 헬퍼 함수
 # -----------------------------------------------------------------------------
@@ -117,7 +140,10 @@ def main():
         _show_blocked_message()
         return
 
+    _prewarm_dashboard_modules()
+
     # 인증
+    import streamlit_authenticator as stauth
     authenticator = stauth.Authenticate(
         config['credentials'],
         config['cookie']['name'],
@@ -174,32 +200,56 @@ def main():
     # =========================================================================
     # 성공 시 해당 IP 카운트 초기화
     reset_login_attempts(client_ip)
-    
+
+    _render_dashboard(authenticator, name, username)
+
+
+def _render_dashboard(authenticator, name, username):
+    """로그인 성공 후 대시보드 렌더링"""
+    with span('imports'):
+        from services.data_loader import load_data
+        from components.sidebar import render_sidebar
+        from views.overview import render_overview_tab
+        from views.vehicle import render_vehicle_tab
+
     # 데이터 로드
-    df = load_data()
+    with span('load'):
+        df = load_data()
     
     # 사이드바
-    with st.sidebar:
+    with st.sidebar, span('sidebar'):
         filtered_df, selected_days, resample_option = render_sidebar(df, authenticator, name)
     
     if filtered_df is None:
         return
 
-    # 메인 컨텐츠
-    tab1, tab2 = st.tabs(["전체 운행 현황", "차량별 비교 분석"])
+    # 메인 컨텐츠 (관리자에게만 성능 모니터 탭 노출)
+    is_admin = username in ADMIN_USERNAMES
+    tab_names = ["전체 운행 현황", "차량별 비교 분석"]
+    if is_admin:
+        tab_names.append("성능 모니터")
+    tabs = st.tabs(tab_names)
 
-    with tab1:
+    with tabs[0], span('overview'):
         render_overview_tab(df, filtered_df, selected_days, resample_option)
 
-    with tab2:
+    with tabs[1], span('vehicle'):
         render_vehicle_tab(filtered_df)
 
+    if is_admin:
+        from views.performance import render_performance_tab
+        with tabs[2]:
+            render_performance_tab()
+
     # 하단 로그 데이터
     st.divider()
-    with st.expander("📋 전체 로그 데이터 확인하기", expanded=True):
-        display_df = filtered_df.rename(columns=LABEL_MAP).sort_values(by='날짜', ascending=False)
+    with st.expander("📋 전체 로그 데이터 확인하기", expanded=True), span('table'):
+        # 날짜 오름차순 정렬 데이터를 역순 슬라이스 (정렬/복사 없이 최신순 표시)
+        display_df = filtered_df.iloc[::-1].rename(columns=LABEL_MAP)
         st.dataframe(display_df, use_container_width=True, height=400)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with span('rerun'), maybe_profile('rerun'):
+        main()
+    flush_prometheus(METRICS_FILE, METRICS_FLUSH_INTERVAL)
\ No newline at end of file
@@ -3,41 +3,142 @@
 """
 import streamlit as st
 import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from services.database import get_db_engine
+from config import DATA_CACHE_TTL, DATA_REFRESH_AHEAD, DATA_PROBE_INTERVAL
+from services.database import get_shared_engine
+from services.dataset_cache import DatasetCache
+from services.shared_dataset import freeze, view
+from services.queries import (
+    SELECT_DRIVING_LOGS, SELECT_DRIVING_LOGS_AFTER_ID, SELECT_CHANGE_FINGERPRINT,
+    SELECT_CHANGE_FINGERPRINT_LEGACY, COUNT_UPDATED_SINCE
+)
+
+# updated_at 컬럼이 없는 DB 에 연결된 경우 True (한 번 확인 후 예전 지문 쿼리 사용)
+_legacy_schema = False
+
+
+def _normalize(df):
+    """DB 원본 → 대시보드용 타입 변환"""
+    df['date'] = pd.to_datetime(df['date'])
+
+    # 시간 변환
+    if 'time' in df.columns:
+        time_td = pd.to_timedelta(df['time'].astype(str), errors='coerce')
+        time_num = pd.to_numeric(df['time'], errors='coerce')
+        df['time_minutes'] = time_td.dt.total_seconds() / 60
+        df['time_minutes'] = df['time_minutes'].fillna(time_num).fillna(0)
+        df['time'] = df['time_minutes']
+
+    # 숫자 변환
+    numeric_cols = ['fuel_efficiency', 'speed', 'distance', 'cumulative_distance', 'consumed_fuel', 'refuel']
+    for col in numeric_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    return df
+
+
+def fetch_driving_logs(engine=None):
+    """운행 데이터 전체 조회 및 타입 변환 (Streamlit 비의존)"""
+    if engine is None:
+        engine = get_shared_engine()
+    return _normalize(pd.read_sql(text(SELECT_DRIVING_LOGS), engine))
+
+
+def probe_fingerprint(engine=None):
+    """변경 감지용 지문 조회: (행 수, 최대 id, 최대 created_at, 최대 updated_at)"""
+    global _legacy_schema
+    if engine is None:
+        engine = get_shared_engine()
+    with engine.connect() as conn:
+        if not _legacy_schema:
+            try:
+                return tuple(conn.execute(text(SELECT_CHANGE_FINGERPRINT)).one())
+            except DBAPIError:
+                conn.rollback()
+                _legacy_schema = True
+                print("⚠️ driving_logs.updated_at 없음: 예전 지문 쿼리 사용 (db_initializer 로 스키마 갱신 권장)")
+        return tuple(conn.execute(text(SELECT_CHANGE_FINGERPRINT_LEGACY)).one())
+
+
+def fetch_new_driving_logs(previous, old_fingerprint, new_fingerprint, engine=None):
+    """
+    추가(append)만 발생한 경우 새 행만 조회하여 기존 데이터에 병합
+    - 삭제/수정이 섞여 행 수가 맞지 않거나 기존 행이 갱신되었으면 None 반환 → 전체 로드로 대체
+    """
+    old_count, old_max_id, _, old_updated = old_fingerprint
+    new_count, new_max_id, _, new_updated = new_fingerprint
+    if old_max_id is None or new_max_id is None or new_count < old_count:
+        return None
+
+    if engine is None:
+        engine = get_shared_engine()
+    if new_updated != old_updated:
+        if old_updated is None:
+            return None
+        with engine.connect() as conn:
+            updated = conn.execute(
+                text(COUNT_UPDATED_SINCE), {'last_id': old_max_id, 'since': old_updated}
+            ).scalar()
+        if updated:
+            return None
+
+    delta = pd.read_sql(text(SELECT_DRIVING_LOGS_AFTER_ID), engine, params={'last_id': old_max_id})
+    if old_count + len(delta) != new_count:
+        return None
+    if delta.empty:
+        return previous
+
+    merged = pd.concat([previous, _normalize(delta)], ignore_index=True)
+    return merged.sort_values(by='date', kind='stable', ignore_index=True)
+
+
+def _load_frozen():
+    """전체 로드 → 불변 Arrow Table"""
+    return freeze(fetch_driving_logs())
+
+
+def _load_frozen_delta(previous, old_fingerprint, new_fingerprint):
+    """증분 로드 → 불변 Arrow Table (불가능하면 None)"""
+    previous_df = view(previous)
+    merged = fetch_new_driving_logs(previous_df, old_fingerprint, new_fingerprint)
+    if merged is None:
+        return None
+    if merged is previous_df:
+        return previous
+    return freeze(merged)
+
+
+@st.cache_resource(show_spinner=False)
+def get_dataset_cache():
+    """
+    프로세스 공용 데이터셋 캐시 (모든 세션이 공유, 변경 감지 시에만 재로드)
+    - 데이터는 프로세스당 1벌의 Arrow Table 로만 보관 (세션 수와 무관한 메모리 사용량)
+    """
+    cache = DatasetCache(
+        _load_frozen,
+        ttl=DATA_CACHE_TTL,
+        refresh_ahead=DATA_REFRESH_AHEAD,
+        name="driving_logs",
+        probe=probe_fingerprint,
+        probe_interval=DATA_PROBE_INTERVAL,
+        delta_loader=_load_frozen_delta,
+    )
+    cache.start()
+    return cache
 
 
-@st.cache_data(ttl=600)
 def load_data():
-    """운행 데이터 로드"""
+    """
+    운행 데이터 로드 (주기적 갱신은 백그라운드에서 수행되어 사용자 요청은 대기하지 않음)
+    - 반환값은 공유 데이터의 읽기 전용 뷰이므로 제자리(in-place) 수정하지 말 것
+    """
     try:
-        engine = get_db_engine()
-        query = """
-        SELECT date, vehicle_id, fuel_efficiency, speed, time, 
-               distance, cumulative_distance, consumed_fuel, refuel, reurea 
-        FROM driving_logs 
-        ORDER BY date ASC
-        """
-        df = pd.read_sql(query, engine)
-        df['date'] = pd.to_datetime(df['date'])
-        
-        # 시간 변환
-        if 'time' in df.columns:
-            time_td = pd.to_timedelta(df['time'].astype(str), errors='coerce')
-            time_num = pd.to_numeric(df['time'], errors='coerce')
-            df['time_minutes'] = time_td.dt.total_seconds() / 60
-            df['time_minutes'] = df['time_minutes'].fillna(time_num).fillna(0)
-            df['time'] = df['time_minutes']
-        
-        # 숫자 변환
-        numeric_cols = ['fuel_efficiency', 'speed', 'distance', 'cumulative_distance', 'consumed_fuel', 'refuel']
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-            
-        return df
+        return view(get_dataset_cache().get())
     except Exception as e:
         st.error(f"데이터 로드 중 오류 발생: {e}")
-        return pd.DataFrame()
\ No newline at end of file
+        return pd.DataFrame()
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
@@ -11,6 +12,11 @@ env_path = Path(__file__).resolve().parents[2] / ".env"
 load_dotenv(dotenv_path=env_path)
 
 def get_db_engine() -> Engine:
+    # 벤치마크/부하 테스트용: DATABASE_URL 이 있으면 해당 DB(SQLite 등)를 그대로 사용
+    database_url = os.getenv("DATABASE_URL")
+    if database_url:
+        return create_engine(database_url)
+
     try:
         user = os.getenv("DB_USER")
         password = os.getenv("DB_PASSWORD")
@@ -45,4 +51,10 @@ def get_db_engine() -> Engine:
 
     except Exception as e:
         print(f"❌ DB 연결 설정 중 오류 발생: {e}")
-        raise e
\ No newline at end of file
+        raise e
+
+
+@lru_cache(maxsize=1)
+def get_shared_engine() -> Engine:
+    """프로세스 공용 엔진 (커넥션 풀 재사용, 주기적 쿼리용)"""
+    return get_db_engine()
@@ -0,0 +1,167 @@
+"""
+프로세스 공용 데이터셋 캐시 (Single-flight + Refresh-ahead + 변경 감지)
+"""
+import threading
+import time
+from concurrent.futures import Future
+
+
+class DatasetCache:
+    """
+    프로세스 전체가 공유하는 데이터셋 캐시
+    - Single-flight: 동시에 여러 세션이 요청해도 로드는 한 번만 수행
+    - 변경 감지: probe 가 주어지면 가벼운 지문(fingerprint) 쿼리를 주기적으로 실행하고
+      지문이 바뀐 경우에만 다시 로드 (delta_loader 가 있으면 증분 로드 우선)
+    - Refresh-ahead: probe 가 없으면 TTL 만료 전에 백그라운드 스레드가 미리 갱신
+    - Stale-while-revalidate: 갱신 중에는 기존 데이터를 그대로 반환
+    """
+
+    def __init__(self, loader, ttl=600, refresh_ahead=60, name="dataset",
+                 probe=None, probe_interval=5, delta_loader=None):
+        self._loader = loader
+        self._ttl = ttl
+        self._refresh_ahead = refresh_ahead
+        self._name = name
+        self._probe = probe
+        self._probe_interval = probe_interval
+        self._delta_loader = delta_loader
+
+        self._lock = threading.Lock()
+        self._value = None
+        self._fingerprint = None
+        self._loaded_at = None
+        self._inflight = None
+        self._stop = threading.Event()
+        self._worker = None
+
+    # -------------------------------------------------------------------------
+    # 조회
+    # -------------------------------------------------------------------------
+    def get(self):
+        """데이터 반환 (최초 1회만 로드를 기다리고, 이후에는 절대 대기하지 않음)"""
+        with self._lock:
+            if self._value is not None:
+                return self._value
+            future = self._start_load_locked()
+
+        # 최초 로드: 동시에 들어온 요청은 모두 같은 Future 를 기다림
+        return future.result()
+
+    @property
+    def loaded_at(self):
+        """마지막 로드 완료 시각 (epoch seconds)"""
+        return self._loaded_at
+
+    @property
+    def fingerprint(self):
+        """마지막 로드 시점의 데이터 지문"""
+        return self._fingerprint
+
+    # -------------------------------------------------------------------------
+    # 갱신
+    # -------------------------------------------------------------------------
+    def refresh(self, fingerprint=None, full=False):
+        """백그라운드 갱신 요청 (이미 진행 중이면 해당 작업을 공유)"""
+        with self._lock:
+            return self._start_load_locked(fingerprint, full)
+
+    def _start_load_locked(self, fingerprint=None, full=False):
+        """진행 중인 로드가 없을 때만 새 로드를 시작 (lock 보유 상태에서 호출)"""
+        if self._inflight is not None:
+            return self._inflight
+
+        future = Future()
+        self._inflight = future
+        thread = threading.Thread(
+            target=self._run_load, args=(future, fingerprint, full),
+            name=f"{self._name}-load", daemon=True
+        )
+        thread.start()
+        return future
+
+    def _run_load(self, future, fingerprint, full):
+        try:
+            # 로드 '이전'에 지문을 찍어 두어야 로드 중 발생한 변경도 다음 probe 에서 잡힌다
+            if fingerprint is None and self._probe is not None:
+                fingerprint = self._probe()
+            value = self._load(fingerprint, full)
+        except Exception as e:
+            with self._lock:
+                self._inflight = None
+            # 기존 데이터가 있으면 그대로 유지 (Stale 데이터 계속 제공)
+            print(f"⚠️ [{self._name}] 데이터 갱신 실패: {e}")
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self._value = value
+            self._fingerprint = fingerprint
+            self._loaded_at = time.time()
+            self._inflight = None
+        future.set_result(value)
+
+    def _load(self, fingerprint, full):
+        """증분 로드가 가능하면 증분, 아니면 전체 로드"""
+        if (not full and self._delta_loader is not None
+                and self._value is not None and self._fingerprint is not None):
+            value = self._delta_loader(self._value, self._fingerprint, fingerprint)
+            if value is not None:
+                return value
+        return self._loader()
+
+    # -------------------------------------------------------------------------
+    # 주기적 갱신 스레드
+    # -------------------------------------------------------------------------
+    def start(self):
+        """갱신 스레드 시작 (중복 호출 시 무시)"""
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(
+                target=self._refresh_loop, name=f"{self._name}-refresher", daemon=True
+            )
+            self._worker.start()
+
+    def stop(self):
+        """갱신 스레드 종료"""
+        self._stop.set()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self._next_wait()):
+            try:
+                future = self._poll()
+                if future is not None:
+                    future.result()
+            except Exception as e:
+                # 실패 시 다음 주기에 재시도
+                print(f"⚠️ [{self._name}] 변경 감지 실패: {e}")
+
+    def _poll(self):
+        """갱신이 필요하면 로드를 시작하고 Future 반환"""
+        if self._probe is None:
+            return self.refresh(full=True)
+
+        # 아직 한 번도 로드되지 않았다면 첫 get() 이 로드를 담당
+        if self._loaded_at is None:
+            return None
+
+        fingerprint = self._probe()
+        if fingerprint != self._fingerprint:
+            return self.refresh(fingerprint)
+
+        # 지문이 같아도 TTL(안전망)이 지나면 전체 재검증
+        if time.time() - self._loaded_at >= self._ttl:
+            return self.refresh(fingerprint, full=True)
+        return None
+
+    def _next_wait(self):
+        """다음 점검까지 대기 시간"""
+        if self._probe is not None:
+            return self._probe_interval
+
+        # TTL 만료 refresh_ahead 초 전에 갱신
+        period = max(1.0, self._ttl - self._refresh_ahead)
+        if self._loaded_at is None:
+            return period
+        age = time.time() - self._loaded_at
+        return max(1.0, period - age)
@@ -0,0 +1,48 @@
+"""
+대시보드 SQL 쿼리 모음
+"""
+
+# 대시보드 표시 컬럼
+DRIVING_LOG_COLUMNS = """
+    date, vehicle_id, fuel_efficiency, speed, time,
+    distance, cumulative_distance, consumed_fuel, refuel, reurea
+"""
+
+# 전체 운행 데이터
+SELECT_DRIVING_LOGS = f"""
+SELECT {DRIVING_LOG_COLUMNS}
+FROM driving_logs
+ORDER BY date ASC
+"""
+
+# 증분 로드: 마지막 로드 이후 추가된 행 (AUTO_INCREMENT id 기준)
+SELECT_DRIVING_LOGS_AFTER_ID = f"""
+SELECT {DRIVING_LOG_COLUMNS}
+FROM driving_logs
+WHERE id > :last_id
+ORDER BY date ASC
+"""
+
+# 변경 감지용 지문 (Fingerprint)
+# 전체 데이터를 읽지 않고 집계값만 조회하므로 수 초 간격으로 실행해도 부담이 적다.
+# MAX(updated_at): 행 수/최대 id 가 그대로인 Upsert 갱신도 감지
+SELECT_CHANGE_FINGERPRINT = """
+SELECT COUNT(*) AS row_count, MAX(id) AS max_id, MAX(created_at) AS max_created_at,
+       MAX(updated_at) AS max_updated_at
+FROM driving_logs
+"""
+
+# updated_at 컬럼이 없는 예전 스키마용
+SELECT_CHANGE_FINGERPRINT_LEGACY = """
+SELECT COUNT(*) AS row_count, MAX(id) AS max_id, MAX(created_at) AS max_created_at,
+       NULL AS max_updated_at
+FROM driving_logs
+"""
+
+# 증분 로드 가능 여부 확인: 기존 행(id <= last_id) 중 마지막 로드 이후 갱신된 행 수
+# (updated_at 은 TIMESTAMP(6) 이므로 직전 MAX(updated_at) 와 같은 초에 갱신된 행도 '>' 로 구분됨)
+COUNT_UPDATED_SINCE = """
+SELECT COUNT(*)
+FROM driving_logs
+WHERE id <= :last_id AND updated_at > :since
+"""
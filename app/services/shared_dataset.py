@@ -0,0 +1,40 @@
+"""
+프로세스 공용 불변(Immutable) 데이터셋
+- 로드한 DataFrame 을 Arrow Table 로 한 번만 보관
+- 세션에는 Arrow 버퍼를 그대로 가리키는 읽기 전용 DataFrame 뷰를 제공 (복사 없음)
+- 뷰를 수정해도 공용 버퍼가 바뀌지 않는 것은 pandas 3 의 기본 Copy-on-Write 동작에 의존 (requirements.txt: pandas>=3)
+"""
+import pandas as pd
+import pyarrow as pa
+
+_STRING_DTYPE = pd.ArrowDtype(pa.string())
+
+
+def freeze(df):
+    """
+    DataFrame → 불변 Arrow Table
+    - 숫자 컬럼은 NaN 을 null 로 바꾸지 않고 그대로 둔다 (null 이 있으면 to_pandas 시 복사가 발생)
+    - 문자열 컬럼은 Arrow string 으로 보관하여 뷰 생성 시에도 복사하지 않는다
+    """
+    arrays = []
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_datetime64_any_dtype(series.dtype):
+            arrays.append(pa.array(series.to_numpy(), from_pandas=False))
+        else:
+            arrays.append(pa.array(series.astype('string'), type=pa.string()))
+    return pa.Table.from_arrays(arrays, names=[str(c) for c in df.columns])
+
+
+def view(table):
+    """
+    Arrow Table → 읽기 전용 DataFrame 뷰
+    - 반환된 DataFrame 의 숫자/날짜 배열은 Arrow 메모리를 공유하며 쓰기 불가(writeable=False)
+    - 컬럼 재할당 등 세션 쪽 변경은 해당 세션의 DataFrame 에만 반영된다 (공유 데이터는 불변)
+    """
+    return table.to_pandas(
+        split_blocks=True,
+        self_destruct=False,
+        types_mapper={pa.string(): _STRING_DTYPE}.get,
+    )
+
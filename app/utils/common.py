@@ -0,0 +1,16 @@
+"""
+공통 유틸리티
+"""
+import pandas as pd
+
+
+def filter_by_date_range(df, start, end):
+    """
+    날짜 구간 필터 (start, end 포함)
+    - df 는 'date' 기준 오름차순 정렬되어 있어야 함 (load_data 가 보장)
+    - 이진 탐색 후 iloc 슬라이스를 반환하므로 데이터를 복사하지 않는다
+    """
+    dates = df['date'].to_numpy()
+    lo = dates.searchsorted(pd.Timestamp(start).to_datetime64(), side='left')
+    hi = dates.searchsorted((pd.Timestamp(end) + pd.Timedelta(days=1)).to_datetime64(), side='left')
+    return df.iloc[lo:hi]
@@ -0,0 +1,127 @@
+"""
+Rerun 단계별 소요 시간 측정 (Span/Timer)
+- 프로세스 메모리에 단계별 최근 샘플을 보관하고 백분위수(p50/p90/p99)를 계산
+- 동일한 지표를 Prometheus 텍스트 포맷 파일로 내보냄
+"""
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# 단계별 보관 샘플 수 (백분위수 계산 창)
+MAX_SAMPLES = 1000
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+_lock = threading.Lock()
+_samples = {}      # stage -> deque[seconds]
+_totals = {}       # stage -> [count, sum_seconds] (프로세스 시작 후 누적)
+_last_flush = 0.0
+
+
+@contextmanager
+def span(stage):
+    """with span('overview.resample'): ... 형태로 구간 시간 측정"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+
+def timed(stage):
+    """함수 전체를 측정하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record(stage, seconds):
+    """측정값 1건 기록"""
+    with _lock:
+        if stage not in _samples:
+            _samples[stage] = deque(maxlen=MAX_SAMPLES)
+            _totals[stage] = [0, 0.0]
+        _samples[stage].append(seconds)
+        _totals[stage][0] += 1
+        _totals[stage][1] += seconds
+
+
+def _quantile(sorted_values, q):
+    """Nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+def snapshot():
+    """단계별 통계 목록 반환 (단위: 초)"""
+    with _lock:
+        items = [(stage, sorted(values), list(_totals[stage])) for stage, values in _samples.items()]
+
+    stats = []
+    for stage, values, (count, total) in sorted(items):
+        row = {'stage': stage, 'count': count, 'sum': total}
+        for q in QUANTILES:
+            row[f'p{int(q * 100)}'] = _quantile(values, q)
+        row['max'] = values[-1] if values else 0.0
+        stats.append(row)
+    return stats
+
+
+def reset():
+    """측정값 초기화"""
+    with _lock:
+        _samples.clear()
+        _totals.clear()
+
+
+def to_prometheus(stats=None):
+    """Prometheus 텍스트 포맷(summary)으로 변환"""
+    if stats is None:
+        stats = snapshot()
+    lines = [
+        "# HELP kilostone_stage_seconds Dashboard rerun stage latency in seconds.",
+        "# TYPE kilostone_stage_seconds summary",
+    ]
+    for row in stats:
+        label = row['stage'].replace('\\', '\\\\').replace('"', '\\"')
+        for q in QUANTILES:
+            lines.append(
+                f'kilostone_stage_seconds{{stage="{label}",quantile="{q}"}} {row[f"p{int(q * 100)}"]:.6f}'
+            )
+        lines.append(f'kilostone_stage_seconds_sum{{stage="{label}"}} {row["sum"]:.6f}')
+        lines.append(f'kilostone_stage_seconds_count{{stage="{label}"}} {row["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    """지표 파일 저장 (임시 파일 작성 후 교체하여 읽는 쪽이 깨진 파일을 보지 않게 함)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(to_prometheus())
+    os.replace(tmp_path, path)
+
+
+def flush_prometheus(path, min_interval=15):
+    """마지막 저장 후 min_interval 초가 지났을 때만 저장 (매 rerun 마다 디스크 쓰기 방지)"""
+    global _last_flush
+    now = time.time()
+    with _lock:
+        if now - _last_flush < min_interval:
+            return False
+        _last_flush = now
+    try:
+        write_prometheus(path)
+    except OSError as e:
+        print(f"⚠️ 성능 지표 저장 실패: {e}")
+        return False
+    return True
@@ -0,0 +1,136 @@
+"""
+Rerun 단위 프로파일링 (Opt-in)
+- 활성화 조건: 환경변수 KILOSTONE_PROFILE=1 또는 관리자 계정 + URL 쿼리 ?profile=1
+- 결과물 (data/profiles/):
+    *.pstats     : cProfile 결과 (python -m pstats, snakeviz 등으로 열람)
+    *.collapsed  : 스택 샘플링 결과 (flamegraph.pl / speedscope 에 바로 입력 가능)
+- 비활성 상태에서는 조건 검사 한 번 외에 오버헤드 없음
+- cProfile 은 프로세스에 하나만 켤 수 있으므로 (Python 3.12+), 다른 세션이 프로파일링 중인 rerun 은
+  스택 샘플링만 수행하고 .pstats 없이 .collapsed 만 저장
+"""
+import cProfile
+import glob
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+import streamlit as st
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import ADMIN_USERNAMES, PROFILE_DIR, PROFILE_KEEP, PROFILE_SAMPLE_INTERVAL
+
+PROFILE_ENV = 'KILOSTONE_PROFILE'
+# cProfile 동시 사용 방지 (세션별 rerun 은 각자 다른 스레드에서 실행됨)
+_CPROFILE_LOCK = threading.Lock()
+
+
+def is_profiling_requested():
+    """환경변수 또는 관리자 쿼리 파라미터로 프로파일링이 요청되었는지 확인"""
+    if os.getenv(PROFILE_ENV) == '1':
+        return True
+    try:
+        if st.query_params.get('profile') != '1':
+            return False
+        return st.session_state.get('username') in ADMIN_USERNAMES
+    except Exception:
+        return False
+
+
+def maybe_profile(label='rerun'):
+    """요청된 경우에만 프로파일러로 감싸는 컨텍스트 (아니면 nullcontext)"""
+    if not is_profiling_requested():
+        return nullcontext()
+    return profile(label)
+
+
+class _StackSampler:
+    """대상 스레드의 호출 스택을 주기적으로 샘플링하여 collapsed 스택 집계"""
+
+    def __init__(self, thread_id, interval):
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="kilostone-sampler", daemon=True)
+        self.stacks = Counter()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.ident is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+
+@contextmanager
+def profile(label='rerun'):
+    """cProfile(결정적) + 스택 샘플링을 동시에 수행하고 파일로 저장 (cProfile 사용 중이면 샘플링만)"""
+    profiler = None
+    sampler = _StackSampler(threading.get_ident(), PROFILE_SAMPLE_INTERVAL)
+    start = time.perf_counter()
+
+    try:
+        sampler.start()
+        if _CPROFILE_LOCK.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # 외부 프로파일러 등 다른 도구가 이미 활성 상태
+                _CPROFILE_LOCK.release()
+                profiler = None
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            _CPROFILE_LOCK.release()
+        sampler.stop()
+        elapsed = time.perf_counter() - start
+        _save(label, profiler, sampler.stacks, elapsed)
+
+
+def _save(label, profiler, stacks, elapsed):
+    """프로파일 저장 및 오래된 파일 정리 (profiler 가 None 이면 샘플링 결과만)"""
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        base = os.path.join(PROFILE_DIR, f"{label}_{stamp}_{int(elapsed * 1000)}ms")
+
+        if profiler is not None:
+            profiler.dump_stats(f"{base}.pstats")
+        with open(f"{base}.collapsed", 'w', encoding='utf-8') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        print(f"[profile] {label}: {elapsed * 1000:.0f}ms → {base}.{'pstats' if profiler is not None else 'collapsed'}")
+        _rotate()
+    except OSError as e:
+        print(f"⚠️ 프로파일 저장 실패: {e}")
+
+
+def _rotate():
+    """최근 PROFILE_KEEP 개의 프로파일만 유지"""
+    files = sorted(glob.glob(os.path.join(PROFILE_DIR, '*.collapsed')), key=os.path.getmtime)
+    for old in files[:max(0, len(files) - PROFILE_KEEP)]:
+        for path in (old, old[:-len('.collapsed')] + '.pstats'):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
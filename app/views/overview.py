@@ -2,6 +2,7 @@
 TAB 1: 전체 운행 현황
 """
 import streamlit as st
+import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import sys
@@ -12,21 +13,59 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import THEME, LABEL_MAP
 from components.charts import create_clean_chart
 from components.kpi_cards import render_kpi
+from utils.perf import span, timed
+
+# 월말 리샘플 별칭 ('M' 은 pandas 2.2 에서 'ME' 로 변경, pandas 3 에서 제거됨)
+_MONTH_END = 'ME' if tuple(int(v) for v in pd.__version__.split('.')[:2]) >= (2, 2) else 'M'
+
+
+def resample_chart_data(filtered_df, resample_option):
+    """보기 방식(일/주/월)에 맞게 차트용 데이터 리샘플링"""
+    # 공유 데이터는 읽기 전용이므로 복사 없이 새 결과만 생성
+    if "주별" in resample_option:
+        return filtered_df.resample('W-MON', on='date').mean(numeric_only=True).reset_index()
+    if "월별" in resample_option:
+        return filtered_df.resample(_MONTH_END, on='date').mean(numeric_only=True).reset_index()
+    return filtered_df
+
+
+def compute_kpis(df, filtered_df, selected_days):
+    """KPI 값 계산 (전체 기간 일평균 대비 선택 기간 일평균 증감)"""
+    total_days = (df['date'].max() - df['date'].min()).days + 1
+
+    avg_daily_dist_all = df['distance'].sum() / total_days
+    curr_daily_dist = filtered_df['distance'].sum() / selected_days
+
+    avg_daily_time_all = df['time'].sum() / total_days
+    curr_daily_time = filtered_df['time'].sum() / selected_days
+
+    avg_daily_fuel_all = df['consumed_fuel'].sum() / total_days
+    curr_daily_fuel = filtered_df['consumed_fuel'].sum() / selected_days
+
+    current_eff = filtered_df['fuel_efficiency'].mean()
+    return {
+        'efficiency': current_eff,
+        'delta_efficiency': current_eff - df['fuel_efficiency'].mean(),
+        'total_distance': filtered_df['distance'].sum(),
+        'delta_distance': curr_daily_dist - avg_daily_dist_all,
+        'total_minutes': filtered_df['time'].sum(),
+        'delta_time': curr_daily_time - avg_daily_time_all,
+        'total_fuel': filtered_df['consumed_fuel'].sum(),
+        'delta_fuel': curr_daily_fuel - avg_daily_fuel_all,
+    }
 
 
 def render_overview_tab(df, filtered_df, selected_days, resample_option):
     """전체 운행 현황 탭 렌더링"""
     
     # 데이터 리샘플링
-    chart_df = filtered_df.copy()
-    if "주별" in resample_option:
-        chart_df = chart_df.resample('W-MON', on='date').mean(numeric_only=True).reset_index()
-    elif "월별" in resample_option:
-        chart_df = chart_df.resample('M', on='date').mean(numeric_only=True).reset_index()
+    with span('overview.resample'):
+        chart_df = resample_chart_data(filtered_df, resample_option)
 
     # --- KPI Section ---
     st.markdown("<br>", unsafe_allow_html=True)
-    _render_kpi_section(df, filtered_df, selected_days)
+    with span('overview.kpi'):
+        _render_kpi_section(df, filtered_df, selected_days)
     
     st.divider()
     
@@ -39,35 +78,21 @@ def _render_kpi_section(df, filtered_df, selected_days):
     kpi_col1, kpi_col2, kpi_col3, kpi_col4 = st.columns(4)
     
     # 계산
-    total_days = (df['date'].max() - df['date'].min()).days + 1
-    
-    avg_daily_dist_all = df['distance'].sum() / total_days
-    curr_daily_dist = filtered_df['distance'].sum() / selected_days
-    
-    avg_daily_time_all = df['time'].sum() / total_days
-    curr_daily_time = filtered_df['time'].sum() / selected_days
-    
-    avg_daily_fuel_all = df['consumed_fuel'].sum() / total_days
-    curr_daily_fuel = filtered_df['consumed_fuel'].sum() / selected_days
+    kpi = compute_kpis(df, filtered_df, selected_days)
 
     # KPI 1: 평균 연비
-    current_eff = filtered_df['fuel_efficiency'].mean()
-    delta_eff = current_eff - df['fuel_efficiency'].mean()
-    render_kpi(kpi_col1, "평균 연비", f"{current_eff:.2f} km/L", delta_eff)
+    render_kpi(kpi_col1, "평균 연비", f"{kpi['efficiency']:.2f} km/L", kpi['delta_efficiency'])
 
     # KPI 2: 총 주행 거리
-    delta_dist = curr_daily_dist - avg_daily_dist_all
-    render_kpi(kpi_col2, "총 주행 거리", f"{filtered_df['distance'].sum():,.0f} km", delta_dist)
+    render_kpi(kpi_col2, "총 주행 거리", f"{kpi['total_distance']:,.0f} km", kpi['delta_distance'])
 
     # KPI 3: 총 운행 시간
-    total_minutes = filtered_df['time'].sum()
+    total_minutes = kpi['total_minutes']
     time_str = f"{int(total_minutes // 60):,}시간" if total_minutes > 60 else f"{int(total_minutes)}분"
-    delta_time = curr_daily_time - avg_daily_time_all
-    render_kpi(kpi_col3, "총 운행 시간", time_str, delta_time)
+    render_kpi(kpi_col3, "총 운행 시간", time_str, kpi['delta_time'])
 
     # KPI 4: 총 연료 소모량
-    delta_fuel = curr_daily_fuel - avg_daily_fuel_all
-    render_kpi(kpi_col4, "총 연료 소모량", f"{filtered_df['consumed_fuel'].sum():,.0f} L", delta_fuel)
+    render_kpi(kpi_col4, "총 연료 소모량", f"{kpi['total_fuel']:,.0f} L", kpi['delta_fuel'])
 
 
 def _render_charts_section(chart_df, filtered_df):
@@ -92,6 +117,7 @@ def _render_charts_section(chart_df, filtered_df):
         _render_correlation_chart(filtered_df)
 
 
+@timed('overview.chart.efficiency')
 def _render_efficiency_chart(chart_df):
     """연비 추이 차트"""
     st.markdown('<div class="chart-header">연비 추이</div>', unsafe_allow_html=True)
@@ -121,6 +147,7 @@ def _render_efficiency_chart(chart_df):
         st.info("표시할 연비 데이터가 없습니다.")
 
 
+@timed('overview.chart.distance')
 def _render_distance_chart(chart_df):
     """주행 거리 추이 차트"""
     st.markdown('<div class="chart-header">주행 거리 추이</div>', unsafe_allow_html=True)
@@ -139,6 +166,7 @@ def _render_distance_chart(chart_df):
     st.plotly_chart(create_clean_chart(fig), use_container_width=True)
 
 
+@timed('overview.chart.fuel')
 def _render_fuel_chart(chart_df):
     """주유량 대비 연료 소모량 차트"""
     st.markdown('<div class="chart-header">주유량 대비 연료 소모량</div>', unsafe_allow_html=True)
@@ -162,14 +190,13 @@ def _render_fuel_chart(chart_df):
     st.plotly_chart(final_fig, use_container_width=True)
 
 
+@timed('overview.chart.correlation')
 def _render_correlation_chart(filtered_df):
     """속도-연비 상관관계 차트"""
     st.markdown('<div class="chart-header">속도와 연비의 상관관계</div>', unsafe_allow_html=True)
     
-    sample = filtered_df.sample(n=min(500, len(filtered_df))) if len(filtered_df) > 500 else filtered_df.copy()
-    
-    if not sample.empty:
-        sample['distance'] = sample['distance'].fillna(0)
+    # distance 는 load_data 단계에서 이미 fillna(0) 처리됨 → 복사/수정 불필요
+    sample = filtered_df.sample(n=500) if len(filtered_df) > 500 else filtered_df
     
     valid = sample[(sample['speed'].notnull()) & (sample['speed'] > 0)]
 
@@ -0,0 +1,47 @@
+"""
+TAB 3: 성능 모니터 (관리자 전용)
+"""
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import METRICS_FILE
+from services.data_loader import get_dataset_cache
+from utils.perf import snapshot
+
+
+def render_performance_tab():
+    """Rerun 단계별 지연시간 및 데이터 캐시 상태 표시"""
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # --- 단계별 지연시간 ---
+    st.markdown('<div class="chart-header">단계별 지연시간 (ms, 최근 샘플 기준)</div>', unsafe_allow_html=True)
+    stats = snapshot()
+    if not stats:
+        st.info("아직 수집된 지표가 없습니다.")
+    else:
+        stats_df = pd.DataFrame(stats)
+        for col in ['p50', 'p90', 'p99', 'max']:
+            stats_df[col] = stats_df[col] * 1000
+        stats_df['avg'] = stats_df['sum'] / stats_df['count'] * 1000
+        stats_df = stats_df[['stage', 'count', 'avg', 'p50', 'p90', 'p99', 'max']]
+        st.dataframe(
+            stats_df.sort_values(by='p90', ascending=False).round(2),
+            use_container_width=True, hide_index=True
+        )
+
+    # --- 데이터 캐시 상태 ---
+    st.markdown('<div class="chart-header">공유 데이터 캐시</div>', unsafe_allow_html=True)
+    cache = get_dataset_cache()
+    table = cache.get()
+    loaded_at = cache.loaded_at
+    st.write(f"- 행 수: **{table.num_rows:,}** / 메모리: **{table.nbytes / 1024 / 1024:,.1f} MB** (프로세스당 1벌)")
+    if loaded_at:
+        st.write(f"- 마지막 로드: {datetime.fromtimestamp(loaded_at):%Y-%m-%d %H:%M:%S}")
+    st.write(f"- 변경 감지 지문: `{cache.fingerprint}`")
+    st.caption(f"Prometheus 지표 파일: {METRICS_FILE}")
@@ -10,23 +10,30 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import THEME, LABEL_MAP
 from components.charts import create_clean_chart
+from utils.perf import span
 
-def render_vehicle_tab(filtered_df):
-    """차량별 비교 분석 탭 렌더링"""
-    
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    vehicle_group = filtered_df.groupby('vehicle_id').agg({
+def aggregate_by_vehicle(filtered_df):
+    """차량별 집계 (총 거리, 평균 연비, 총 연료, 총 시간)"""
+    return filtered_df.groupby('vehicle_id').agg({
         'distance': 'sum',
         'fuel_efficiency': 'mean',
         'consumed_fuel': 'sum',
         'time': 'sum'
     }).reset_index()
 
+
+def render_vehicle_tab(filtered_df):
+    """차량별 비교 분석 탭 렌더링"""
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    with span('vehicle.groupby'):
+        vehicle_group = aggregate_by_vehicle(filtered_df)
+
     # 차트
     col1, col2 = st.columns(2)
     
-    with col1:
+    with col1, span('vehicle.chart.distance'):
         st.markdown('<div class="chart-header">차량별 총 주행 거리</div>', unsafe_allow_html=True)
         fig = px.bar(
             vehicle_group, x='vehicle_id', y='distance',
@@ -35,7 +42,7 @@ def render_vehicle_tab(filtered_df):
         fig.update_traces(textfont_size=12, textangle=0, textposition="outside", cliponaxis=False)
         st.plotly_chart(create_clean_chart(fig), use_container_width=True)
 
-    with col2:
+    with col2, span('vehicle.chart.efficiency'):
         st.markdown('<div class="chart-header">차량별 평균 연비</div>', unsafe_allow_html=True)
         fig = px.bar(
             vehicle_group, x='vehicle_id', y='fuel_efficiency',
@@ -47,7 +54,8 @@ def render_vehicle_tab(filtered_df):
 
     # 상세 테이블
     st.markdown('<div class="chart-header">차량별 상세 데이터</div>', unsafe_allow_html=True)
-    st.dataframe(
-        vehicle_group.rename(columns=LABEL_MAP).sort_values(by='주행 거리 (km)', ascending=False),
-        use_container_width=True
-    )
\ No newline at end of file
+    with span('vehicle.table'):
+        st.dataframe(
+            vehicle_group.rename(columns=LABEL_MAP).sort_values(by='주행 거리 (km)', ascending=False),
+            use_container_width=True
+        )
\ No newline at end of file
@@ -1,72 +1,317 @@
 # Gemini의 제안을 반영하여 전처리가 완료된 최종 데이터 파일 생성
-# messy_cleaned + cleaning_proposl_al -> final
+# cleaned + cleaning_proposal_ai -> final
+#
+# - 제안을 대상 컬럼(target)별로 묶어 인덱스 정렬 대입으로 한 번에 반영
+# - 같은 (id, target) 에 제안이 여러 건이면 결정적으로 하나만 선택 (resolve_conflicts 참고)
+# - 실제로 바뀐 셀은 원장(corrections_ledger.csv)에 '이전 값 → 새 값' 으로 추가 기록 (덮어쓰지 않음)
+#   → AI 단계를 다시 돌리지 않고도 원장만으로 최종 파일 재구성(--replay) / 특정 실행 취소(--revert) 가능
+# - 입력 / 제안 / 최종 파일은 공용 스키마(pipeline_schema)의 Parquet (예전 CSV 도 읽을 수 있음), 원장은 CSV 그대로
+#
+# 사용법:
+#   python scripts/apply_corrections.py                          # data/ 의 가장 최근 제안 파일 반영
+#   python scripts/apply_corrections.py cleaning_proposal_ai_20260120_163939.parquet
+#   python scripts/apply_corrections.py --csv                    # 최종 파일을 CSV 로도 내보내기
+#   python scripts/apply_corrections.py --list                   # 원장에 기록된 실행 목록
+#   python scripts/apply_corrections.py --revert 20260121_101500 # 해당 실행의 보정 취소
+#   python scripts/apply_corrections.py --replay                 # 원장만으로 최종 파일 재구성
 
-import pandas as pd
-import os
+import argparse
+from datetime import datetime
 from pathlib import Path
 
-def apply_corrections():
-    # 1. 경로 설정
-    current_dir = Path(__file__).resolve().parent
-    project_root = current_dir.parent
-    
-    # 입력 1: 전처리된 원본
-    input_csv_path = project_root / 'data' / 'processed' / 'driving_log_2016_2020_messy_cleaned.csv'
-    
-    # 입력 2: AI 제안 파일 (가장 최근에 생성된 파일명을 여기에 적어주세요)
-    proposal_filename = 'cleaning_proposal_ai_20260120_163939.csv' 
-    proposal_csv_path = project_root / 'data' / proposal_filename
-    
-    # 출력: 최종 파일
-    output_csv_path = project_root / 'data' / 'processed' / 'driving_log_2016_2020_final.csv'
+import numpy as np
+import pandas as pd
+
+from pipeline_schema import CLEANED_2016_2020, DRIVING_LOG_SCHEMA, PROPOSAL_SCHEMA, read_table, table_exists, write_table
+
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+DATA_DIR = project_root / 'data'
+INPUT_PATH = DATA_DIR / 'processed' / CLEANED_2016_2020
+OUTPUT_PATH = DATA_DIR / 'processed' / 'driving_log_2016_2020_final.parquet'
+LEDGER_CSV = DATA_DIR / 'processed' / 'corrections_ledger.csv'
+PROPOSAL_PATTERN = 'cleaning_proposal_ai_*'
+PROPOSAL_SUFFIXES = ('.parquet', '.csv')   # 같은 실행이면 Parquet 우선
+
+LEDGER_COLUMNS = [
+    'run_id', 'applied_at', 'action', 'source', 'id', 'date', 'vehicle_id',
+    'target', 'before', 'after', 'reason',
+]
+
+
+# =========================================================
+# 1. 제안 파일 로드 및 정리
+# =========================================================
+def find_latest_proposal(data_dir=DATA_DIR):
+    """가장 최근 제안 파일 (파일명의 생성 시각 기준, 없으면 None)"""
+    candidates = [p for p in Path(data_dir).glob(PROPOSAL_PATTERN) if p.suffix in PROPOSAL_SUFFIXES]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda p: (p.stem, -PROPOSAL_SUFFIXES.index(p.suffix)))
+
+
+def load_proposals(path):
+    """제안 파일 로드 → Manual Check / 빈 제안 / id 없는 행 제외"""
+    df = read_table(path, schema=PROPOSAL_SCHEMA)
+    df['order'] = np.arange(len(df))
+    df['id'] = pd.to_numeric(df['id'], errors='coerce')
+    mask = (df['target'] != 'manual_check') & df['proposed'].notna() & df['id'].notna()
+    df = df[mask].copy()
+    df['id'] = df['id'].astype(int)
+    return df
+
+
+def resolve_conflicts(df):
+    """
+    (id, target) 당 제안 1건으로 정리하고 (정리된 제안, 충돌난 (id, target) 수) 반환
+    - 같은 값을 여러 번 제안한 경우는 하나로 합침
+    - 값이 다른 제안끼리는 reference(계산 근거값)에 가장 가까운 제안을 선택하고,
+      그래도 같으면 파일에서 나중에 나온 제안을 선택 (실행할 때마다 같은 결과)
+    """
+    df = df.drop_duplicates(subset=['id', 'target', 'proposed'], keep='last')
+    conflicts = int(df.duplicated(subset=['id', 'target']).sum())
+
+    distance = (pd.to_numeric(df['proposed'], errors='coerce')
+                - pd.to_numeric(df['reference'], errors='coerce')).abs()
+    df = df.assign(ref_distance=distance.fillna(np.inf))
+    df = df.sort_values(['id', 'target', 'ref_distance', 'order'], ascending=[True, True, True, False])
+    df = df.drop_duplicates(subset=['id', 'target'], keep='first')
+    return df.drop(columns='ref_distance').sort_values('order'), conflicts
+
+
+# =========================================================
+# 2. 컬럼 단위 반영
+# =========================================================
+def _coerce(values, column):
+    """제안 값을 원본 컬럼 타입에 맞춤 (숫자 컬럼인데 숫자가 아니면 NaN → 반영 제외)"""
+    if pd.api.types.is_numeric_dtype(column):
+        return pd.to_numeric(values, errors='coerce')
+    return values.astype(object)
+
+
+def assign_column(df, ids, values):
+    """
+    df 의 한 컬럼에 ids 위치별 values 를 한 번에 대입하고 (실제로 바뀐 id, 이전 값, 새 값) 반환
+    - 정수 컬럼에 소수 값이 들어오면 컬럼을 실수형으로 올림 (값 손실 방지)
+    """
+    col = values.name
+    before = df.loc[ids, col]
+    changed = ~((before.values == values.values) | (pd.isna(before.values) & pd.isna(values.values)))
+    ids, before, values = ids[changed], before[changed], values[changed]
+    if len(ids) == 0:
+        return ids, before, values
+
+    if pd.api.types.is_integer_dtype(df[col]) and not np.all(np.mod(values.values, 1) == 0):
+        df[col] = df[col].astype(float)
+    elif pd.api.types.is_integer_dtype(df[col]):
+        values = values.astype(df[col].dtype)
+    df.loc[ids, col] = values.values
+    return ids, before, values
+
+
+def apply_proposals(df, proposals):
+    """
+    제안을 target 컬럼별로 묶어 반영하고 원장 행(DataFrame)과 제외 건수 반환
+    - id 는 원본 CSV 의 행 번호 (cleaning_dirty 에서 df['id'] = df.index 로 부여)
+    """
+    entries = []
+    skipped = 0
+    for target, group in proposals.groupby('target', sort=True):
+        if target not in df.columns:
+            print(f"⚠️ 알 수 없는 컬럼 '{target}' 제안 {len(group)}건 제외")
+            skipped += len(group)
+            continue
+
+        in_range = group['id'].isin(df.index)
+        values = _coerce(group['proposed'], df[target])
+        valid = (in_range & values.notna()).to_numpy()
+        skipped += int((~valid).sum())
+        group, values = group[valid], values[valid]
+
+        ids, before, after = assign_column(df, pd.Index(group['id']), values.rename(target))
+        reasons = group.set_index('id')['reason'] if 'reason' in group else pd.Series(index=group['id'], dtype=object)
+        entries.append(pd.DataFrame({
+            'id': ids,
+            'date': df.loc[ids, 'date'].values if 'date' in df else None,
+            'vehicle_id': df.loc[ids, 'vehicle_id'].values if 'vehicle_id' in df else None,
+            'target': target,
+            'before': before.values,
+            'after': after.values,
+            'reason': reasons.reindex(ids).values,
+        }))
+
+    ledger = pd.concat(entries, ignore_index=True) if entries else pd.DataFrame(columns=LEDGER_COLUMNS)
+    return ledger, skipped
+
+
+# =========================================================
+# 3. 원장 (append-only)
+# =========================================================
+def read_ledger(path=LEDGER_CSV):
+    if not Path(path).exists():
+        return pd.DataFrame(columns=LEDGER_COLUMNS)
+    return pd.read_csv(path, dtype={'run_id': str})
+
+
+def append_ledger(entries, run_id, action, source, path=LEDGER_CSV):
+    """원장 끝에 이번 실행 기록 추가 (기존 행은 수정하지 않음)"""
+    if entries.empty:
+        return
+    entries = entries.assign(
+        run_id=run_id, applied_at=datetime.now().isoformat(timespec='seconds'), action=action, source=source,
+    )[LEDGER_COLUMNS]
+    path = Path(path)
+    entries.to_csv(path, mode='a', header=not path.exists(), index=False, encoding='utf-8-sig')
+
+
+def replay_ledger(df, ledger):
+    """원장의 대입을 기록 순서대로 다시 적용 (같은 셀은 마지막 기록이 최종 값)"""
+    if ledger.empty:
+        return df
+    latest = ledger.drop_duplicates(subset=['id', 'target'], keep='last')
+    for target, group in latest.groupby('target', sort=True):
+        group = group[group['id'].isin(df.index)]
+        values = _coerce(group['after'], df[target])
+        if pd.api.types.is_integer_dtype(df[target]) and not np.all(np.mod(values.dropna().values, 1) == 0):
+            df[target] = df[target].astype(float)
+        df.loc[pd.Index(group['id']), target] = values.values
+    return df
+
+
+def _new_run_id(ledger):
+    """실행 ID (생성 시각, 같은 초에 이미 있으면 접미사 추가)"""
+    run_id = base = datetime.now().strftime("%Y%m%d_%H%M%S")
+    existing = set(ledger['run_id'].astype(str))
+    n = 1
+    while run_id in existing:
+        run_id = f"{base}_{n}"
+        n += 1
+    return run_id
+
+
+def _load_input(ledger):
+    """원본 + 지금까지 원장에 기록된 보정"""
+    return replay_ledger(read_table(INPUT_PATH, schema=DRIVING_LOG_SCHEMA), ledger)
+
 
+def _save(df, csv=False):
+    path = write_table(df, OUTPUT_PATH, DRIVING_LOG_SCHEMA, csv=csv)
+    print(f"💾 저장 위치: {path}" + (" (+ CSV)" if csv else ""))
+
+
+# =========================================================
+# 4. 실행 모드
+# =========================================================
+def apply_corrections(proposal_path=None, force=False, csv=False):
     # 파일 확인
-    if not input_csv_path.exists():
-        print(f"❌ 원본 파일을 찾을 수 없습니다: {input_csv_path}")
+    if not table_exists(INPUT_PATH):
+        print(f"❌ 원본 파일을 찾을 수 없습니다: {INPUT_PATH}")
         return
-    if not proposal_csv_path.exists():
-        print(f"❌ AI 제안 파일을 찾을 수 없습니다: {proposal_csv_path}")
+    proposal_path = Path(proposal_path) if proposal_path else find_latest_proposal()
+    if proposal_path is not None and not proposal_path.exists() and (DATA_DIR / proposal_path).exists():
+        proposal_path = DATA_DIR / proposal_path
+    if proposal_path is None or not proposal_path.exists():
+        print(f"❌ AI 제안 파일을 찾을 수 없습니다: {proposal_path or DATA_DIR / PROPOSAL_PATTERN}")
+        return
+
+    ledger = read_ledger()
+    # 같은 실행의 제안은 형식(.csv / .parquet)과 무관하게 한 번만 반영
+    applied = {Path(s).stem for s in ledger.loc[ledger['action'] == 'apply', 'source'].dropna()}
+    if not force and proposal_path.stem in applied:
+        print(f"⚠️ 이미 반영된 제안 파일입니다: {proposal_path.name} (다시 반영하려면 --force)")
         return
 
-    # 2. 데이터 로드
+    # 데이터 로드 (원본 + 지금까지 원장에 기록된 보정)
     print("📂 데이터 로드 중...")
-    df_orig = pd.read_csv(input_csv_path)
-    df_prop = pd.read_csv(proposal_csv_path)
-
-    # 3. Manual Check 및 빈 값 제외
-    mask_valid = (df_prop['target'] != 'manual_check') & (df_prop['proposed'].notna())
-    df_valid = df_prop[mask_valid].copy()
-    
-    print(f"   - 원본 데이터: {len(df_orig)}행")
-    print(f"   - 반영할 수정 제안: {len(df_valid)}건 (Manual Check 제외됨)")
-
-    # 4. 수정 반영 (인덱스 매핑)
-    # 원본 데이터에 id 컬럼이 없으면 인덱스를 id로 간주하거나, 미리 id 컬럼을 만들어야 합니다.
-    # 여기서는 df_orig의 인덱스가 id와 일치한다고 가정합니다.
-    
-    success_cnt = 0
-    for _, row in df_valid.iterrows():
-        try:
-            target_id = int(row['id'])
-            col_name = row['target']
-            new_val = row['proposed']
-
-            if target_id in df_orig.index:
-                # 데이터 타입 맞추기 (숫자형인 경우)
-                if pd.api.types.is_numeric_dtype(df_orig[col_name]):
-                    new_val = float(new_val)
-                    if pd.api.types.is_integer_dtype(df_orig[col_name]):
-                        new_val = int(new_val)
-                
-                df_orig.at[target_id, col_name] = new_val
-                success_cnt += 1
-        except Exception as e:
-            print(f"⚠️ ID {row['id']} 수정 중 오류: {e}")
-
-    # 5. 최종 저장
-    df_orig.to_csv(output_csv_path, index=False, encoding='utf-8-sig')
-    print(f"🎉 수정 완료! {success_cnt}건 반영됨.")
-    print(f"💾 저장 위치: {output_csv_path}")
+    df = _load_input(ledger)
+    proposals, conflicts = resolve_conflicts(load_proposals(proposal_path))
+
+    print(f"   - 원본 데이터: {len(df)}행")
+    print(f"   - 제안 파일: {proposal_path.name}")
+    print(f"   - 반영할 수정 제안: {len(proposals)}건 (Manual Check 제외, 충돌 {conflicts}건 정리)")
+
+    entries, skipped = apply_proposals(df, proposals)
+    run_id = _new_run_id(ledger)
+    append_ledger(entries, run_id, 'apply', proposal_path.name)
+
+    _save(df, csv)
+    if skipped:
+        print(f"⚠️ 반영 제외 {skipped}건 (범위 밖 id / 타입 불일치)")
+    print(f"🎉 수정 완료! {len(entries)}건 반영됨. (실행 ID: {run_id})")
+
+
+def revert_run(run_id, csv=False):
+    """
+    해당 실행이 바꾼 셀을 이전 값으로 되돌리는 기록을 원장에 추가한 뒤 최종 파일 재구성
+    - 원장의 최신 값이 이 실행의 새 값과 같은 셀만 되돌림
+      (이후 실행이 같은 셀을 다시 보정했다면 그 보정을 덮어쓰지 않고 건너뛴 셀로 보고)
+    """
+    ledger = read_ledger()
+    entries = ledger[(ledger['run_id'] == run_id) & (ledger['action'] == 'apply')]
+    if entries.empty:
+        print(f"❌ 원장에 실행 ID '{run_id}' 의 보정 기록이 없습니다. (--list 로 확인)")
+        return
+    if run_id in set(ledger.loc[ledger['action'] == 'revert', 'source']):
+        print(f"⚠️ 이미 취소된 실행입니다: {run_id}")
+        return
+
+    latest = ledger.drop_duplicates(subset=['id', 'target'], keep='last').set_index(['id', 'target'])['after']
+    current = latest.reindex(pd.MultiIndex.from_frame(entries[['id', 'target']])).to_numpy()
+    unchanged = (current == entries['after'].to_numpy()) | (pd.isna(current) & entries['after'].isna().to_numpy())
+    superseded = entries[~unchanged]
+    entries = entries[unchanged]
+
+    undo = entries.iloc[::-1].rename(columns={'before': 'after', 'after': 'before'})
+    append_ledger(undo, _new_run_id(ledger), 'revert', run_id)
+
+    df = _load_input(read_ledger())
+    _save(df, csv)
+    print(f"⏪ 실행 {run_id} 취소: {len(entries)}건 원래 값으로 복구")
+    if not superseded.empty:
+        print(f"⚠️ 이후 실행에서 다시 보정된 셀 {len(superseded)}건은 건너뜀:")
+        for row in superseded.itertuples():
+            print(f"   - id {row.id} / {row.target}: {row.after} → 현재 {latest.loc[(row.id, row.target)]}")
+
+
+def replay(csv=False):
+    """원장만으로 최종 파일 재구성 (AI 단계 재실행 불필요)"""
+    ledger = read_ledger()
+    df = _load_input(ledger)
+    _save(df, csv)
+    print(f"🔁 원장 재적용 완료: 기록 {len(ledger)}건, 보정된 셀 {len(ledger.drop_duplicates(subset=['id', 'target']))}개")
+
+
+def list_runs():
+    ledger = read_ledger()
+    if ledger.empty:
+        print("📭 원장 기록이 없습니다.")
+        return
+    runs = ledger.groupby('run_id', sort=False).agg(
+        applied_at=('applied_at', 'first'), action=('action', 'first'),
+        source=('source', 'first'), cells=('id', 'size'),
+    )
+    reverted = set(ledger.loc[ledger['action'] == 'revert', 'source'])
+    for run_id, row in runs.iterrows():
+        mark = " (취소됨)" if run_id in reverted else ""
+        print(f"   - {run_id} [{row.action}] {row.source}: {row.cells}건 @ {row.applied_at}{mark}")
+
 
 if __name__ == "__main__":
-    apply_corrections()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="AI 보정 제안 반영 (원장 기록)")
+    parser.add_argument('proposal', nargs='?', default=None, help="제안 파일 (기본: data/ 의 가장 최근 파일)")
+    parser.add_argument('--force', action='store_true', help="이미 반영된 제안 파일도 다시 반영")
+    parser.add_argument('--revert', metavar='RUN_ID', help="해당 실행의 보정 취소")
+    parser.add_argument('--replay', action='store_true', help="원장만으로 최종 파일 재구성")
+    parser.add_argument('--list', action='store_true', help="원장에 기록된 실행 목록")
+    parser.add_argument('--csv', action='store_true', help="최종 Parquet 과 함께 CSV(utf-8-sig)도 내보내기")
+    args = parser.parse_args()
+
+    if args.list:
+        list_runs()
+    elif args.revert:
+        revert_run(args.revert, csv=args.csv)
+    elif args.replay:
+        replay(csv=args.csv)
+    else:
+        apply_corrections(args.proposal, force=args.force, csv=args.csv)
@@ -0,0 +1,75 @@
+# AI 검토 배치 구성 (토큰 예산 기반)
+# - 의심 행을 월 → 차량 → 날짜 순으로 정렬한 뒤, 행별 JSON 길이로 추정한 토큰 수가 예산을 넘지 않을 때까지 채움
+# - 같은 (월, 차량)의 행은 가능한 한 같은 배치에 묶음 (누적거리·직전 값 비교가 한 요청 안에서 이뤄지도록)
+#   다음 묶음이 남은 예산에 들어가지 않으면 새 배치를 시작하고, 묶음 하나가 예산을 넘으면 남은 자리부터 나눠 담음
+# - 배치는 여러 달에 걸칠 수 있음 (의심 행이 적은 달끼리 합쳐 요청 수를 줄이고,
+#   프롬프트에는 배치에 포함된 달·차량별 평균을 각각 제공)
+#
+# 토큰 수는 API 호출 없이 문자 수로 추정 (숫자·기호가 많은 JSON 기준 약 3자 = 1토큰, 보수적으로 잡은 값)
+
+import math
+
+CHARS_PER_TOKEN = 3.0
+TOKEN_BUDGET = 4000   # 배치 하나의 데이터(JSON) 토큰 예산
+MAX_ROWS = 50         # 예산과 무관한 배치 최대 행 수 (응답 길이 제한)
+GROUP_CONTEXT_TOKENS = 40  # (월, 차량) 평균 문맥 한 줄
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def row_tokens(df):
+    """행별 추정 토큰 수 (to_json(orient='records') 에 들어가는 행 JSON 길이 기준)"""
+    if df.empty:
+        return []
+    lines = df.to_json(orient='records', lines=True, force_ascii=False).splitlines()
+    # 레코드 사이 구분자(,) 1자 포함
+    return [estimate_tokens(line) + 1 for line in lines]
+
+
+def plan_batches(df, month_col='month', vehicle_col='vehicle_id', budget=TOKEN_BUDGET, max_rows=MAX_ROWS,
+                 columns=None):
+    """
+    배치 목록 반환: [배치 DataFrame, ...] (원본 index 유지 → 월/차량 정보는 index 로 df 에서 조회)
+    - columns 를 주면 해당 컬럼만으로 토큰을 추정하고 배치에도 그 컬럼만 담음
+    - (월, 차량) 묶음마다 프롬프트에 평균 문맥 한 줄이 붙으므로 GROUP_CONTEXT_TOKENS 를 함께 계산
+    """
+    batches = []
+    if df.empty:
+        return batches
+    date_col = ['date'] if 'date' in df else []
+    ordered = df.sort_values([month_col, vehicle_col] + date_col, kind='stable')
+    payload = ordered[columns] if columns is not None else ordered
+    tokens = row_tokens(payload)
+    groups = ordered.groupby([month_col, vehicle_col], sort=False, dropna=False).ngroup().to_numpy()
+
+    positions = []        # 현재 배치에 담긴 행 위치
+    used = 0
+
+    def flush():
+        nonlocal positions, used
+        if positions:
+            batches.append(payload.iloc[positions])
+        positions, used = [], 0
+
+    start = 0
+    while start < len(ordered):
+        # 같은 (월, 차량)의 연속 구간 [start, end)
+        end = start + 1
+        while end < len(ordered) and groups[end] == groups[start]:
+            end += 1
+        group_tokens, group_rows = GROUP_CONTEXT_TOKENS + sum(tokens[start:end]), end - start
+        fits_alone = group_tokens <= budget and group_rows <= max_rows
+        if used and fits_alone and (used + group_tokens > budget or len(positions) + group_rows > max_rows):
+            flush()
+        used += GROUP_CONTEXT_TOKENS
+        for pos in range(start, end):
+            if positions and (used + tokens[pos] > budget or len(positions) >= max_rows):
+                flush()
+                used += GROUP_CONTEXT_TOKENS
+            positions.append(pos)
+            used += tokens[pos]
+        start = end
+    flush()
+    return batches
@@ -0,0 +1,182 @@
+# AI 정제(cleaning_dirty_2016_2020) 처리량 벤치마크
+# 합성 운행 데이터에 숫자 오타를 섞어 입력 CSV 를 만들고, 같은 프로세스에 띄운 Gemini 목 서버(mock_gemini)로
+# main_async 전체(규칙 평가 → 사전 보정 → 배치 구성 → 비동기 호출 → 저장)를 실행하여
+# 종단 간 소요 시간 / 배치 처리량 / 재시도 수 / 전송량을 측정하고 기준값(baseline)과 비교
+#
+# 사용법:
+#   python scripts/benchmark_cleaning.py                                   # 20k 행, 지연 500ms
+#   python scripts/benchmark_cleaning.py --rows 100k --latency-ms 1500 --rate-429 0.05 --malformed 0.01
+#   python scripts/benchmark_cleaning.py --quota-rpm 300 --rpm 240          # 할당량 초과 상황
+#   python scripts/benchmark_cleaning.py --save-baseline                    # 현재 결과를 기준값으로 저장
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+
+import cleaning_dirty_2016_2020 as cleaning  # noqa: E402
+from mock_gemini import add_mock_arguments, mock_from_args  # noqa: E402
+from synthetic_data import generate_driving_logs, parse_size, format_size  # noqa: E402
+
+BENCH_DIR = PROJECT_ROOT / 'data' / 'benchmarks'
+DEFAULT_BASELINE = BENCH_DIR / 'cleaning_baseline.json'
+# 클라이언트 집계(limiter.counts) 중 실제 HTTP 시도가 아닌 항목
+NON_ATTEMPT_LABELS = {'parse_error', 'gave_up'}
+
+
+def inject_typos(df, rate, seed=42):
+    """
+    거리 / 연료 값 일부(rate)에 수기 입력 오타를 섞음 (숫자 하나 추가·삭제·치환, 소수점 이동)
+    - 사전 보정 규칙이 처리하는 오타와 AI 가 필요한 애매한 오타가 함께 만들어짐
+    """
+    rng = np.random.default_rng(seed)
+    df = df.copy()
+    for col in ['distance', 'consumed_fuel']:
+        rows = df.index[(df[col] > 0) & (rng.random(len(df)) < rate / 2)]
+        text = df.loc[rows, col].astype(str).str.replace(r'\.0$', '', regex=True)
+        out = []
+        for value, kind, digit, u in zip(text, rng.integers(0, 4, len(rows)), rng.integers(0, 10, len(rows)),
+                                         rng.random(len(rows))):
+            positions = [i for i, ch in enumerate(value) if ch.isdigit()]
+            pos = positions[int(u * len(positions))]
+            if kind == 0:
+                value = value[:pos] + str(digit) + value[pos:]
+            elif kind == 1 and len(positions) > 1:
+                value = value[:pos] + value[pos + 1:]
+            elif kind == 2:
+                value = value[:pos] + str(digit) + value[pos + 1:]
+            else:
+                value = str(float(value) * (10 if u < 0.5 else 0.1))
+            out.append(float(value))
+        df.loc[rows, col] = out
+    return df
+
+
+def prepare_input(n_rows, typo_rate):
+    """벤치마크 입력 CSV (크기·오타 비율별로 한 번만 생성)"""
+    path = BENCH_DIR / f"cleaning_input_{format_size(n_rows)}_{typo_rate:g}.csv"
+    if not path.exists():
+        print(f"   - 합성 데이터 생성: {path.name}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        inject_typos(generate_driving_logs(n_rows), typo_rate).to_csv(path, index=False)
+    return path
+
+
+async def run_benchmark(mock, input_path, args):
+    runner, base_url = await mock.start()
+    cleaning.configure_api(base_url)
+    try:
+        with tempfile.TemporaryDirectory(prefix='kilostone_cleaning_bench_') as output_dir:
+            summary = await cleaning.main_async(
+                cache=None, rpm=args.rpm, max_concurrency=args.max_concurrency,
+                token_budget=args.token_budget, max_rows=args.max_rows,
+                context_cache=not args.no_context_cache, rule_based=not args.no_rules,
+                input_path=input_path, output_dir=output_dir,
+            )
+    finally:
+        await runner.cleanup()
+
+    server = mock.summary()
+    attempts = sum(v for k, v in summary['statuses'].items() if k not in NON_ATTEMPT_LABELS)
+    return {
+        'elapsed_s': summary['elapsed'],
+        'batches': summary['batches'],
+        'batches_per_s': summary['batches'] / summary['elapsed'] if summary['elapsed'] else 0.0,
+        'failed': summary['failed'],
+        'attempts': attempts,
+        'retries': attempts - summary['batches'],
+        'rule_proposals': summary['rule_proposals'],
+        'ai_proposals': summary['saved'],
+        'request_mb': server['bytes_in'] / 1024 / 1024,
+        'peak_concurrency': summary['peak_concurrency'],
+        'server_peak_in_flight': server['peak_in_flight'],
+        'statuses': {str(k): v for k, v in summary['statuses'].items()},
+    }
+
+
+def compare(result, base, tolerance):
+    """기준값 대비 회귀 목록 (소요 시간 증가, 처리량 감소)"""
+    regressions = []
+    if base.get('elapsed_s') and result['elapsed_s'] > base['elapsed_s'] * (1 + tolerance):
+        regressions.append(('elapsed_s', base['elapsed_s'], result['elapsed_s']))
+    if base.get('batches_per_s') and result['batches_per_s'] < base['batches_per_s'] / (1 + tolerance):
+        regressions.append(('batches_per_s', base['batches_per_s'], result['batches_per_s']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI 정제 파이프라인 처리량 벤치마크 (Gemini 목 서버)")
+    parser.add_argument('--rows', default='20k', help="합성 데이터 크기 (예: 10k, 100k)")
+    parser.add_argument('--typo-rate', type=float, default=0.03, help="거리/연료 오타 비율")
+    parser.add_argument('--rpm', type=int, default=100_000, help="클라이언트 분당 요청 한도 (기본: 사실상 무제한)")
+    parser.add_argument('--max-concurrency', type=int, default=cleaning.MAX_CONCURRENCY, help="동시 요청 수 상한")
+    parser.add_argument('--token-budget', type=int, default=cleaning.TOKEN_BUDGET, help="배치 데이터 토큰 예산")
+    parser.add_argument('--max-rows', type=int, default=cleaning.MAX_ROWS, help="배치 최대 행 수")
+    parser.add_argument('--no-rules', action='store_true', help="규칙 기반 사전 보정 끄기")
+    parser.add_argument('--no-context-cache', action='store_true', help="컨텍스트 캐시 끄기")
+    parser.add_argument('--name', default=None, help="기준값 비교용 시나리오 이름 (기본: 행 수)")
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help="기준값 JSON 경로")
+    parser.add_argument('--save-baseline', action='store_true', help="이번 결과를 기준값으로 저장")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="회귀 판정 허용 비율 (기본 25%%)")
+    add_mock_arguments(parser)
+    parser.set_defaults(seed=42)
+    args = parser.parse_args()
+
+    n_rows = parse_size(args.rows)
+    name = args.name or format_size(n_rows)
+    print(f"⏱️ [{name}] 입력 준비...")
+    input_path = prepare_input(n_rows, args.typo_rate)
+
+    mock = mock_from_args(args)
+    if os.name == 'nt':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    result = asyncio.run(run_benchmark(mock, input_path, args))
+
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding='utf-8')).get('results', {})
+    base = baseline.get(name, {})
+    regressions = compare(result, base, args.tolerance)
+
+    print("\n" + "=" * 60)
+    print(f"시나리오: {name} (지연 {args.latency_ms:g}ms, 429 {args.rate_429:.0%}, 500 {args.rate_500:.0%}, "
+          f"깨진 JSON {args.malformed:.0%}, 할당량 {args.quota_rpm or '-'} rpm)")
+    print(f"종단 간 소요: {result['elapsed_s']:.2f}s" + (f" (기준 {base['elapsed_s']:.2f}s)" if base else ""))
+    print(f"배치: {result['batches']}개 / 처리량: {result['batches_per_s']:.2f} batch/s / 실패: {result['failed']}개")
+    print(f"HTTP 시도: {result['attempts']}회 (재시도 {result['retries']}회) / 전송량: {result['request_mb']:.2f}MB")
+    print(f"제안: 규칙 {result['rule_proposals']}건 + AI {result['ai_proposals']}건")
+    print(f"동시성: 한도 최대 {result['peak_concurrency']} / 서버 관측 최대 {result['server_peak_in_flight']}")
+    print(f"응답 집계: {result['statuses']}")
+    print("=" * 60)
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'cpu_count': os.cpu_count(),
+            'results': {**baseline, name: result},
+        }
+        baseline_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"💾 기준값 저장: {baseline_path}")
+
+    if regressions:
+        print(f"🚨 성능 회귀 {len(regressions)}건 (허용 {args.tolerance:.0%} 초과):")
+        for metric, base_value, value in regressions:
+            print(f"   - {metric}: {base_value:.2f} → {value:.2f}")
+        sys.exit(1)
+    print("✅ 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# 대시보드 핫패스 벤치마크
+# 합성 데이터(SQLite 대체 DB)로 load_data / 날짜 필터 / 리샘플 / KPI / 차량별 집계 시간을 측정하고
+# 저장된 기준값(baseline)과 비교하여 성능 회귀를 탐지
+#
+# 사용법:
+#   python scripts/benchmark_dashboard.py                         # 10k, 100k, 1M
+#   python scripts/benchmark_dashboard.py --sizes 10k,10M --repeat 3
+#   python scripts/benchmark_dashboard.py --save-baseline         # 현재 결과를 기준값으로 저장
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'app'))
+
+from synthetic_data import build_sqlite_fixture, parse_size, format_size  # noqa: E402
+from services.data_loader import fetch_driving_logs  # noqa: E402
+from services.shared_dataset import freeze, view  # noqa: E402
+from utils.common import filter_by_date_range  # noqa: E402
+from views.overview import resample_chart_data, compute_kpis  # noqa: E402
+from views.vehicle import aggregate_by_vehicle  # noqa: E402
+
+BENCH_DIR = PROJECT_ROOT / 'data' / 'benchmarks'
+DEFAULT_BASELINE = BENCH_DIR / 'baseline.json'
+
+
+def measure(func, repeat):
+    """func 를 repeat 회 실행하여 (결과, 소요시간 목록[초]) 반환"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return result, timings
+
+
+def run_size(n_rows, repeat):
+    """데이터 크기 하나에 대한 핫패스 측정"""
+    db_path = BENCH_DIR / f"fleet_{format_size(n_rows)}.db"
+    if not db_path.exists():
+        print(f"   - 합성 데이터 생성: {db_path.name}")
+    engine = build_sqlite_fixture(n_rows, db_path)
+
+    results = {}
+
+    def bench(step, func, times=repeat):
+        value, timings = measure(func, times)
+        results[step] = {'median_ms': statistics.median(timings) * 1000, 'min_ms': min(timings) * 1000}
+        return value
+
+    # load_data 의 실제 경로: DB 조회 + 타입 변환 + Arrow 고정
+    table = bench('load_data', lambda: freeze(fetch_driving_logs(engine)), times=min(repeat, 3))
+    df = bench('session_view', lambda: view(table))
+
+    end = df['date'].max().date()
+    start_90d = end - timedelta(days=89)
+    recent = bench('filter_90d', lambda: filter_by_date_range(df, start_90d, end))
+    full = bench('filter_all', lambda: filter_by_date_range(df, df['date'].min().date(), end))
+
+    bench('resample_weekly', lambda: resample_chart_data(full, "주별 (Weekly)"))
+    bench('resample_monthly', lambda: resample_chart_data(full, "월별 (Monthly)"))
+    bench('kpi', lambda: compute_kpis(df, recent, 90))
+    bench('vehicle_groupby', lambda: aggregate_by_vehicle(full))
+
+    engine.dispose()
+    return results
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """기준값 대비 회귀 목록 반환 (min_delta_ms 미만의 차이는 측정 잡음으로 간주)"""
+    regressions = []
+    for size, steps in results.items():
+        for step, stat in steps.items():
+            base = baseline.get(size, {}).get(step)
+            if not base:
+                continue
+            ratio = stat['median_ms'] / base['median_ms'] if base['median_ms'] > 0 else 1.0
+            stat['vs_baseline'] = ratio
+            if ratio > 1 + tolerance and stat['median_ms'] - base['median_ms'] >= min_delta_ms:
+                regressions.append((size, step, base['median_ms'], stat['median_ms'], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 핫패스 벤치마크")
+    parser.add_argument('--sizes', default='10k,100k,1M', help="쉼표로 구분한 데이터 크기 (예: 10k,1M,10M)")
+    parser.add_argument('--repeat', type=int, default=5, help="단계별 반복 횟수")
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help="기준값 JSON 경로")
+    parser.add_argument('--save-baseline', action='store_true', help="이번 결과를 기준값으로 저장")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="회귀 판정 허용 비율 (기본 25%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help="회귀로 보지 않을 최소 절대 차이 (ms)")
+    args = parser.parse_args()
+
+    sizes = [parse_size(s) for s in args.sizes.split(',') if s.strip()]
+    results = {}
+    for n_rows in sizes:
+        label = format_size(n_rows)
+        print(f"⏱️ [{label}] 측정 중...")
+        results[label] = run_size(n_rows, args.repeat)
+
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding='utf-8')).get('results', {})
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+
+    print("\n" + "=" * 72)
+    print(f"{'size':>6}  {'step':<18} {'median(ms)':>12} {'min(ms)':>10} {'vs baseline':>12}")
+    for size, steps in results.items():
+        for step, stat in steps.items():
+            ratio = f"{stat['vs_baseline']:.2f}x" if 'vs_baseline' in stat else '-'
+            print(f"{size:>6}  {step:<18} {stat['median_ms']:>12.2f} {stat['min_ms']:>10.2f} {ratio:>12}")
+    print("=" * 72)
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'cpu_count': os.cpu_count(),
+            'results': {
+                **baseline,
+                **{size: {step: {k: v for k, v in stat.items() if k != 'vs_baseline'}
+                          for step, stat in steps.items()}
+                   for size, steps in results.items()},
+            },
+        }
+        baseline_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"💾 기준값 저장: {baseline_path}")
+
+    if regressions:
+        print(f"🚨 성능 회귀 {len(regressions)}건 (허용 {args.tolerance:.0%} 초과):")
+        for size, step, base_ms, cur_ms, ratio in regressions:
+            print(f"   - [{size}] {step}: {base_ms:.2f}ms → {cur_ms:.2f}ms ({ratio:.2f}x)")
+        sys.exit(1)
+    print("✅ 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
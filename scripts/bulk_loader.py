@@ -0,0 +1,284 @@
+# driving_logs 대량 적재 (재실행 가능한 Upsert)
+# - (vehicle_id, date) UNIQUE 키 기준으로 이미 있는 행은 값만 갱신, 없는 행은 추가 → 몇 번을 다시 돌려도 중복/유실 없음
+# - 방법 1 (infile): 임시 CSV + LOAD DATA LOCAL INFILE 로 임시 테이블에 적재한 뒤
+#   INSERT ... SELECT ... ON DUPLICATE KEY UPDATE 로 반영 (MariaDB, local_infile 허용 시 가장 빠름)
+#   (REPLACE 와 달리 기존 행의 id / created_at 유지, 값이 같은 행은 updated_at 도 그대로)
+# - 방법 2 (upsert): 다건 INSERT ... ON DUPLICATE KEY UPDATE 를 batch_size 단위로 실행
+#   (SQLite 대체 DB 에서는 INSERT ... ON CONFLICT DO UPDATE 로 동일하게 동작)
+# - 갱신된 행은 updated_at 이 바뀌므로 대시보드의 변경 감지(probe)가 재로드를 수행함
+# - 전체 재적재(reload_via_staging): driving_logs_staging 에 적재/인덱스 생성/검증 후
+#   RENAME TABLE 한 문장으로 교체 → 대시보드에는 빈 테이블이나 일부만 적재된 상태가 보이지 않음
+
+import csv
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import MetaData, Table, func, inspect, text
+from sqlalchemy.dialects import mysql, sqlite
+
+from db_initializer import DB_COLUMNS, TABLE_NAME, UPDATED_AT_DDL, add_indexes_sql, create_table_sql, sqlite_index_sql
+
+STAGING_TABLE = f"{TABLE_NAME}_staging"
+OLD_TABLE = f"{TABLE_NAME}_old"
+KEY_COLUMNS = ['vehicle_id', 'date']
+UNIQUE_KEY_NAME = 'uq_vehicle_date'
+DEFAULT_BATCH_SIZE = 5000
+
+
+# =========================================================
+# 1. 스키마 준비 (UNIQUE 키 / updated_at)
+# =========================================================
+def ensure_schema(engine, table=TABLE_NAME):
+    """
+    테이블이 없으면 생성하고, 예전 스키마라면 updated_at 컬럼과 (vehicle_id, date) UNIQUE 키를 추가
+    - 초 단위 updated_at 은 마이크로초 단위로 변경 (같은 초 안의 갱신도 변경 감지되도록)
+    - 기존 데이터에 중복 키가 있으면 UNIQUE 키 생성이 실패하므로 먼저 중복 건수를 확인해 알려줌
+    """
+    insp = inspect(engine)
+    if not insp.has_table(table):
+        with engine.begin() as conn:
+            conn.execute(text(create_table_sql(table, dialect=engine.dialect.name)))
+            if engine.dialect.name == 'sqlite':
+                conn.execute(text(sqlite_index_sql(table)))
+        print(f"🔨 테이블 '{table}' 생성 완료.")
+        return
+
+    columns = {c['name']: c['type'] for c in insp.get_columns(table)}
+    with engine.begin() as conn:
+        if 'updated_at' not in columns:
+            if engine.dialect.name == 'sqlite':
+                # SQLite 는 ADD COLUMN 에 상수가 아닌 DEFAULT 를 쓸 수 없음
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN updated_at TIMESTAMP"))
+                conn.execute(text(f"UPDATE {table} SET updated_at = created_at"))
+            else:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN updated_at {UPDATED_AT_DDL}"))
+            print(f"🔧 '{table}.updated_at' 컬럼 추가")
+        elif engine.dialect.name != 'sqlite':
+            ensure_updated_at_precision(conn, table, columns['updated_at'])
+
+    indexes = insp.get_indexes(table) + [
+        {'name': uc['name'], 'column_names': uc['column_names'], 'unique': True}
+        for uc in insp.get_unique_constraints(table)
+    ]
+    if any(ix.get('unique') and list(ix['column_names']) == KEY_COLUMNS for ix in indexes):
+        return
+
+    with engine.begin() as conn:
+        duplicates = conn.execute(text(
+            f"SELECT COUNT(*) FROM (SELECT vehicle_id, date FROM {table} "
+            f"GROUP BY vehicle_id, date HAVING COUNT(*) > 1) d"
+        )).scalar()
+        if duplicates:
+            raise RuntimeError(
+                f"'{table}' 에 (vehicle_id, date) 중복 키가 {duplicates}건 있어 UNIQUE 키를 만들 수 없습니다. "
+                f"중복을 정리한 뒤 다시 실행하세요."
+            )
+        conn.execute(text(f"CREATE UNIQUE INDEX {UNIQUE_KEY_NAME} ON {table} (vehicle_id, date)"))
+    print(f"🔧 '{table}' 에 (vehicle_id, date) UNIQUE 키 추가")
+
+
+def ensure_updated_at_precision(conn, table, column_type=None):
+    """초 단위 updated_at 을 마이크로초 단위(UPDATED_AT_DDL)로 변경 (MariaDB, 이미 변경되어 있으면 그대로)"""
+    if column_type is None:
+        column_type = {c['name']: c['type'] for c in inspect(conn).get_columns(table)}['updated_at']
+    if (getattr(column_type, 'fsp', None) or 0) >= 6:
+        return
+    conn.execute(text(f"ALTER TABLE {table} MODIFY COLUMN updated_at {UPDATED_AT_DDL}"))
+    print(f"🔧 '{table}.updated_at' 마이크로초 단위로 변경")
+
+
+# =========================================================
+# 2. 적재용 데이터 준비
+# =========================================================
+def prepare_frame(df):
+    """DB 컬럼만 남기고 날짜 정규화, 파일 내 중복 키는 마지막 행 기준으로 정리"""
+    df = df[[c for c in DB_COLUMNS if c in df.columns]].copy()
+    df['date'] = pd.to_datetime(df['date']).dt.date
+    df = df.dropna(subset=KEY_COLUMNS).drop_duplicates(subset=KEY_COLUMNS, keep='last')
+    return df.reset_index(drop=True)
+
+
+def _records(df):
+    """DataFrame → dict 목록 (NaN 은 NULL)"""
+    return df.astype(object).where(pd.notnull(df), None).to_dict('records')
+
+
+# =========================================================
+# 3. 적재 방법
+# =========================================================
+def upsert_batches(engine, df, table=TABLE_NAME, batch_size=DEFAULT_BATCH_SIZE):
+    """다건 INSERT ... ON DUPLICATE KEY UPDATE (SQLite: ON CONFLICT DO UPDATE) 를 배치 단위로 실행"""
+    target = Table(table, MetaData(), autoload_with=engine)
+    value_columns = [c for c in df.columns if c not in KEY_COLUMNS]
+
+    if engine.dialect.name == 'sqlite':
+        # ALTER 로 추가된 updated_at 에는 DEFAULT 가 없으므로 명시적으로 기록
+        stmt = sqlite.insert(target).values(updated_at=func.current_timestamp())
+        stmt = stmt.on_conflict_do_update(
+            index_elements=KEY_COLUMNS,
+            set_={**{c: stmt.excluded[c] for c in value_columns}, 'updated_at': func.current_timestamp()},
+        )
+    else:
+        stmt = mysql.insert(target)
+        # 값이 실제로 바뀐 행만 updated_at 이 갱신됨 (ON UPDATE CURRENT_TIMESTAMP)
+        stmt = stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in value_columns})
+
+    records = _records(df)
+    with engine.begin() as conn:
+        for start in range(0, len(records), batch_size):
+            # executemany → SQLAlchemy 가 다건 VALUES 문장으로 묶어서 전송 (행 단위 왕복 없음)
+            conn.execute(stmt, records[start:start + batch_size])
+    return len(records)
+
+
+def load_data_infile(engine, df, table=TABLE_NAME, upsert=True):
+    """
+    임시 CSV → LOAD DATA LOCAL INFILE (MariaDB 전용)
+    - upsert=True: 세션 임시 테이블에 적재한 뒤 INSERT ... SELECT ... ON DUPLICATE KEY UPDATE 로 반영
+      (기존 행은 id / created_at 유지, 값이 실제로 바뀐 행만 updated_at 갱신)
+    - upsert=False: 대상 테이블에 바로 적재 (새로 만든 빈 staging / 적재 테이블용)
+    - 접속 URL 에 local_infile=1 이 허용되어 있어야 하며, 실패하면 호출 측에서 upsert 로 대체
+    """
+    columns = list(df.columns)
+    column_sql = ', '.join(columns)
+    load_table = f"{table}_infile" if upsert else table
+    fd, path = tempfile.mkstemp(prefix='driving_logs_', suffix='.csv')
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            for row in df.itertuples(index=False, name=None):
+                writer.writerow(['\\N' if v is None or (isinstance(v, float) and np.isnan(v)) else v for v in row])
+
+        sql = (
+            f"LOAD DATA LOCAL INFILE :path INTO TABLE {load_table} "
+            f"CHARACTER SET utf8mb4 FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+            f"LINES TERMINATED BY '\\n' ({column_sql})"
+        )
+        with engine.begin() as conn:
+            if upsert:
+                # 임시 테이블은 같은 세션(연결)에서만 보이므로 적재 / 반영을 한 트랜잭션에서 수행
+                # (CREATE ... SELECT LIMIT 0: 컬럼 타입만 복사, 파티션 / 키 없음)
+                conn.execute(text(f"DROP TEMPORARY TABLE IF EXISTS {load_table}"))
+                conn.execute(text(f"CREATE TEMPORARY TABLE {load_table} SELECT {column_sql} FROM {table} LIMIT 0"))
+            conn.execute(text(sql), {'path': path})
+            if upsert:
+                updates = ', '.join(f"{c} = VALUES({c})" for c in columns if c not in KEY_COLUMNS)
+                conn.execute(text(
+                    f"INSERT INTO {table} ({column_sql}) SELECT {column_sql} FROM {load_table} "
+                    f"ON DUPLICATE KEY UPDATE {updates}"
+                ))
+                conn.execute(text(f"DROP TEMPORARY TABLE {load_table}"))
+    finally:
+        os.remove(path)
+    return len(df)
+
+
+def bulk_load(engine, df, table=TABLE_NAME, method='auto', batch_size=DEFAULT_BATCH_SIZE):
+    """
+    driving_logs 에 df 를 Upsert 하고 (처리 행 수, 소요 시간[초], 사용한 방법) 반환
+    - method: 'auto' (MariaDB 면 infile 시도 후 실패 시 upsert), 'infile', 'upsert'
+    """
+    df = prepare_frame(df)
+    ensure_schema(engine, table)
+
+    start = time.perf_counter()
+    used = 'upsert'
+    if method in ('auto', 'infile') and engine.dialect.name in ('mysql', 'mariadb'):
+        try:
+            load_data_infile(engine, df, table)
+            used = 'infile'
+        except Exception as e:
+            if method == 'infile':
+                raise
+            print(f"   - LOAD DATA LOCAL INFILE 사용 불가, 배치 Upsert 로 대체: {e.__class__.__name__}")
+    if used == 'upsert':
+        upsert_batches(engine, df, table, batch_size)
+    elapsed = time.perf_counter() - start
+
+    rate = len(df) / elapsed if elapsed > 0 else float('inf')
+    print(f"🚀 {table}: {len(df):,}행 적재 ({used}, {elapsed:.1f}s, {rate:,.0f} rows/s)")
+    return len(df), elapsed, used
+
+
+# =========================================================
+# 4. 무중단 전체 재적재 (Staging 테이블 + RENAME TABLE 교체)
+# =========================================================
+def _count(conn, table):
+    return conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+
+def reload_via_staging(engine, df, method='auto', batch_size=DEFAULT_BATCH_SIZE, min_ratio=0.9):
+    """
+    전체 데이터를 staging 테이블에 적재한 뒤 운영 테이블과 원자적으로 교체
+    1. driving_logs_staging 을 보조 인덱스 없이 새로 생성하고 적재 (인덱스 유지 비용 없음)
+    2. UNIQUE 키 / 날짜 인덱스를 ALTER 한 번으로 생성 (중복 키가 있으면 여기서 실패 → 교체 안 함)
+    3. 행 수 검증: 적재 건수와 일치해야 하고, 운영 테이블 대비 min_ratio 미만이면 중단 (잘린 입력 방지)
+    4. RENAME TABLE driving_logs → driving_logs_old, staging → driving_logs (단일 문장, 원자적)
+    - 이전 테이블은 driving_logs_old 로 남겨 rollback_reload 로 되돌릴 수 있음
+    """
+    if engine.dialect.name not in ('mysql', 'mariadb'):
+        raise RuntimeError("Staging 교체 재적재는 MariaDB/MySQL 에서만 지원합니다.")
+
+    df = prepare_frame(df)
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE}"))
+        conn.execute(text(create_table_sql(STAGING_TABLE, indexes=False)))
+    print(f"🔨 '{STAGING_TABLE}' 생성 완료.")
+
+    start = time.perf_counter()
+    used = 'upsert'
+    if method in ('auto', 'infile'):
+        try:
+            load_data_infile(engine, df, STAGING_TABLE, upsert=False)
+            used = 'infile'
+        except Exception as e:
+            if method == 'infile':
+                raise
+            print(f"   - LOAD DATA LOCAL INFILE 사용 불가, 배치 INSERT 로 대체: {e.__class__.__name__}")
+    if used == 'upsert':
+        upsert_batches(engine, df, STAGING_TABLE, batch_size)
+    elapsed = time.perf_counter() - start
+    rate = len(df) / elapsed if elapsed > 0 else float('inf')
+    print(f"🚀 {STAGING_TABLE}: {len(df):,}행 적재 ({used}, {elapsed:.1f}s, {rate:,.0f} rows/s)")
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(text(add_indexes_sql(STAGING_TABLE)))
+    print(f"🔧 인덱스 생성 완료 ({time.perf_counter() - start:.1f}s)")
+
+    with engine.begin() as conn:
+        staged = _count(conn, STAGING_TABLE)
+        live = _count(conn, TABLE_NAME) if inspect(conn).has_table(TABLE_NAME) else None
+    if staged != len(df):
+        raise RuntimeError(f"검증 실패: staging {staged:,}행 ≠ 적재 대상 {len(df):,}행 (교체하지 않음)")
+    if live and staged < live * min_ratio:
+        raise RuntimeError(
+            f"검증 실패: staging {staged:,}행이 운영 테이블 {live:,}행의 {min_ratio:.0%} 미만입니다 "
+            f"(입력 파일이 잘렸는지 확인, 의도한 경우 --min-ratio 0)"
+        )
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {OLD_TABLE}"))
+        if live is None:
+            conn.execute(text(f"RENAME TABLE {STAGING_TABLE} TO {TABLE_NAME}"))
+        else:
+            conn.execute(text(f"RENAME TABLE {TABLE_NAME} TO {OLD_TABLE}, {STAGING_TABLE} TO {TABLE_NAME}"))
+    print(f"🔁 교체 완료: {TABLE_NAME} ({staged:,}행), 이전 데이터는 {OLD_TABLE} ({live or 0:,}행)")
+    return staged
+
+
+def rollback_reload(engine):
+    """직전 재적재 되돌리기: driving_logs ↔ driving_logs_old 를 원자적으로 맞바꿈 (다시 실행하면 재적용)"""
+    with engine.begin() as conn:
+        if not inspect(conn).has_table(OLD_TABLE):
+            raise RuntimeError(f"되돌릴 이전 테이블({OLD_TABLE})이 없습니다.")
+        swap = f"{TABLE_NAME}_swap"
+        conn.execute(text(
+            f"RENAME TABLE {TABLE_NAME} TO {swap}, {OLD_TABLE} TO {TABLE_NAME}, {swap} TO {OLD_TABLE}"
+        ))
+        restored = _count(conn, TABLE_NAME)
+    print(f"⏪ 롤백 완료: {TABLE_NAME} ({restored:,}행), 교체되었던 데이터는 {OLD_TABLE}")
+    return restored
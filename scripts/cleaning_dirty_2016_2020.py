@@ -1,13 +1,25 @@
+import argparse
 import pandas as pd
 import numpy as np
+import hashlib
 import json
 import os
+import time
 import asyncio
 import aiohttp
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
+from cleaning_kernels import reference_columns
+from quality_rules import INPUT_COLUMNS, LIMITS, SUSPECT_RULES, evaluate, prepare
+from rate_control import AdaptiveRateLimiter, backoff_delay, parse_retry_after
+from progress_journal import JOURNAL_SUFFIX, ProgressJournal, journal_path
+from response_cache import ResponseCache, cache_key
+from pre_corrector import pre_correct
+from batch_planner import MAX_ROWS, TOKEN_BUDGET, estimate_tokens, plan_batches
+from pipeline_schema import CLEANED_2016_2020, DRIVING_LOG_SCHEMA, PROPOSAL_SCHEMA, read_table, write_table
+
 
 
 # ---------------------------------------------------------
@@ -15,53 +27,38 @@ from dotenv import load_dotenv
 # ---------------------------------------------------------
 load_dotenv()
 API_KEY = os.getenv("GOOGLE_API_KEY")
-API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={API_KEY}"
-CONCURRENCY_LIMIT = 5
-
-# 물리적 한계값 설정 (필터링 및 안전장치용)
-LIMITS = {
-    'PHYS_ERROR_TOLERANCE': 0.20, # 물리 오차 허용 범위 (20%)
-    'FUEL_ERROR_TOLERANCE': 0.01, # 연비 오차 허용 범위 (1%)
-    'MAX_HOURS_PER_DAY': 16,      # 하루 최대 운행 시간
-    'MAX_SPEED': 110,             # 트럭 최고 속도
-    'MAX_DISTANCE': 1000          # 하루 최대 주행 거리
-}
+MODEL_NAME = "gemini-2.5-flash"
+GENERATION_CONFIG = {"temperature": 0.1, "responseMimeType": "application/json"}
+# 로컬 목 서버(mock_gemini.py)로 오프라인 테스트할 때는 GEMINI_API_BASE=http://127.0.0.1:8089 또는 --api-base 로 지정
+API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com")
+CONCURRENCY_LIMIT = 5                                            # 시작 동시 요청 수 (AIMD 로 조절)
+MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "20"))  # 동시 요청 수 상한
+REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_RPM", "60"))         # 분당 요청 한도 (API 할당량에 맞출 것)
+MAX_RETRIES = 5
+# 공통 지시문 컨텍스트 캐시 (cachedContents, 실행 중에만 필요하므로 짧게 유지)
+CONTEXT_CACHE_TTL = 3600
+
+
+def configure_api(base):
+    """API 주소 변경 (generateContent / cachedContents URL 을 함께 갱신)"""
+    global API_BASE, API_URL, CACHE_URL
+    API_BASE = base.rstrip('/')
+    API_URL = f"{API_BASE}/v1beta/models/{MODEL_NAME}:generateContent?key={API_KEY}"
+    CACHE_URL = f"{API_BASE}/v1beta/cachedContents?key={API_KEY}"
+
+
+configure_api(API_BASE)
+
+# 물리적 한계값(LIMITS)과 의심 데이터 규칙은 quality_rules.py 에서 관리 (dirty_check 와 공유)
 
 # ---------------------------------------------------------
 # 2. 헬퍼 함수 (데이터 처리)
 # ---------------------------------------------------------
-def convert_time_to_hours(x):
-    """ 문자열 시간 -> 실수 시간(Hour) 변환 """
-    if pd.isna(x): return None
-    if isinstance(x, (int, float)): return float(x)
-    try:
-        x = str(x).strip()
-        parts = x.split(':')
-        if len(parts) == 3: return int(parts[0]) + int(parts[1])/60 + int(parts[2])/3600
-        elif len(parts) == 2: return int(parts[0]) + int(parts[1])/60
-        else: return float(x)
-    except: return None
-
 def add_full_reference_columns(df):
-    """ 참조값(Reference) 계산 """
+    """ 참조값(Reference) 계산 (cleaning_kernels.reference_columns 로 한 번에 계산) """
     df = df.replace([np.inf, -np.inf], np.nan)
-    
-    # 숫자형 강제 변환
-    cols = {'speed': 'speed_num', 'consumed_fuel': 'fuel_num', 
-            'fuel_efficiency': 'eff_num', 'distance': 'dist_num'}
-    for col, new_col in cols.items():
-        df[new_col] = pd.to_numeric(df[col], errors='coerce')
-    
-    df['time_num'] = df['time'].apply(convert_time_to_hours)
-
-    # 참조값 계산
-    df['ref_dist_phys'] = (df['speed_num'] * df['time_num']).round(2)
-    df['ref_dist_fuel'] = (df['fuel_num'] * df['eff_num']).round(2)
-    df['ref_fuel'] = df.apply(lambda x: x['dist_num'] / x['eff_num'] if (pd.notnull(x['eff_num']) and x['eff_num'] > 0) else 0, axis=1).round(2)
-    df['ref_efficiency'] = df.apply(lambda x: x['dist_num'] / x['fuel_num'] if (pd.notnull(x['fuel_num']) and x['fuel_num'] > 0) else 0, axis=1).round(2)
-    df['ref_speed'] = df.apply(lambda x: x['dist_num'] / x['time_num'] if (pd.notnull(x['time_num']) and x['time_num'] > 0) else 0, axis=1).round(2)
-    df['ref_time'] = df.apply(lambda x: x['dist_num'] / x['speed_num'] if (pd.notnull(x['speed_num']) and x['speed_num'] > 0) else 0, axis=1).round(2)
-    
+    refs = reference_columns(df)
+    df[refs.columns] = refs
     return df
 
 def validate_proposal(row):
@@ -99,9 +96,9 @@ def validate_proposal(row):
             parts = str(val).split(':')
             if len(parts) >= 1 and int(parts[0]) >= 24: return False
         elif target == 'distance':
-            if float(val) > LIMITS['MAX_DISTANCE']: return False
+            if float(val) > LIMITS['DISTANCE_MAX']: return False
         elif target == 'speed':
-            if float(val) > LIMITS['MAX_SPEED']: return False
+            if float(val) > LIMITS['SPEED_MAX']: return False
             
         return True
     except:
@@ -110,291 +107,492 @@ def validate_proposal(row):
 # ---------------------------------------------------------
 # 3. 비동기 통신 및 프롬프트
 # ---------------------------------------------------------
-async def call_gemini_async(session, prompt, semaphore, retries=3):
-    headers = {'Content-Type': 'application/json'}
+def request_body(prompt, cached_content=None):
+    """
+    generateContent 요청 본문
+    - cached_content(컨텍스트 캐시 이름)가 있으면 공통 지시문은 캐시에서 읽도록 이름만 전달
+    - 없으면 systemInstruction 으로 함께 전송 (같은 접두부가 반복되므로 API 의 암묵적 캐시 대상이 됨)
+    """
     data = {
-        "contents": [{"parts": [{"text": prompt}]}],
-        "generationConfig": {"temperature": 0.1, "responseMimeType": "application/json"}
+        "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+        "generationConfig": GENERATION_CONFIG
     }
-    
-    async with semaphore:
-        for attempt in range(retries):
-            try:
+    if cached_content:
+        data["cachedContent"] = cached_content
+    else:
+        data["systemInstruction"] = {"parts": [{"text": SYSTEM_PROMPT}]}
+    return data
+
+def as_proposals(parsed):
+    """
+    응답 JSON → 제안 목록 (형식이 맞지 않으면 None)
+    - 제안 하나(dict)는 목록으로 감쌈, 모든 항목이 dict 이고 id 를 정수로 읽을 수 있어야 함
+    """
+    parsed = [parsed] if isinstance(parsed, dict) else parsed
+    if not isinstance(parsed, list):
+        return None
+    for item in parsed:
+        if not isinstance(item, dict):
+            return None
+        try:
+            int(item['id'])
+        except (KeyError, TypeError, ValueError):
+            return None
+    return parsed
+
+async def call_gemini_async(session, prompt, limiter, retries=MAX_RETRIES, cache=None, cached_content=None):
+    """
+    Gemini 호출 → 파싱된 제안 목록 (정상 응답이 아니면 None, 문제 없음은 [])
+    - cache 가 있으면 (모델, 생성 설정, 공통 지시문, 프롬프트) 해시로 먼저 조회하고, 정상 응답만 저장
+      (형식이 맞지 않는 응답(as_proposals)은 파싱 오류로 집계하고 저장하지 않음)
+    - limiter(AdaptiveRateLimiter)가 RPM / 동시성을 조절하고 상태 코드별 건수를 집계
+    - 429: Retry-After (없으면 지수 백오프) 만큼 대기 후 재시도, 5xx / 네트워크 오류: 지수 백오프 후 재시도
+    - 컨텍스트 캐시가 만료/삭제되어 거부되면 systemInstruction 을 직접 보내는 방식으로 재시도
+    """
+    key = batch_key(prompt) if cache is not None else None
+    if cache is not None:
+        # 예전 실행이 저장한 형식 오류 응답은 캐시 미스로 보고 다시 호출
+        cached = as_proposals(cache.get(key))
+        if cached is not None:
+            return cached
+
+    headers = {'Content-Type': 'application/json'}
+    data = request_body(prompt, cached_content)
+
+    for attempt in range(retries):
+        result, delay = None, 0
+        try:
+            async with limiter.slot():
                 async with session.post(API_URL, headers=headers, json=data) as response:
+                    limiter.record(response.status)
                     if response.status == 200:
                         result = await response.json()
-                        try:
-                            text = result['candidates'][0]['content']['parts'][0]['text']   
-                            parsed = json.loads(text)
-                            return [parsed] if isinstance(parsed, dict) else parsed
-                        except: return []
                     elif response.status == 429:
-                        await asyncio.sleep((attempt + 1) * 5)
-                    else: return []
-            except Exception: await asyncio.sleep(3)
-    return []
-
-async def process_batch(session, stats, batch_df, semaphore):
-    data_json = batch_df.to_json(orient='records', force_ascii=False)
-
-    # AI에게 줄 이번 달 평균 정보 (문맥 제공용)
-    context_info = f"""
-    - Monthly Avg Distance: {stats['avg_dist']:.1f} km
-    - Monthly Avg Efficiency: {stats['avg_eff']:.2f} km/L
-    - Monthly Avg Fuel: {stats['avg_fuel']:.1f} L
+                        delay = limiter.throttled(parse_retry_after(response.headers.get('Retry-After')), attempt)
+                    elif response.status >= 500:
+                        delay = backoff_delay(attempt)
+                    elif cached_content and response.status in (400, 403, 404):
+                        cached_content = None
+                        data = request_body(prompt)
+                    else:
+                        print(f"\n⚠️ Gemini 요청 거부 ({response.status}): {(await response.text())[:200]}")
+                        return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            limiter.record(type(e).__name__)
+            delay = backoff_delay(attempt)
+
+        if result is not None:
+            try:
+                text = result['candidates'][0]['content']['parts'][0]['text']
+                parsed = as_proposals(json.loads(text))
+            except (KeyError, IndexError, TypeError, ValueError):
+                parsed = None
+            if parsed is None:
+                limiter.record('parse_error')
+                return None
+            if cache is not None:
+                cache.put(key, parsed, model=MODEL_NAME)
+            return parsed
+        await asyncio.sleep(delay)
+
+    limiter.record('gave_up')
+    return None
+
+async def create_context_cache(session, ttl_seconds=CONTEXT_CACHE_TTL):
     """
-    
-    # =================================================================
-    # 프롬프트 및 Few-Shot 예제
-    # =================================================================
-    few_shot_examples = """
-    [Case 1: Unit Error (Reurea)]
-    - Input: {"id": 10, "reurea": 6}
-    - Reasoning: Single digit reurea (1~9) is a recording error (Event count). Force replace with standard unit 20L.
-    - Output: [{"id": 10, "target": "reurea", "original": 6, "proposed": 20, "reference": null, "reason": "Unit error correction (Force 6 -> 20L). Standard refill volume."}]
-
-    [Case 2: Copy-Paste Error (Distance == Fuel)]
-    - Input: {"id": 55, "distance": 133.51, "consumed_fuel": 133.51, "fuel_efficiency": 2.77}
-    - Context: Monthly Avg Distance = 450.0 km
-    - Reasoning: 
-      1. Distance and Fuel are identical (133.51). One is wrong.
-      2. Compare with Avg Dist (450.0): 133.51 is suspiciously low.
-      3. Assume Fuel (133.51) is correct. Recalculate Dist = Fuel * Eff.
-    - Output: [{"id": 55, "target": "distance", "original": 133.51, "proposed": 369.8, "reference": 369.8, "reason": "Copy error (Dist=Fuel). Recalculated distance using fuel * efficiency."}]
-
-    [Case 3: Digit Omission (Leading Digit)]
-    - Input: {"id": 41, "distance": 36.9, "ref_dist_fuel": 538.75}
-    - Reasoning: Original (36.9) is too small vs Reference (538.75). Missing leading '5'. 536.9 matches reference closely.
-    - Output: [{"id": 41, "target": "distance", "original": 36.9, "proposed": 536.9, "reference": 538.75, "reason": "Missing leading digit '5' detected (36.9 -> 536.9)."}]
-
-    [Case 4: Digit Omission (Middle Digit)]
-    - Input: {"id": 42, "consumed_fuel": 17.51, "ref_fuel": 179.17}
-    - Reasoning: Original (17.51) vs Ref (179.17). Missing '9' in middle makes 179.51.
-    - Output: [{"id": 42, "target": "consumed_fuel", "original": 17.51, "proposed": 179.51, "reference": 179.17, "reason": "Missing digit '9' detected (17.51 -> 179.51)."}]
-
-    [Case 5: Fat Finger (Double Entry)]
-    - Input: {"id": 22, "distance": 4718.1, "ref_dist_fuel": 478.8}
-    - Reasoning: 4718.1 is physically impossible (>1500km). Likely double-tapped '1'. 478.1 is close to Ref.
-    - Output: [{"id": 22, "target": "distance", "original": 4718.1, "proposed": 478.1, "reference": 478.8, "reason": "Fat finger typo (4718.1 -> 478.1). Matches calculated distance."}]
-
-    [Case 6: Keypad Neighbor Typo]
-    - Input: {"id": 35, "distance": 638.1, "ref_dist_fuel": 537.3}
-    - Reasoning: 638.1 vs 537.3. Keypad '6' is above '5'. 538.1 matches Ref.
-    - Output: [{"id": 35, "target": "distance", "original": 638.1, "proposed": 538.1, "reference": 537.3, "reason": "Keypad typo suspected (6->5). Validated by calc."}]
-
-    [Case 7: Cumulative Distance Regression (Logic Error)]
-    - Input: {"id": 1254, "cumulative_distance": 131185.0, "prev_cum_dist": 131343.0}
-    - Reasoning: Current < Previous. Impossible. Requires manual check.
-    - Output: [{"id": 1254, "target": "cumulative_distance", "original": 131185.0, "proposed": null, "reference": 131343.0, "reason": "Logic Error: Cumulative distance regression. Manual Check Required."}]
-
-    [Case 8: Time Outlier (> 20h)]
-    - Input: {"id": 720, "time": "35:27:00", "ref_time": "3:30"}
-    - Reasoning: Time 35h is physically impossible (> 20h). Likely typo 35 -> 03.
-    - Output: [{"id": 720, "target": "time", "original": "35:27:00", "proposed": "03:27:00", "reference": "03:30", "reason": "Time outlier (>20h). Corrected to 03:xx based on reference."}]
-
-    [Case 9: Impossible Distance (Decimal Error)]
-    - Input: {"id": 501, "distance": 5305, "time": "12:12:00", "speed": 43.1}
-    - Reasoning: 5305km is impossible (>1500km). Do NOT adjust time to 123h. Fix distance decimal: 5305 -> 530.5.
-    - Output: [{"id": 501, "target": "distance", "original": 5305, "proposed": 530.5, "reference": 525.8, "reason": "Impossible distance outlier. Corrected typo (5305 -> 530.5)."}]
-
-    [Case 10: Ambiguous / Unsolvable]
-    - Input: {"id": 99, "time": "11:64"}
-    - Reasoning: Invalid format, ambiguous fix.
-    - Output: [{"id": 99, "target": "manual_check", "original": "11:64", "proposed": null, "reference": null, "reason": "Invalid time format & ambiguous. Manual review."}]
+    공통 지시문(SYSTEM_PROMPT)을 컨텍스트 캐시(cachedContents)로 한 번만 등록하고 캐시 이름 반환
+    - 모델/지시문 길이(최소 토큰 수 미달) 등으로 생성이 거부되면 None → systemInstruction 으로 전송
     """
-
-    prompt = f"""
-    You are a Data Cleaning Expert.
-    Your goal is to detect and fix typos by comparing 'User Input' vs 'Calculated Reference'.
-
-    [Context Info (Averages)]
-    {context_info}
-
-    [Logic: Visual Pattern Matching]
-    For each row, I provide the 'Original Input' and the 'Calculated Reference' (derived from other variables).
-    1. Compare the **Original** value with its corresponding **Reference** value.
-    2. If they differ significantly, check if the **Reference** value looks like a corrected version of the **Original** (e.g., typo, missing digit, wrong decimal).
-    3. **Priority:** Trust the value that resolves the conflict with minimum edits to the original digits.
-
-    [Columns Provided]
-    - original: distance, consumed_fuel, fuel_efficiency, speed, time
-    - reference: 
-    - ref_dist_phys (from Speed*Time)
-    - ref_dist_fuel (from Fuel*Eff)
-    - ref_fuel (from Dist/Eff)
-    - ref_efficiency (from Dist/Fuel)
-    - ref_speed (from Dist/Time)
-    - ref_time (from Dist/Speed)
-
-    [Few-Shot Example]
-    {few_shot_examples}
-
-    [Output Schema]
-    Return a JSON list. If valid, return [].
-    {{
-        "id": (int),
-        "target": (str),
-        "original": (value),
-        "proposed": (value),
-        "reference": (value),
-        "reason": (str)
-    }}
-
-    [Data to Analyze]
-    {data_json}
+    body = {
+        "model": f"models/{MODEL_NAME}",
+        "systemInstruction": {"parts": [{"text": SYSTEM_PROMPT}]},
+        "ttl": f"{int(ttl_seconds)}s",
+    }
+    try:
+        async with session.post(CACHE_URL, json=body) as response:
+            if response.status == 200:
+                return (await response.json()).get('name')
+            reason = (await response.text())[:200]
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        reason = type(e).__name__
+    print(f"ℹ️ 컨텍스트 캐시 미사용 (systemInstruction 으로 전송): {reason}")
+    return None
+
+async def delete_context_cache(session, name):
+    """실행이 끝나면 컨텍스트 캐시 삭제 (실패해도 ttl 이 지나면 자동 만료)"""
+    try:
+        async with session.delete(f"{API_BASE}/v1beta/{name}?key={API_KEY}") as response:
+            await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        pass
+
+
+# =================================================================
+# 공통 지시문 (모든 배치에 동일 → 한 번만 만들어 systemInstruction / 컨텍스트 캐시로 재사용)
+# =================================================================
+FEW_SHOT_EXAMPLES = """
+[Case 1: Unit Error (Reurea)]
+- Input: {"id": 10, "reurea": 6}
+- Reasoning: Single digit reurea (1~9) is a recording error (Event count). Force replace with standard unit 20L.
+- Output: [{"id": 10, "target": "reurea", "original": 6, "proposed": 20, "reference": null, "reason": "Unit error correction (Force 6 -> 20L). Standard refill volume."}]
+
+[Case 2: Copy-Paste Error (Distance == Fuel)]
+- Input: {"id": 55, "distance": 133.51, "consumed_fuel": 133.51, "fuel_efficiency": 2.77}
+- Context: Monthly Avg Distance = 450.0 km
+- Reasoning: 
+  1. Distance and Fuel are identical (133.51). One is wrong.
+  2. Compare with Avg Dist (450.0): 133.51 is suspiciously low.
+  3. Assume Fuel (133.51) is correct. Recalculate Dist = Fuel * Eff.
+- Output: [{"id": 55, "target": "distance", "original": 133.51, "proposed": 369.8, "reference": 369.8, "reason": "Copy error (Dist=Fuel). Recalculated distance using fuel * efficiency."}]
+
+[Case 3: Digit Omission (Leading Digit)]
+- Input: {"id": 41, "distance": 36.9, "ref_dist_fuel": 538.75}
+- Reasoning: Original (36.9) is too small vs Reference (538.75). Missing leading '5'. 536.9 matches reference closely.
+- Output: [{"id": 41, "target": "distance", "original": 36.9, "proposed": 536.9, "reference": 538.75, "reason": "Missing leading digit '5' detected (36.9 -> 536.9)."}]
+
+[Case 4: Digit Omission (Middle Digit)]
+- Input: {"id": 42, "consumed_fuel": 17.51, "ref_fuel": 179.17}
+- Reasoning: Original (17.51) vs Ref (179.17). Missing '9' in middle makes 179.51.
+- Output: [{"id": 42, "target": "consumed_fuel", "original": 17.51, "proposed": 179.51, "reference": 179.17, "reason": "Missing digit '9' detected (17.51 -> 179.51)."}]
+
+[Case 5: Fat Finger (Double Entry)]
+- Input: {"id": 22, "distance": 4718.1, "ref_dist_fuel": 478.8}
+- Reasoning: 4718.1 is physically impossible (>1500km). Likely double-tapped '1'. 478.1 is close to Ref.
+- Output: [{"id": 22, "target": "distance", "original": 4718.1, "proposed": 478.1, "reference": 478.8, "reason": "Fat finger typo (4718.1 -> 478.1). Matches calculated distance."}]
+
+[Case 6: Keypad Neighbor Typo]
+- Input: {"id": 35, "distance": 638.1, "ref_dist_fuel": 537.3}
+- Reasoning: 638.1 vs 537.3. Keypad '6' is above '5'. 538.1 matches Ref.
+- Output: [{"id": 35, "target": "distance", "original": 638.1, "proposed": 538.1, "reference": 537.3, "reason": "Keypad typo suspected (6->5). Validated by calc."}]
+
+[Case 7: Cumulative Distance Regression (Logic Error)]
+- Input: {"id": 1254, "cumulative_distance": 131185.0, "prev_cum_dist": 131343.0}
+- Reasoning: Current < Previous. Impossible. Requires manual check.
+- Output: [{"id": 1254, "target": "cumulative_distance", "original": 131185.0, "proposed": null, "reference": 131343.0, "reason": "Logic Error: Cumulative distance regression. Manual Check Required."}]
+
+[Case 8: Time Outlier (> 20h)]
+- Input: {"id": 720, "time": "35:27:00", "ref_time": "3:30"}
+- Reasoning: Time 35h is physically impossible (> 20h). Likely typo 35 -> 03.
+- Output: [{"id": 720, "target": "time", "original": "35:27:00", "proposed": "03:27:00", "reference": "03:30", "reason": "Time outlier (>20h). Corrected to 03:xx based on reference."}]
+
+[Case 9: Impossible Distance (Decimal Error)]
+- Input: {"id": 501, "distance": 5305, "time": "12:12:00", "speed": 43.1}
+- Reasoning: 5305km is impossible (>1500km). Do NOT adjust time to 123h. Fix distance decimal: 5305 -> 530.5.
+- Output: [{"id": 501, "target": "distance", "original": 5305, "proposed": 530.5, "reference": 525.8, "reason": "Impossible distance outlier. Corrected typo (5305 -> 530.5)."}]
+
+[Case 10: Ambiguous / Unsolvable]
+- Input: {"id": 99, "time": "11:64"}
+- Reasoning: Invalid format, ambiguous fix.
+- Output: [{"id": 99, "target": "manual_check", "original": "11:64", "proposed": null, "reference": null, "reason": "Invalid time format & ambiguous. Manual review."}]
+"""
+
+SYSTEM_PROMPT = f"""
+You are a Data Cleaning Expert.
+Your goal is to detect and fix typos by comparing 'User Input' vs 'Calculated Reference'.
+Each request gives [Context Info (Averages)] for every month in the batch (and each vehicle in it) and [Data to Analyze].
+Compare each row with the averages of its own month and vehicle.
+
+[Logic: Visual Pattern Matching]
+For each row, I provide the 'Original Input' and the 'Calculated Reference' (derived from other variables).
+1. Compare the **Original** value with its corresponding **Reference** value.
+2. If they differ significantly, check if the **Reference** value looks like a corrected version of the **Original** (e.g., typo, missing digit, wrong decimal).
+3. **Priority:** Trust the value that resolves the conflict with minimum edits to the original digits.
+
+[Columns Provided]
+- original: distance, consumed_fuel, fuel_efficiency, speed, time
+- reference: 
+- ref_dist_phys (from Speed*Time)
+- ref_dist_fuel (from Fuel*Eff)
+- ref_fuel (from Dist/Eff)
+- ref_efficiency (from Dist/Fuel)
+- ref_speed (from Dist/Time)
+- ref_time (from Dist/Speed)
+
+[Few-Shot Example]
+{FEW_SHOT_EXAMPLES}
+[Output Schema]
+Return a JSON list. If valid, return [].
+{{
+    "id": (int),
+    "target": (str),
+    "original": (value),
+    "proposed": (value),
+    "reference": (value),
+    "reason": (str)
+}}
+"""
+SYSTEM_PROMPT_TOKENS = estimate_tokens(SYSTEM_PROMPT)
+
+
+def build_prompt(batch_df, months, month_stats, vehicle_stats):
     """
-    # =================================================================
+    배치별 프롬프트 (평균 문맥 + 데이터만, 공통 지시문은 SYSTEM_PROMPT)
+    - months: batch_df 각 행의 월, month_stats / vehicle_stats: 월별 / (월, 차량)별 평균
+    """
+    data_json = batch_df.to_json(orient='records', force_ascii=False)
+
+    # AI에게 줄 평균 정보 (문맥 제공용): 배치에 포함된 달마다 월 평균 + 차량별 월 평균
+    # (차량마다 적재량/노선이 달라 월 전체 평균보다 기준으로 적합)
+    context_info = ""
+    keys = pd.DataFrame({'month': np.asarray(months), 'vehicle_id': batch_df['vehicle_id'].to_numpy()})
+    for month, vehicles in keys.groupby('month', sort=True)['vehicle_id']:
+        m = month_stats.loc[month]
+        context_info += (f"- {month} Monthly Avg: Distance {m['avg_dist']:.1f} km, "
+                         f"Efficiency {m['avg_eff']:.2f} km/L, Fuel {m['avg_fuel']:.1f} L\n")
+        for vehicle in pd.unique(vehicles):
+            if (month, vehicle) in vehicle_stats.index:
+                v = vehicle_stats.loc[(month, vehicle)]
+                context_info += (f"  - Vehicle {vehicle}: Distance {v['avg_dist']:.1f} km, "
+                                 f"Efficiency {v['avg_eff']:.2f} km/L, Fuel {v['avg_fuel']:.1f} L\n")
+
+    return f"[Context Info (Averages)]\n{context_info}\n[Data to Analyze]\n{data_json}\n"
+
+
+def batch_key(prompt):
+    """배치 식별 키 (응답 캐시 키와 동일: 데이터/평균/공통 지시문이 같으면 같은 키)"""
+    return cache_key(MODEL_NAME, GENERATION_CONFIG, prompt, SYSTEM_PROMPT)
+
+
+async def process_batch(session, key, prompt, limiter, cache=None, cached_content=None):
+    """(배치 키, 제안 목록 또는 실패 시 None)"""
+    return key, await call_gemini_async(session, prompt, limiter, cache=cache, cached_content=cached_content)
+
+
+def find_resumable_output(data_dir):
+    """진행 기록이 있는 가장 최근 결과 파일 (없으면 None)"""
+    journals = sorted(Path(data_dir).glob(f'cleaning_proposal_ai_*{JOURNAL_SUFFIX}'))
+    for journal in reversed(journals):
+        output = journal.with_name(journal.name[:-len(JOURNAL_SUFFIX)] + '.csv')
+        if output.exists():
+            return output
+    return None
+
+def save_proposals(proposals, df, output_path):
+    """AI 제안을 검증 후 결과 파일에 추가하고 저장한 건수 반환 (목록이 아니면 0)"""
+    if not proposals or not isinstance(proposals, list):
+        return 0
+    res_df = pd.DataFrame(proposals)
+    
+    # 유효성 검사 및 정제
+    if res_df.empty or 'target' not in res_df.columns: return 0
+    
+    # [최적화 3] 안전장치 가동: 말도 안 되는 제안값 자동 기각
+    valid_mask = res_df.apply(validate_proposal, axis=1)
+    res_df = res_df[valid_mask]
+    
+    if res_df.empty: return 0
+
+    # [수정] 결과 파일 저장 시 date, vehicle_id를 원본에서 찾아 병합 (Merge)
+    # AI가 반환한 JSON에는 id만 있을 수 있으므로, 원본 df에서 날짜 정보를 가져옴
+    # id 를 정수로 읽을 수 없는 제안은 버림
+    if 'id' not in res_df.columns: return 0
+    res_df['id'] = pd.to_numeric(res_df['id'], errors='coerce')
+    res_df = res_df.dropna(subset=['id']).astype({'id': int})
+    if res_df.empty: return 0
+    
+    # 원본 데이터(df)에서 해당 id의 날짜와 차량번호 매핑
+    merged_df = res_df.merge(df[['id', 'date', 'vehicle_id']], on='id', how='left')
+    
+    # 저장할 컬럼 순서 지정
+    cols_to_save = ['id', 'date', 'vehicle_id', 'target', 'original', 'proposed', 'reference', 'reason']
+    for col in cols_to_save:
+        if col not in merged_df.columns: merged_df[col] = None
+    
+    merged_df = merged_df[cols_to_save].dropna(subset=['id'])
+    merged_df.to_csv(output_path, mode='a', header=False, index=False, encoding='utf-8-sig', lineterminator='\n')
+    return len(merged_df)
 
-    return await call_gemini_async(session, prompt, semaphore)
 
 # ---------------------------------------------------------
 # 4. 메인 실행 함수
 # ---------------------------------------------------------
-async def main_async():
+async def main_async(cache=None, rpm=REQUESTS_PER_MINUTE, max_concurrency=MAX_CONCURRENCY, resume=None,
+                     token_budget=TOKEN_BUDGET, max_rows=MAX_ROWS, context_cache=True, rule_based=True,
+                     input_path=None, output_dir=None, csv=False):
+    """
+    resume: None 이면 새 결과 파일로 시작, True 면 가장 최근 결과 파일을 이어서, 경로면 해당 파일을 이어서 처리
+    token_budget / max_rows: 배치 하나의 데이터 토큰 예산 / 최대 행 수 (batch_planner)
+    context_cache: 공통 지시문을 컨텍스트 캐시로 등록해서 재사용 (실패 시 systemInstruction 으로 전송)
+    rule_based: 규칙으로 확정되는 보정은 AI 없이 바로 기록 (pre_corrector)
+    input_path / output_dir: 입력 파일 / 결과 폴더 (기본: data/processed/driving_log_2016_2020_cleaned.parquet / data)
+    csv: 모든 배치가 끝난 뒤에도 진행용 CSV 를 남김 (결과는 항상 같은 이름의 .parquet 으로 저장)
+    반환: 실행 요약 (배치 수, 실패 수, 저장 건수, 응답 상태별 집계, 소요 시간)
+    """
+    started = time.perf_counter()
     current_dir = Path(__file__).resolve().parent
     project_root = current_dir.parent
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    input_path = project_root / 'data' / 'processed' / 'driving_log_2016_2020_messy_cleaned.csv'
-    output_path = project_root / 'data' / f'cleaning_proposal_ai_{timestamp}.csv'
-
-    # 결과 파일 초기화
-    header_df = pd.DataFrame(columns=['id', 'date', 'vehicle_id', 'target', 'original', 'proposed', 'reference', 'reason'])
-    header_df.to_csv(output_path, index=False, encoding='utf-8-sig')
+    input_path = Path(input_path or project_root / 'data' / 'processed' / CLEANED_2016_2020)
+    output_dir = Path(output_dir or project_root / 'data')
+    output_path = output_dir / f'cleaning_proposal_ai_{timestamp}.csv'
+
+    if resume:
+        # 진행용 CSV 에 이어서 기록 (결과 .parquet 경로를 지정해도 같은 이름의 CSV)
+        output_path = Path(resume).with_suffix('.csv') if resume is not True else find_resumable_output(output_dir)
+        if output_path is None or not output_path.exists():
+            print(f"❌ 이어서 처리할 결과 파일이 없습니다: {output_path or output_dir}")
+            return None
+    journal = ProgressJournal(journal_path(output_path))
+    completed = journal.completed() if resume else set()
+
+    if resume:
+        print(f"⏯️ 이어서 처리: {output_path.name} (완료된 배치 {len(completed)}개 건너뜀)")
+    else:
+        # 결과 파일 초기화
+        header_df = pd.DataFrame(columns=['id', 'date', 'vehicle_id', 'target', 'original', 'proposed', 'reference', 'reason'])
+        header_df.to_csv(output_path, index=False, encoding='utf-8-sig')
 
     print("🚀 데이터 로드 및 전처리...")
-    df = pd.read_csv(input_path)
+    # 규칙 / 프롬프트에 쓰는 컬럼만 로드 (Parquet 이 없으면 예전 CSV 를 같은 스키마로 변환)
+    df = read_table(input_path, columns=INPUT_COLUMNS, schema=DRIVING_LOG_SCHEMA)
     df = add_full_reference_columns(df)
     
     df['id'] = df.index
+    # 프롬프트 / 배치 키에는 기존과 같은 'YYYY-MM-DD' 문자열을 사용
     df['date_dt'] = pd.to_datetime(df['date'])
+    df['date'] = df['date_dt'].dt.strftime('%Y-%m-%d')
     df['month'] = df['date_dt'].dt.to_period('M')
 
-    # [최적화 1] 누적 주행거리 역전 검사를 위한 전역 정렬 및 Shift
-    print("⚡ 누적 주행거리 논리 검사 준비 중...")
+    # [최적화 1] 의심 데이터 규칙을 전체 데이터에 한 번에 평가 (quality_rules)
+    # - 연비 계산 불일치 / 거리 vs 속도×시간 / 시간 형식·범위 / 요소수 단위 / 누적 주행거리 역전
+    print("⚡ 의심 데이터 규칙 평가 중...")
+    quality = prepare(df)
+    violations = evaluate(df, SUSPECT_RULES, frame=quality)
+    df['suspect'] = violations.any(axis=1)
+    # AI 힌트: 같은 차량의 직전(값이 있는) 누적 주행거리
+    df['prev_cum_dist'] = quality['prev_cum']
+    for name, count in violations.sum().items():
+        print(f"   - {name}: {count}건")
+
+    # [최적화 5] 규칙으로 확정되는 보정(요소수 단위, 거리=연료 복사, 숫자 오타, 누적거리 역전)은
+    # 바로 결과 파일에 기록하고, 남은 의심 행만 AI 검토
+    rule_count = 0
+    if rule_based:
+        rule_proposals, residual = pre_correct(df, quality, violations)
+        before, rule_count = int(df['suspect'].sum()), len(rule_proposals)
+        df['suspect'] &= residual
+        rule_key = 'rules:' + hashlib.sha256(rule_proposals.to_json().encode('utf-8')).hexdigest()
+        if rule_key not in completed:
+            saved = save_proposals(rule_proposals.drop(columns=['date', 'vehicle_id']).to_dict('records'), df, output_path)
+            journal.record(rule_key, 'done', proposals=len(rule_proposals), saved=saved)
+        print(f"🔧 규칙 기반 보정 {len(rule_proposals)}건 → AI 검토 대상 {before}건 → {int(df['suspect'].sum())}건")
     df = df.sort_values(by=['vehicle_id', 'date_dt'])
-    df['prev_cum_dist'] = df.groupby('vehicle_id')['cumulative_distance'].shift(1)
-    
-    # 누적 주행거리 에러 마스크 (전역 계산)
-    mask_cum_error = (
-        (df['cumulative_distance'].notna()) & 
-        (df['prev_cum_dist'].notna()) & 
-        (df['cumulative_distance'] < df['prev_cum_dist'])
-    )
-
-    semaphore = asyncio.Semaphore(CONCURRENCY_LIMIT)
-    connector = aiohttp.TCPConnector(limit=10, force_close=True)
-
-    async with aiohttp.ClientSession(connector=connector) as session:
-        tasks = []
-        
-        # 월별 처리 루프
-        for month, group in df.groupby('month'):
-            print(f"📅 {month} 데이터 분석 중... (대상: {len(group)}건)")
-            stats = {
-                'avg_dist': group['distance'].mean(),
-                'avg_eff': group['fuel_efficiency'].mean(),
-                'avg_fuel': group['consumed_fuel'].mean()
-            }
-            # [최적화 2] 벡터화된 필터링 (iterrows 제거)
-            
-            # 조건 1: 연비 시스템 검증
-            mask_fuel = (
-                (group['consumed_fuel'] > 0) & (group['fuel_efficiency'] > 0) &
-                (abs((group['distance'] / group['consumed_fuel'] - group['fuel_efficiency']) / group['fuel_efficiency']) > LIMITS['FUEL_ERROR_TOLERANCE'])
-            )
-
-            # 조건 2: 물리 시스템 검증
-            mask_phys = (
-                (group['ref_dist_phys'].notna()) & (group['distance'] > 0) &
-                (abs(group['distance'] - group['ref_dist_phys']) / group['distance'] > LIMITS['PHYS_ERROR_TOLERANCE'])
-            )
-
-            # 조건 3: 시간 포맷 및 범위 검증
-            def is_invalid_time(t):
-                if pd.isna(t) or ':' not in str(t): return False
-                try:
-                    h, m, s = map(int, str(t).split(':'))
-                    return h >= LIMITS['MAX_HOURS_PER_DAY'] or m >= 60 
-                except: return True
-            mask_time = group['time'].apply(is_invalid_time)
-
-            # 조건 4: 요소수 단위 검증
-            mask_reurea = (group['reurea'].notna()) & (group['reurea'].isin([1, 2, 6]))
-            
-            # 조건 5: 누적 주행거리 에러 (전역 마스크 매핑)
-            mask_cum = mask_cum_error.loc[group.index]
-
-            # 최종 의심 데이터 추출
-            suspect_df = group[mask_fuel | mask_phys | mask_time | mask_reurea | mask_cum].copy()
-
-            if not suspect_df.empty:
-                # AI에게 보낼 컬럼 선택 (Hints 포함)
-                target_cols = ['id', 'date', 'vehicle_id', 'distance', 'consumed_fuel', 
-                               'fuel_efficiency', 'time', 'speed', 'reurea', 
-                               'cumulative_distance', 'prev_cum_dist', 'ref_time']
-                
-                for col in target_cols:
-                    if col not in suspect_df.columns: suspect_df[col] = None
-
-                # 배치 분할 및 Task 예약
-                batch_size = 15
-                for i in range(0, len(suspect_df), batch_size):
-                    batch_slice = suspect_df.iloc[i:i+batch_size][target_cols]
-                    tasks.append(process_batch(session, stats, batch_slice, semaphore))
-
-        print(f"📦 총 {len(tasks)}개의 배치 작업이 예약되었습니다. 실행 중...")
+
+    limiter = AdaptiveRateLimiter(rpm=rpm, initial=min(CONCURRENCY_LIMIT, max_concurrency), max_concurrency=max_concurrency)
+    # keep-alive 연결 재사용 (force_close 없이, 동시성 상한만큼 연결 유지)
+    connector = aiohttp.TCPConnector(limit=max_concurrency, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(total=120)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # AI에게 보낼 컬럼 (Hints 포함)
+        target_cols = ['id', 'date', 'vehicle_id', 'distance', 'consumed_fuel',
+                       'fuel_efficiency', 'time', 'speed', 'reurea',
+                       'cumulative_distance', 'prev_cum_dist', 'ref_time']
+        for col in target_cols:
+            if col not in df.columns: df[col] = None
+
+        # 월 / 월·차량별 평균 (문맥 제공용, 의심 행이 아닌 전체 행 기준)
+        agg = dict(avg_dist=('distance', 'mean'), avg_eff=('fuel_efficiency', 'mean'), avg_fuel=('consumed_fuel', 'mean'))
+        month_stats = df.groupby('month').agg(**agg)
+        vehicle_stats = df.groupby(['month', 'vehicle_id']).agg(**agg)
+
+        # [최적화 4] 토큰 예산 기반 배치 구성 (같은 달·차량끼리 묶음)
+        suspect_df = df[df['suspect']]
+        for month, count in suspect_df.groupby('month').size().items():
+            print(f"📅 {month} 의심 데이터: {count}건")
+        batches = plan_batches(suspect_df, budget=token_budget, max_rows=max_rows, columns=target_cols)
+
+        planned = []
+        skipped = 0
+        data_tokens = 0
+        for batch in batches:
+            prompt = build_prompt(batch, df.loc[batch.index, 'month'], month_stats, vehicle_stats)
+            key = batch_key(prompt)
+            if key in completed:
+                skipped += 1
+                continue
+            data_tokens += estimate_tokens(prompt)
+            planned.append((key, prompt))
+
+        # 공통 지시문은 한 번만 등록 (요청이 2개 이상일 때만 의미 있음)
+        cached_content = None
+        if context_cache and len(planned) > 1:
+            cached_content = await create_context_cache(session)
+        print(f"🧾 입력 토큰 추정: 배치 데이터 {data_tokens:,} + 공통 지시문 {SYSTEM_PROMPT_TOKENS:,} × "
+              f"{1 if cached_content else len(planned)}회 ({'컨텍스트 캐시' if cached_content else 'systemInstruction'})")
+
+        tasks = [process_batch(session, key, prompt, limiter, cache, cached_content) for key, prompt in planned]
+
+        print(f"📦 총 {len(tasks)}개의 배치 작업이 예약되었습니다. 실행 중... (완료 기록으로 건너뜀: {skipped}개)")
         
         total_corrections = 0
+        failed = 0
         for future in asyncio.as_completed(tasks):
-            proposals = await future
-            if proposals:
-                res_df = pd.DataFrame(proposals)
-                
-                # 유효성 검사 및 정제
-                if res_df.empty or 'target' not in res_df.columns: continue
-                
-                # [최적화 3] 안전장치 가동: 말도 안 되는 제안값 자동 기각
-                valid_mask = res_df.apply(validate_proposal, axis=1)
-                res_df = res_df[valid_mask]
-                
-                if res_df.empty: continue
-
-                # [수정] 결과 파일 저장 시 date, vehicle_id를 원본에서 찾아 병합 (Merge)
-                # AI가 반환한 JSON에는 id만 있을 수 있으므로, 원본 df에서 날짜 정보를 가져옴
-                res_df['id'] = res_df['id'].astype(int)
-                
-                # 원본 데이터(df)에서 해당 id의 날짜와 차량번호 매핑
-                merged_df = res_df.merge(df[['id', 'date', 'vehicle_id']], on='id', how='left')
-                
-                # 저장할 컬럼 순서 지정
-                cols_to_save = ['id', 'date', 'vehicle_id', 'target', 'original', 'proposed', 'reference', 'reason']
-                for col in cols_to_save:
-                    if col not in merged_df.columns: merged_df[col] = None
-                
-                merged_df = merged_df[cols_to_save].dropna(subset=['id'])
-                merged_df.to_csv(output_path, mode='a', header=False, index=False, encoding='utf-8-sig', lineterminator='\n')
-                
-                count = len(merged_df)
-                total_corrections += count
-                print(f"✅ 배치 완료: {count}건 저장 (누적 {total_corrections})")
+            key, proposals = await future
+            if proposals is None:
+                # 실패한 배치는 기록만 남기고 --resume 시 다시 시도
+                failed += 1
+                journal.record(key, 'failed')
+                continue
+            saved = save_proposals(proposals, df, output_path)
+            # 결과를 파일에 쓴 뒤 완료 기록 (기록 전에 중단되면 --resume 시 다시 처리)
+            journal.record(key, 'done', proposals=len(proposals), saved=saved)
+            if saved:
+                total_corrections += saved
+                print(f"✅ 배치 완료: {saved}건 저장 (누적 {total_corrections})")
             else:
                 print(".", end="", flush=True)
 
-    # 최종 정렬
+        if failed:
+            print(f"\n⚠️ 실패한 배치 {failed}개 → --resume 으로 다시 실행하면 해당 배치만 재시도")
+        if cached_content:
+            await delete_context_cache(session, cached_content)
+
+    # 최종 정렬 → 공용 스키마 Parquet 으로 저장 (apply_corrections 입력)
+    # 진행용 CSV 는 --resume 이 필요할 때(실패한 배치가 있을 때)나 csv=True 일 때만 남김
     print("\n🧹 최종 결과 정렬 중...")
     try:
-        final_df = pd.read_csv(output_path)
-        if not final_df.empty:
-            final_df = final_df.sort_values(by='id')
-            final_df.to_csv(output_path, index=False, encoding='utf-8-sig')
-            print("✨ 정렬 완료.")
+        final_df = read_table(output_path, schema=PROPOSAL_SCHEMA).sort_values(by='id', kind='stable')
+        # 임시 파일에 쓴 뒤 교체 (정렬 중 중단되어도 결과 파일이 깨지지 않도록)
+        output_path = write_table(final_df, output_path, PROPOSAL_SCHEMA)
+        if not failed and not csv:
+            output_path.with_suffix('.csv').unlink()
+        print(f"✨ 정렬 완료. ({len(final_df)}건)")
     except Exception as e:
-        print(f"⚠️ 정렬 중 오류 (데이터 보존됨): {e}")
+        print(f"⚠️ 정렬 중 오류 (진행용 CSV 보존됨): {e}")
 
+    print(f"📡 {limiter.summary()}")
+    if cache is not None:
+        print(f"💾 {cache.summary()}")
     print(f"🎉 작업 완료! 결과 파일: {output_path}")
+    return {
+        'batches': len(tasks), 'skipped': skipped, 'failed': failed, 'saved': total_corrections,
+        'rule_proposals': rule_count, 'statuses': dict(limiter.counts), 'peak_concurrency': limiter.peak,
+        'elapsed': time.perf_counter() - started, 'output': output_path,
+    }
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AI 이상치 탐지 및 보정 제안 (2016~2020)")
+    parser.add_argument('--no-cache', action='store_true', help="응답 캐시를 사용하지 않고 모든 배치를 다시 호출")
+    parser.add_argument('--cache-ttl', type=float, default=None, help="캐시 유효 기간 (시간, 기본: 만료 없음)")
+    parser.add_argument('--rpm', type=int, default=REQUESTS_PER_MINUTE, help="분당 요청 한도 (기본: GEMINI_RPM 또는 60)")
+    parser.add_argument('--max-concurrency', type=int, default=MAX_CONCURRENCY, help="동시 요청 수 상한")
+    parser.add_argument('--resume', nargs='?', const=True, default=None, metavar='OUTPUT_CSV',
+                        help="중단된 실행 이어서 처리 (기본: 가장 최근 결과 파일, 완료된 배치는 건너뜀)")
+    parser.add_argument('--token-budget', type=int, default=TOKEN_BUDGET, help=f"배치 하나의 데이터 토큰 예산 (기본: {TOKEN_BUDGET})")
+    parser.add_argument('--max-rows', type=int, default=MAX_ROWS, help=f"배치 최대 행 수 (기본: {MAX_ROWS})")
+    parser.add_argument('--no-rules', action='store_true', help="규칙 기반 사전 보정 없이 모든 의심 행을 AI 로 검토")
+    parser.add_argument('--api-base', default=None, help="API 주소 (예: 목 서버 http://127.0.0.1:8089, 기본: GEMINI_API_BASE)")
+    parser.add_argument('--no-context-cache', action='store_true', help="공통 지시문 컨텍스트 캐시를 만들지 않음")
+    parser.add_argument('--csv', action='store_true', help="결과 Parquet 과 함께 진행용 CSV 도 남기기")
+    args = parser.parse_args()
+
+    if args.api_base:
+        configure_api(args.api_base)
+    cache = None if args.no_cache else ResponseCache(ttl=args.cache_ttl * 3600 if args.cache_ttl else None)
     if os.name == 'nt':
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-    asyncio.run(main_async())
\ No newline at end of file
+    asyncio.run(main_async(cache, rpm=args.rpm, max_concurrency=args.max_concurrency, resume=args.resume,
+                           token_budget=args.token_budget, max_rows=args.max_rows, context_cache=not args.no_context_cache, rule_based=not args.no_rules,
+                           csv=args.csv))
\ No newline at end of file
@@ -0,0 +1,200 @@
+# 정제 스크립트 공용 벡터화 커널
+# 셀 단위 .apply() 대신 pandas 문자열 메서드 / NumPy 연산으로 컬럼 전체를 한 번에 처리
+# 수기 입력 값은 중복이 많으므로, 고유값(factorize)에 대해서만 계산한 뒤 원래 위치로 펼침
+# (기존 clean_numeric / fix_time_format / convert_time_to_hours 와 동일한 결과를 내도록 작성)
+
+import numpy as np
+import pandas as pd
+
+# "13. 30", "14,,20", "14.45" 처럼 숫자 두 덩어리가 구분자로 나뉜 시간 표기
+_TIME_PARTS_PATTERN = r'(\d+)\D+(\d+)'
+# 'HH:MM' 또는 'HH:MM:SS' (각 부분은 정수, 앞뒤 공백 허용)
+_HMS_PATTERN = r'^\s*([+-]?\d+)\s*:\s*([+-]?\d+)\s*(?::\s*([+-]?\d+)\s*)?$'
+
+
+# 문자열 연산은 Arrow 기반 string 타입으로 수행 (파이썬 객체 루프 대신 Arrow compute 커널 사용)
+TEXT_DTYPE = pd.StringDtype('pyarrow')
+
+
+def _as_text(series):
+    """결측이 아닌 값을 str() 로 변환한 Arrow 문자열 Series (결측은 NA 유지)"""
+    series = pd.Series(series)
+    return series.astype(str).astype(TEXT_DTYPE).where(series.notna())
+
+
+def _per_unique(series, kernel, missing):
+    """고유값에만 kernel 을 적용하고 결과를 원래 행 위치로 펼침 (결측은 missing)"""
+    series = pd.Series(series)
+    # 0 과 0.0 처럼 값은 같아도 str() 결과가 다른 경우를 구분하기 위해 문자열 기준으로 묶음
+    keys = series.astype(str).to_numpy(dtype=object)
+    keys[series.isna().to_numpy()] = None
+    codes, uniques = pd.factorize(keys)
+    out = kernel(pd.Series(uniques, dtype=object)).to_numpy(dtype=object if missing is None else float)
+    values = out.take(codes) if len(out) else np.full(len(codes), missing, dtype=out.dtype)
+    values[codes < 0] = missing
+    return pd.Series(values, index=series.index)
+
+
+def _mask(values):
+    """nullable boolean → numpy bool (NA 는 False)"""
+    return values.fillna(False).to_numpy(dtype=bool)
+
+
+def clean_numeric_series(series):
+    """
+    숫자 컬럼 정제 (쉼표 제거 후 숫자 변환, 변환 불가 값은 NaN)
+    - 예: "1,234" → 1234.0, "휴무" → NaN
+    """
+    series = pd.Series(series)
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype(float)
+    return _per_unique(series, _clean_numeric_kernel, np.nan)
+
+
+def _clean_numeric_kernel(series):
+    text = _as_text(series).str.replace(',', '', regex=False).str.strip()
+    return pd.to_numeric(text, errors='coerce').astype(float)
+
+
+def _strip_leading_zeros(digits):
+    """숫자 문자열의 앞자리 0 제거 ('0045' → '45', '000' → '0')"""
+    stripped = digits.str.lstrip('0')
+    return stripped.mask(stripped == '', '0')
+
+
+def fix_time_format_series(series):
+    """
+    시간 컬럼 정제 → 'HH:MM:00' 문자열 (Dirty Data 보존: 25시, 90분도 그대로 출력)
+    - ':' 가 이미 있으면 원문 유지 ("25:10" → "25:10")
+    - "14. 90", "13,,30", "14.45" → 숫자 두 덩어리를 시/분으로 사용
+    - 그 외 숫자 하나("14", ".5") → 정수부는 시, 소수 둘째 자리까지는 분
+    - 빈 값, "0", 해석 불가("휴무", "정비") → None
+    """
+    return _per_unique(series, _fix_time_format_kernel, None)
+
+
+def _fix_time_format_kernel(series):
+    text = _as_text(series).str.strip()
+    result = np.full(len(text), None, dtype=object)
+
+    valid = _mask((text != '') & (text != '0'))
+    has_colon = valid & _mask(text.str.contains(':', regex=False))
+    result[has_colon] = text[has_colon].to_numpy(dtype=object)
+
+    rest = np.flatnonzero(valid & ~has_colon)
+    parts = text.iloc[rest].str.extract(_TIME_PARTS_PATTERN)
+    matched = parts[0].notna().to_numpy(dtype=bool)
+    hours = _strip_leading_zeros(parts.loc[matched, 0]).str.zfill(2)
+    minutes = _strip_leading_zeros(parts.loc[matched, 1]).str.zfill(2)
+    result[rest[matched]] = (hours + ':' + minutes + ':00').to_numpy(dtype=object)
+
+    # 정규식 실패 → 단순 숫자로 해석
+    fallback = rest[~matched]
+    values = pd.to_numeric(text.iloc[fallback], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    finite = np.isfinite(values)
+    whole = np.trunc(values[finite])
+    decimal = np.round(values[finite] - whole, 2)
+    mins = np.where(decimal > 0, np.trunc(decimal * 100), 0)
+    formatted = (
+        pd.Series(whole.astype(np.int64)).astype(str).str.zfill(2) + ':'
+        + pd.Series(mins.astype(np.int64)).astype(str).str.zfill(2) + ':00'
+    )
+    result[fallback[finite]] = formatted.to_numpy(dtype=object)
+    return pd.Series(result, index=text.index, dtype=object)
+
+
+def time_to_hours(series):
+    """
+    시간 값 → 실수 시간(Hour)
+    - 'HH:MM:SS' / 'HH:MM' 문자열 → 시 + 분/60 + 초/3600
+    - 숫자 또는 숫자 문자열 → 그대로 실수 변환
+    - 해석 불가 → NaN
+    """
+    series = pd.Series(series)
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype(float)
+    return _per_unique(series, _time_to_hours_kernel, np.nan)
+
+
+def _time_to_hours_kernel(series):
+    text = _as_text(series)
+    hours = np.full(len(text), np.nan)
+
+    has_colon = _mask(text.str.contains(':', regex=False))
+    parts = text[has_colon].str.extract(_HMS_PATTERN)
+    h, m, s = (pd.to_numeric(parts[i], errors='coerce').to_numpy(dtype=float, na_value=np.nan) for i in range(3))
+    hours[has_colon] = h + m / 60 + np.nan_to_num(s) / 3600
+
+    plain = ~has_colon & text.notna().to_numpy()
+    hours[plain] = pd.to_numeric(text[plain].str.strip(), errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    return pd.Series(hours, index=text.index)
+
+
+def hms_parts(series):
+    """
+    'HH:MM:SS' 문자열 → 시/분/초 숫자 컬럼 (h, m, s) + ':' 포함 여부 (colon)
+    - 'HH:MM' 처럼 초가 없으면 s 는 NaN, 형식이 맞지 않으면 h/m/s 모두 NaN
+    - 고유값에 대해서만 정규식을 적용한 뒤 원래 행 위치로 펼침
+    """
+    series = pd.Series(series)
+    keys = series.astype(str).to_numpy(dtype=object)
+    keys[series.isna().to_numpy()] = None
+    codes, uniques = pd.factorize(keys)
+
+    text = _as_text(pd.Series(uniques, dtype=object))
+    parts = text.str.extract(_HMS_PATTERN)
+    table = {
+        key: pd.to_numeric(parts[i], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        for i, key in enumerate(['h', 'm', 's'])
+    }
+    table['colon'] = _mask(text.str.contains(':', regex=False))
+
+    missing = codes < 0
+    result = {}
+    for key, values in table.items():
+        values = values.take(codes) if len(values) else np.zeros(len(codes), dtype=values.dtype)
+        values[missing] = False if key == 'colon' else np.nan
+        result[key] = values
+    return pd.DataFrame(result, index=series.index)
+
+
+def _safe_divide(numerator, denominator):
+    """numerator / denominator (분모가 양수가 아니거나 결측이면 0, 분자가 결측이면 NaN)"""
+    out = np.zeros(len(numerator))
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    out[np.isnan(numerator) & (denominator > 0)] = np.nan
+    return out
+
+
+def reference_columns(df, decimals=2):
+    """
+    물리 관계식 기반 참조값을 한 번에 계산 (NumPy 배열 연산, 행 단위 lambda 없음)
+    - 입력 컬럼: distance, consumed_fuel, fuel_efficiency, speed, time (없으면 NaN 으로 간주)
+    - *_num: 숫자 변환 값 (time_num 은 실수 시간), ref_*: 다른 컬럼으로 역산한 값
+      ref_dist_phys = 속도×시간, ref_dist_fuel = 연료×연비,
+      ref_fuel = 거리/연비, ref_efficiency = 거리/연료, ref_speed = 거리/시간, ref_time = 거리/속도
+    - 나눗셈의 분모가 0 이하 또는 결측이면 0 (기존 계산 규칙과 동일)
+    - decimals=None 이면 반올림하지 않음
+    """
+    def numeric(col):
+        if col not in df:
+            return np.full(len(df), np.nan)
+        return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+    dist, fuel, eff, speed = (numeric(c) for c in ['distance', 'consumed_fuel', 'fuel_efficiency', 'speed'])
+    hours = time_to_hours(df['time']).to_numpy(dtype=float) if 'time' in df else np.full(len(df), np.nan)
+
+    refs = {
+        'speed_num': speed, 'fuel_num': fuel, 'eff_num': eff, 'dist_num': dist, 'time_num': hours,
+        'ref_dist_phys': speed * hours,
+        'ref_dist_fuel': fuel * eff,
+        'ref_fuel': _safe_divide(dist, eff),
+        'ref_efficiency': _safe_divide(dist, fuel),
+        'ref_speed': _safe_divide(dist, hours),
+        'ref_time': _safe_divide(dist, speed),
+    }
+    out = pd.DataFrame(refs, index=df.index)
+    if decimals is not None:
+        ref_cols = [c for c in out.columns if c.startswith('ref_')]
+        out[ref_cols] = out[ref_cols].round(decimals)
+    return out
@@ -1,9 +1,13 @@
+import argparse
 import pandas as pd
 import os
-import re
 import warnings
 from pathlib import Path
 
+from pipeline_schema import DRIVING_LOG_SCHEMA, cleaned_name, write_table
+from sheet_cache import process_workbook_cached
+from cleaning_kernels import clean_numeric_series, fix_time_format_series
+
 # 경고 메시지 숨기기
 warnings.filterwarnings("ignore")
 
@@ -49,89 +53,19 @@ def extract_vehicle_id(df_head):
     except:
         return 'Unknown Vehicle'
 
-import re
-
-def fix_time_format(val):
+def process_sheet(sheet_name, df_raw, df):
     """
-    [수정 버전] 유효성 검사를 제거한 형태 변환 함수
-    - 목표: Dirty Data도 그대로 보존한다.
-    - 입력: "14. 90", "25:10"
-    - 출력: "14:90:00", "25:10:00" (문자열로 반환)
+    시트 하나를 표준 포맷으로 변환
+    - df_raw: 시트 상단 미리보기 (header=None, 차량 정보 추출용)
+    - df: 헤더('날짜') 행을 컬럼명으로 읽은 본문 (헤더가 없으면 None)
     """
-    if pd.isna(val) or str(val).strip() == '' or str(val).strip() == '0':
-        return None
-    
-    val_str = str(val).strip()
-    
-    # 1. 이미 : 가 포함된 경우 (이미 문자열 포맷임)
-    # 내용이 "25:00"이어도 그대로 둡니다. 나중에 QA에서 잡기 위해.
-    if ':' in val_str:
-        return val_str
-
-    hours = 0
-    minutes = 0
-
-    # 2. 정규표현식으로 숫자 추출
-    # "13. 30", "14,,20" 등 특수문자가 섞인 경우
-    match = re.search(r'(\d+)\D+(\d+)', val_str)
-
-    if match:
-        hours = int(match.group(1))
-        minutes = int(match.group(2))
-    else:
-        # 3. 정규식 실패 -> 실수형(float) 또는 단순 숫자 문자열일 가능성 (예: 14.45)
-        try:
-            float_val = float(val_str)
-            hours = int(float_val)
-            
-            # 소수점 아래를 분으로 변환 (0.45 -> 45)
-            decimal_part = round(float_val - hours, 2)
-            if decimal_part > 0:
-                minutes = int(decimal_part * 100)
-        except:
-            # 도저히 해석 불가능한 값 (예: "휴무", "정비")
-            return None
-
-    # [핵심 변경] 유효성 검사(24시, 60분 제한) 삭제!
-    # 25시나 90분이 나와도 그대로 문자열로 찍어냅니다.
-    # CSV에는 "25:10:00", "14:90:00" 으로 저장됩니다. -> 이후 QA에서 적발 가능
-    return f"{hours:02d}:{minutes:02d}:00"
-
-def clean_numeric(val):
-    """숫자 컬럼에 섞인 문자 제거 (쉼표 등)"""
-    if pd.isna(val): return None
-    s = str(val).replace(',', '').strip()
-    try:
-        return float(s)
-    except:
-        return None
-
-def process_sheet(file_path, sheet_name):
-    """시트 하나를 읽어서 표준 포맷으로 변환"""
-    # 1. 헤더 위치 찾기 위해 앞부분만 읽기
-    try:
-        df_raw = pd.read_excel(file_path, sheet_name=sheet_name, header=None, nrows=20)
-    except:
-        return None
-
     # 차량 정보 추출 (A1 셀 가정)
     vehicle_id = extract_vehicle_id(df_raw)
 
-    # '날짜'가 있는 행 찾기 (Header Detection)
-    header_idx = -1
-    for i, row in df_raw.iterrows():
-        row_str = " ".join([str(x) for x in row.values])
-        if '날짜' in row_str:
-            header_idx = i
-            break
-    
-    if header_idx == -1:
+    if df is None:
         print(f"  [Skip] 날짜 헤더 없음: {sheet_name}")
         return None
 
-    # 2. 실제 데이터 읽기
-    df = pd.read_excel(file_path, sheet_name=sheet_name, header=header_idx)
-    
     # 3. 컬럼 매핑 (Renaming)
     new_cols = {}
     for col in df.columns:
@@ -166,21 +100,102 @@ def process_sheet(file_path, sheet_name):
     # 5-4. 숫자 데이터 정제
     num_cols = ['fuel_efficiency', 'speed', 'distance', 'cumulative_distance', 'consumed_fuel', 'refuel', 'reurea']
     for col in num_cols:
-        df[col] = df[col].apply(clean_numeric)
+        df[col] = clean_numeric_series(df[col])
         
     # 5-5. 시간 데이터 정제 (14.45 -> Time)
-    df['time'] = df['time'].apply(fix_time_format)
+    df['time'] = fix_time_format_series(df['time'])
 
     # 5-6. 요소수(reurea) 처리 (사용자 요청: 입력된 값 그대로 유지하되 숫자화)
-    # 현재 로직에서는 clean_numeric으로 처리되므로 1은 1.0으로 저장됨.
+    # 현재 로직에서는 clean_numeric_series로 처리되므로 1은 1.0으로 저장됨.
     # 나중에 1 -> 20L 변환 로직이 필요하면 여기서 추가.
 
     return df
 
 # =========================================================
-# 3. 메인 실행 로직
+# 3. 워크북 단위 정제 (ingest.py 에서도 재사용)
+# =========================================================
+def clean_workbook(input_file, executor=None, raise_errors=False):
+    """
+    워크북 하나를 시트별로 정제하고 합쳐서 반환 (저장할 데이터가 없으면 None)
+    - raise_errors=True: 파일 열기 실패는 None 대신 예외로 전달 (ingest 에서 '데이터 없음'과 구분해 재시도)
+    """
+    try:
+        # 내용이 바뀐 시트만 스트리밍으로 다시 읽어 병렬 처리, 나머지는 캐시(Parquet)에서 로드
+        results = process_workbook_cached(input_file, process_sheet, FINAL_COLUMNS, executor=executor)
+    except Exception as e:
+        if raise_errors:
+            raise
+        print(f"파일 열기 실패: {e}")
+        return None
+
+    all_data = []
+    
+    for sheet, processed_df, error, cached in results:
+        # 여러 워크북을 동시에 처리할 때 줄이 섞이지 않도록 시트당 한 번에 출력
+        label = f"  Processing Sheet: {Path(input_file).stem}/{sheet}{' (cache)' if cached else ''}..."
+        if error:
+            print(f"{label} ❌ Error ({error})")
+            continue
+        
+        if processed_df is not None and not processed_df.empty:
+            all_data.append(processed_df)
+            print(f"{label} ✅ OK ({len(processed_df)} rows)")
+        else:
+            print(f"{label} ⚠️ No Data")
+
+    if not all_data:
+        return None
+
+    final_df = pd.concat(all_data, ignore_index=True)
+
+    # ---------------------------------------------------------
+    # [최종 수정] Ghost Data(유령 데이터) 제거 로직
+    # 목표: 운행(거리), 주유, 요소수, 시간 기록이 '단 하나라도' 있으면 살린다.
+    # ---------------------------------------------------------
+    before_count = len(final_df)
+    
+    # 1. 숫자형 활동 컬럼들 (거리, 주유량, 요소수량, 소모량)
+    numeric_targets = ['distance', 'refuel', 'reurea', 'consumed_fuel']
+    # 현재 데이터프레임에 실제로 존재하는 컬럼만 골라냄 (에러 방지)
+    valid_numeric_cols = [c for c in numeric_targets if c in final_df.columns]
+    
+    # [판단 1] 숫자 데이터가 모두 없거나(NaN) 0인 행 찾기
+    # fillna(0) -> 비어있는 값을 0으로 채움
+    # (df == 0).all(axis=1) -> 가로로 한 줄씩 봤을 때 전부 0이면 True
+    mask_no_numeric = (final_df[valid_numeric_cols].fillna(0) == 0).all(axis=1)
+    
+    # 2. 시간 활동 컬럼 (문자열일 수 있음)
+    if 'time' in final_df.columns:
+        # [판단 2] 시간 데이터가 비어있거나 0인 경우
+        # 문자열 '0', 숫자 0, NaN 모두 체크
+        mask_no_time = final_df['time'].isna() | (final_df['time'] == 0) | (final_df['time'].astype(str).str.strip() == '0')
+    else:
+        # 시간 컬럼 자체가 없으면(옛날 데이터), 시간 활동은 없는 것으로 간주
+        mask_no_time = True
+
+    # 3. 최종 삭제 결정 (AND 조건)
+    # 숫자 활동도 없고(True) AND 시간 활동도 없으면(True) -> 삭제 대상(True)
+    drop_mask = mask_no_numeric & mask_no_time
+    
+    # 삭제 대상이 아닌 것(~)만 남김
+    final_df = final_df[~drop_mask]
+    
+    after_count = len(final_df)
+    print(f"🧹 '활동 없는 유령 데이터' 제거: {before_count} -> {after_count} ({before_count - after_count}건 삭제됨)")
+
+    # 날짜순 정렬
+    final_df = final_df.sort_values(by='date')
+    
+    return final_df
+
+# =========================================================
+# 4. 메인 실행 로직
 # =========================================================
 def main():
+    parser = argparse.ArgumentParser(description="2016~2020 운행일지 워크북 정제")
+    parser.add_argument('--csv', action='store_true', help="Parquet 과 함께 CSV(utf-8-sig)도 내보내기")
+    args = parser.parse_args()
+
     current_dir = Path(__file__).resolve().parent
 
     project_root = current_dir.parent
@@ -190,7 +205,7 @@ def main():
     output_dir = project_root / 'data' / 'processed'
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    output_file = output_dir /  'driving_log_2016_2020_cleaned.csv'
+    output_file = output_dir / cleaned_name(input_file)
     
     
     print(f"전처리 시작")
@@ -201,68 +216,11 @@ def main():
         print(f"오류: 원본 파일을 찾을 수 없습니다. ({input_file})")
         return
 
-    try:
-        # pathlib 객체도 pandas에서 바로 읽을 수 있음
-        xls = pd.ExcelFile(input_file)
-    except Exception as e:
-        print(f"파일 열기 실패: {e}")
-        return
-
-    all_data = []
-    
-    for sheet in xls.sheet_names:
-        print(f"  Processing Sheet: {sheet}...", end=" ")
-        processed_df = process_sheet(input_file, sheet)
-        
-        if processed_df is not None and not processed_df.empty:
-            all_data.append(processed_df)
-            print(f"✅ OK ({len(processed_df)} rows)")
-        else:
-            print("⚠️ No Data")
-
-    if all_data:
-        final_df = pd.concat(all_data, ignore_index=True)
+    final_df = clean_workbook(input_file)
 
-        # ---------------------------------------------------------
-        # [최종 수정] Ghost Data(유령 데이터) 제거 로직
-        # 목표: 운행(거리), 주유, 요소수, 시간 기록이 '단 하나라도' 있으면 살린다.
-        # ---------------------------------------------------------
-        before_count = len(final_df)
-        
-        # 1. 숫자형 활동 컬럼들 (거리, 주유량, 요소수량, 소모량)
-        numeric_targets = ['distance', 'refuel', 'reurea', 'consumed_fuel']
-        # 현재 데이터프레임에 실제로 존재하는 컬럼만 골라냄 (에러 방지)
-        valid_numeric_cols = [c for c in numeric_targets if c in final_df.columns]
-        
-        # [판단 1] 숫자 데이터가 모두 없거나(NaN) 0인 행 찾기
-        # fillna(0) -> 비어있는 값을 0으로 채움
-        # (df == 0).all(axis=1) -> 가로로 한 줄씩 봤을 때 전부 0이면 True
-        mask_no_numeric = (final_df[valid_numeric_cols].fillna(0) == 0).all(axis=1)
-        
-        # 2. 시간 활동 컬럼 (문자열일 수 있음)
-        if 'time' in final_df.columns:
-            # [판단 2] 시간 데이터가 비어있거나 0인 경우
-            # 문자열 '0', 숫자 0, NaN 모두 체크
-            mask_no_time = final_df['time'].isna() | (final_df['time'] == 0) | (final_df['time'].astype(str).str.strip() == '0')
-        else:
-            # 시간 컬럼 자체가 없으면(옛날 데이터), 시간 활동은 없는 것으로 간주
-            mask_no_time = True
-
-        # 3. 최종 삭제 결정 (AND 조건)
-        # 숫자 활동도 없고(True) AND 시간 활동도 없으면(True) -> 삭제 대상(True)
-        drop_mask = mask_no_numeric & mask_no_time
-        
-        # 삭제 대상이 아닌 것(~)만 남김
-        final_df = final_df[~drop_mask]
-        
-        after_count = len(final_df)
-        print(f"🧹 '활동 없는 유령 데이터' 제거: {before_count} -> {after_count} ({before_count - after_count}건 삭제됨)")
-
-        # 날짜순 정렬
-        final_df = final_df.sort_values(by='date')
-        
-        # CSV 저장
-        final_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+    if final_df is not None:
+        # Parquet 저장 (공용 스키마, --csv 면 CSV 도 함께)
+        write_table(final_df, output_file, DRIVING_LOG_SCHEMA, csv=args.csv)
 
         print("\n" + "="*50)
         print(f"전처리 완료: {output_file}")
@@ -0,0 +1,14 @@
+# 2021~2025 운행일지 정제
+# 정제 로직은 2016~2020 과 동일하므로 통합 수집 파이프라인(ingest.py)에 위임
+#   python scripts/cleaning_messy_2021_2025.py              # 정제 결과(Parquet)만 생성
+#   python scripts/cleaning_messy_2021_2025.py --append-db  # 신규 행 DB 추가까지
+
+import sys
+
+from ingest import main as ingest_main
+
+WORKBOOK = 'driving_log_2021_2025.xlsx'
+
+if __name__ == "__main__":
+    sys.argv = [sys.argv[0], WORKBOOK, *sys.argv[1:]]
+    ingest_main()
@@ -0,0 +1,233 @@
+# 수기 운행일지 Excel 스트리밍 리더
+# - openpyxl read-only 모드로 시트를 한 번만 순회하면서 헤더('날짜') 행을 즉석에서 탐지
+# - 시트들을 프로세스 풀에 나눠 병렬 처리 (워커당 워크북은 한 번만 열기)
+# - 시트별 내용 지문(sheet_fingerprints)으로 변경된 시트만 다시 처리할 수 있도록 지원
+
+import hashlib
+import os
+import posixpath
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+
+HEADER_KEYWORD = '날짜'
+HEADER_SCAN_ROWS = 20
+
+
+def _convert_cell(cell):
+    """셀 값 변환 (pandas.read_excel 의 openpyxl 변환 규칙과 동일)"""
+    value = cell.value
+    if value is None:
+        return np.nan
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        as_int = int(value)
+        return as_int if as_int == value else float(value)
+    if isinstance(value, str) and value == '':
+        return np.nan
+    return value
+
+
+def _make_columns(header_row):
+    """헤더 행 → 컬럼명 (빈 칸은 'Unnamed: n', 중복은 '.1' 접미사: pandas 규칙과 동일)"""
+    columns = []
+    seen = {}
+    for i, value in enumerate(header_row):
+        name = f"Unnamed: {i}" if pd.isna(value) else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+            while name in seen:
+                name = f"{name}.1"
+        seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def _pad(rows, width):
+    return [row + [np.nan] * (width - len(row)) for row in rows]
+
+
+def read_sheet(ws, header_keyword=HEADER_KEYWORD, scan_rows=HEADER_SCAN_ROWS):
+    """
+    시트를 한 번만 순회하여 (상단 미리보기 DataFrame, 본문 DataFrame) 반환
+    - 상단 미리보기: 헤더 탐지에 사용한 처음 scan_rows 행 (header=None 형태, 차량 정보 추출용)
+    - 본문: 헤더 행을 컬럼명으로 사용한 데이터 (헤더를 못 찾으면 None)
+    """
+    if hasattr(ws, 'reset_dimensions'):
+        ws.reset_dimensions()
+
+    head_rows = []
+    header = None
+    body_rows = []
+    last_body_row = -1
+
+    for row in ws.rows:
+        values = [_convert_cell(cell) for cell in row]
+        # 행 끝의 빈 셀 제거
+        while values and pd.isna(values[-1]):
+            values.pop()
+
+        if header is None:
+            if len(head_rows) >= scan_rows:
+                break
+            head_rows.append(values)
+            row_str = " ".join(str(x) for x in values)
+            if header_keyword in row_str:
+                header = values
+            continue
+
+        body_rows.append(values)
+        if values:
+            last_body_row = len(body_rows) - 1
+
+    head_width = max((len(r) for r in head_rows), default=0)
+    head_df = pd.DataFrame(_pad(head_rows, head_width))
+    if header is None:
+        return head_df, None
+
+    # 끝부분의 빈 행 제거 후 폭 맞추기
+    body_rows = body_rows[:last_body_row + 1]
+    width = max([len(header)] + [len(r) for r in body_rows])
+    columns = _make_columns(header + [np.nan] * (width - len(header)))
+    body_df = pd.DataFrame(_pad(body_rows, width), columns=columns)
+    return head_df, body_df
+
+
+def _process_sheet_group(path, sheet_names, processor):
+    """워커 프로세스: 워크북을 한 번 열고 배정된 시트들을 순서대로 처리"""
+    wb = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    results = []
+    try:
+        for sheet_name in sheet_names:
+            try:
+                head_df, body_df = read_sheet(wb[sheet_name])
+                results.append((sheet_name, processor(sheet_name, head_df, body_df), None))
+            except Exception as e:
+                results.append((sheet_name, None, str(e)))
+    finally:
+        wb.close()
+    return results
+
+
+def list_sheet_names(path):
+    """시트 이름 목록 (read-only 로 열어 workbook.xml 만 파싱)"""
+    wb = load_workbook(path, read_only=True, keep_links=False)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def process_workbook(path, processor, sheet_names=None, max_workers=None, executor=None):
+    """
+    워크북의 모든 시트를 processor(sheet_name, head_df, body_df) 로 병렬 처리
+    - processor 는 pickle 가능한 모듈 최상위 함수여야 함
+    - executor 를 넘기면 해당 프로세스 풀을 공유 (여러 워크북 동시 처리 시)
+    - 반환: [(sheet_name, 결과 또는 None, 오류 메시지 또는 None)] (원래 시트 순서 유지)
+    """
+    path = str(path)
+    if sheet_names is None:
+        sheet_names = list_sheet_names(path)
+    if not sheet_names:
+        return []
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(sheet_names)))
+
+    # 워커 1개면 프로세스를 띄우지 않고 바로 처리
+    if max_workers == 1 and executor is None:
+        results = _process_sheet_group(path, sheet_names, processor)
+    else:
+        # 시트를 라운드로빈으로 분배 (연도별 시트 크기가 비슷하므로 균형이 맞음)
+        groups = [sheet_names[i::max_workers] for i in range(max_workers)]
+        results = []
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [executor.submit(_process_sheet_group, path, group, processor) for group in groups]
+            for future in futures:
+                results.extend(future.result())
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+    order = {name: i for i, name in enumerate(sheet_names)}
+    return sorted(results, key=lambda r: order[r[0]])
+
+
+# =========================================================
+# 시트 내용 지문 (xlsx 내부 XML 기준, 셀 값을 파싱하지 않고 계산)
+# =========================================================
+_NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+# 공유 문자열을 참조하는 셀: <c r="A1" t="s"><v>12</v></c>
+_SHARED_REF = re.compile(rb'<c\b[^>]*\bt="s"[^>]*>\s*<v>(\d+)</v>')
+
+
+def _sheet_parts(zf):
+    """시트 이름 → 시트 XML 경로 (workbook.xml + 관계 파일 해석)"""
+    rels = ElementTree.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    targets = {}
+    for rel in rels.iter(f'{_NS_PKG_REL}Relationship'):
+        target = rel.get('Target')
+        if target.startswith('/'):
+            target = target.lstrip('/')
+        else:
+            target = posixpath.normpath(posixpath.join('xl', target))
+        targets[rel.get('Id')] = target
+
+    workbook = ElementTree.fromstring(zf.read('xl/workbook.xml'))
+    return {
+        sheet.get('name'): targets[sheet.get(f'{_NS_REL}id')]
+        for sheet in workbook.iter(f'{_NS_MAIN}sheet')
+    }
+
+
+def _shared_strings(zf):
+    """공유 문자열 목록 (리치 텍스트는 조각을 이어 붙임)"""
+    if 'xl/sharedStrings.xml' not in zf.namelist():
+        return []
+    root = ElementTree.fromstring(zf.read('xl/sharedStrings.xml'))
+    return [
+        ''.join(t.text or '' for t in si.iter(f'{_NS_MAIN}t'))
+        for si in root.iter(f'{_NS_MAIN}si')
+    ]
+
+
+def sheet_fingerprints(path, salt=''):
+    """
+    시트별 내용 해시 {시트 이름: sha256 hex}
+    - 시트 XML 원문 + 그 시트가 참조하는 공유 문자열 + 스타일(날짜 서식 판별용) 기준
+    - 다른 시트가 수정되어 sharedStrings.xml 이 바뀌어도 이 시트의 해시는 유지됨
+    """
+    with zipfile.ZipFile(path) as zf:
+        parts = _sheet_parts(zf)
+        strings = _shared_strings(zf)
+        styles = zf.read('xl/styles.xml') if 'xl/styles.xml' in zf.namelist() else b''
+        styles_digest = hashlib.sha256(styles).digest()
+
+        fingerprints = {}
+        for name, part in parts.items():
+            xml = zf.read(part)
+            h = hashlib.sha256()
+            h.update(salt.encode('utf-8'))
+            h.update(name.encode('utf-8'))
+            h.update(styles_digest)
+            h.update(xml)
+            for idx in _SHARED_REF.findall(xml):
+                i = int(idx)
+                h.update(b'\x00')
+                h.update((strings[i] if i < len(strings) else '').encode('utf-8'))
+            fingerprints[name] = h.hexdigest()
+    return fingerprints
@@ -0,0 +1,85 @@
+# 대시보드 Cold Start 분석용: 모듈별 import 시간 리포트
+# python -X importtime 출력을 파싱하여 누적 시간 순으로 정렬해 보여줌
+#
+# 사용법:
+#   python scripts/import_report.py                 # 로그인 화면까지 필요한 모듈
+#   python scripts/import_report.py --deferred      # 로그인 후 지연 import 되는 모듈 포함
+#   python scripts/import_report.py --top 40
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / 'app'
+sys.path.insert(0, str(APP_DIR))
+
+from config import DEFERRED_MODULES as APP_DEFERRED_MODULES  # noqa: E402
+
+# 로그인 화면 렌더링 전에 import 되는 모듈
+STARTUP_MODULES = [
+    'streamlit', 'yaml', 'config', 'styles', 'auth.login_guard',
+]
+
+# 로그인 성공 후 import 되는 모듈 (인증 라이브러리 + app/config.py 의 DEFERRED_MODULES)
+DEFERRED_MODULES = ['streamlit_authenticator', *APP_DEFERRED_MODULES]
+
+
+def run_importtime(modules, app_dir):
+    """별도 프로세스에서 -X importtime 실행 후 stderr 반환"""
+    code = "import importlib\n" + "\n".join(f"importlib.import_module({m!r})" for m in modules)
+    env = dict(os.environ, PYTHONPATH=str(app_dir))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=app_dir, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        raise RuntimeError("import 실행 실패")
+    return result.stderr
+
+
+def parse_importtime(stderr):
+    """'import time: self [us] | cumulative | imported package' 형식 파싱"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        try:
+            _, body = line.split(':', 1)
+            self_us, cum_us, name = body.split('|', 2)
+            depth = (len(name) - len(name.lstrip())) // 2
+            rows.append({
+                'module': name.strip(),
+                'self_ms': int(self_us) / 1000,
+                'cumulative_ms': int(cum_us) / 1000,
+                'depth': depth,
+            })
+        except ValueError:
+            continue
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모듈별 import 시간 리포트")
+    parser.add_argument('--deferred', action='store_true', help="로그인 후 지연 import 모듈 포함")
+    parser.add_argument('--top', type=int, default=25, help="출력할 모듈 수")
+    args = parser.parse_args()
+
+    modules = STARTUP_MODULES + (DEFERRED_MODULES if args.deferred else [])
+
+    rows = parse_importtime(run_importtime(modules, APP_DIR))
+    top_level = [r for r in rows if r['depth'] == 0]
+    total_ms = sum(r['cumulative_ms'] for r in top_level)
+
+    print(f"📦 대상 모듈: {', '.join(modules)}")
+    print(f"⏱️ 전체 import 시간: {total_ms:,.0f} ms ({len(rows)}개 모듈)")
+    print("=" * 70)
+    print(f"{'cumulative(ms)':>15} {'self(ms)':>10}  module")
+    for r in sorted(rows, key=lambda r: r['cumulative_ms'], reverse=True)[:args.top]:
+        print(f"{r['cumulative_ms']:>15,.1f} {r['self_ms']:>10,.1f}  {r['module']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# 연도별 운행일지 워크북 통합 수집(Ingest) 파이프라인
+# - data/raw/ 의 모든 워크북(*.xlsx)을 병렬로 정제 → data/processed/<워크북 이름>_cleaned.parquet
+#   (시트 단위 캐시를 사용하므로 바뀐 시트만 다시 파싱)
+# - --append-db: 정제 결과 중 DB 에 아직 없는 (vehicle_id, date) 행만 driving_logs 에 추가
+# - --watch: 폴더를 주기적으로 확인하여 새로 들어오거나 바뀐 워크북만 처리 (--append-db 포함)
+#
+# 사용법:
+#   python scripts/ingest.py                               # 전체 워크북 정제 (Parquet 저장)
+#   python scripts/ingest.py driving_log_2021_2025.xlsx    # 특정 워크북만
+#   python scripts/ingest.py --csv                         # Parquet 과 함께 CSV 도 내보내기
+#   python scripts/ingest.py --append-db                   # 정제 후 신규 행만 DB 에 추가
+#   python scripts/ingest.py --watch --interval 30         # 드롭 폴더 감시
+#
+# [주의] --append-db 는 AI 보정(cleaning_dirty / apply_corrections) 이전의 정제 결과를 바로 적재함.
+#        전체 재구축은 기존대로 apply_corrections.py → db_initializer.py 순서로 수행.
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import text
+
+from bulk_loader import ensure_schema, upsert_batches
+from cleaning_messy_2016_2020 import clean_workbook
+from db_initializer import DB_COLUMNS, TABLE_NAME, get_engine
+from pipeline_schema import DRIVING_LOG_SCHEMA, cleaned_name, write_table
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+RAW_DIR = PROJECT_ROOT / 'data' / 'raw'
+OUTPUT_DIR = PROJECT_ROOT / 'data' / 'processed'
+KEY_COLUMNS = ['vehicle_id', 'date']
+
+
+def discover_workbooks(raw_dir=RAW_DIR):
+    """드롭 폴더의 워크북 목록 (엑셀 임시 잠금 파일 '~$...' 제외)"""
+    return sorted(p for p in Path(raw_dir).glob('*.xlsx') if not p.name.startswith('~$'))
+
+
+def output_path(workbook):
+    return OUTPUT_DIR / cleaned_name(workbook)
+
+
+def clean_workbooks(workbooks, max_workers=None, csv=False):
+    """
+    여러 워크북을 동시에 정제 (시트 파싱은 하나의 프로세스 풀을 공유)
+    - csv=True: Parquet 과 함께 CSV 도 내보내기
+    - 반환: {워크북 경로: 정제된 DataFrame, 저장할 데이터가 없으면 빈 DataFrame, 열기 실패 / 저장 오류면 None}
+    """
+    workbooks = [Path(p) for p in workbooks]
+    if not workbooks:
+        return {}
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool, \
+            ThreadPoolExecutor(max_workers=len(workbooks)) as threads:
+        futures = {wb: threads.submit(clean_workbook, wb, pool, raise_errors=True) for wb in workbooks}
+        for wb, future in futures.items():
+            results[wb] = None
+            try:
+                df = future.result()
+                if df is None:
+                    # 열렸지만 데이터 행이 없는 워크북은 다시 시도해도 같으므로 실패로 보지 않음
+                    print(f"⚠️ {wb.name}: 저장할 데이터가 없습니다. (건너뜀)")
+                    results[wb] = pd.DataFrame(columns=DB_COLUMNS)
+                    continue
+                write_table(df, output_path(wb), DRIVING_LOG_SCHEMA, csv=csv)
+            except Exception as e:
+                print(f"❌ {wb.name}: 정제 실패: {e}")
+                continue
+            results[wb] = df
+            print(f"✅ {wb.name}: {len(df)}행 → {output_path(wb).name}")
+    return results
+
+
+def append_new_rows(engine, df):
+    """
+    DB 에 아직 없는 (vehicle_id, date) 행만 driving_logs 에 추가하고 추가된 행 수 반환
+    - 기존 키는 해당 날짜 구간만 조회하여 비교 (전체 테이블 재적재 없음)
+    - 테이블 생성 / 추가는 db_initializer 와 같은 경로(bulk_loader.ensure_schema / upsert_batches)
+      → 조회와 추가 사이에 다른 적재가 같은 키를 넣어도 UNIQUE 키 오류 없이 값만 갱신
+    """
+    df = df[[c for c in DB_COLUMNS if c in df.columns]].copy()
+    df['date'] = pd.to_datetime(df['date']).dt.normalize()
+    # 같은 파일 안의 중복 키는 첫 행만 사용
+    df = df.drop_duplicates(subset=KEY_COLUMNS, keep='first')
+    if df.empty:
+        return 0
+
+    ensure_schema(engine)
+
+    with engine.connect() as conn:
+        existing = pd.read_sql(
+            # 반개구간 날짜 조건 → 해당 연도 파티션만 탐색
+            text(f"SELECT vehicle_id, date FROM {TABLE_NAME} WHERE date >= :start AND date < :end"),
+            conn,
+            params={'start': df['date'].min().date(), 'end': (df['date'].max() + pd.Timedelta(days=1)).date()},
+        )
+    existing['date'] = pd.to_datetime(existing['date']).dt.normalize()
+
+    merged = df.merge(existing.drop_duplicates(), on=KEY_COLUMNS, how='left', indicator=True)
+    new_rows = merged[merged['_merge'] == 'left_only'].drop(columns='_merge')
+    if new_rows.empty:
+        return 0
+
+    new_rows['date'] = new_rows['date'].dt.date
+    return upsert_batches(engine, new_rows.reset_index(drop=True))
+
+
+def run_once(workbooks, engine=None, max_workers=None, csv=False):
+    """
+    워크북 정제 (+ engine 이 있으면 신규 행 DB 추가)
+    - 반환: 실패한 워크북 경로 목록 (열기 / 정제 / 저장 실패 또는 DB 추가 오류, 데이터 없음은 제외)
+    """
+    results = clean_workbooks(workbooks, max_workers=max_workers, csv=csv)
+    failed = [wb for wb, df in results.items() if df is None]
+    if engine is None:
+        return failed
+    for wb, df in results.items():
+        if df is None or df.empty:
+            continue
+        try:
+            added = append_new_rows(engine, df)
+        except Exception as e:
+            print(f"❌ {wb.name}: DB 추가 실패: {e}")
+            failed.append(wb)
+            continue
+        print(f"🚀 {wb.name}: 신규 {added}행 DB 추가")
+    return failed
+
+
+def _signature(path):
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def watch(raw_dir, engine, interval, max_workers=None, csv=False):
+    """
+    드롭 폴더 감시: 새 파일 또는 변경된 파일만 처리
+    - 복사 중인 파일을 읽지 않도록, 크기/수정시각이 한 주기 동안 그대로인 파일만 처리
+    """
+    processed = {}
+    pending = {}
+    print(f"👀 드롭 폴더 감시 시작: {raw_dir} ({interval}s 간격, Ctrl+C 로 종료)")
+    try:
+        while True:
+            ready = []
+            for path in discover_workbooks(raw_dir):
+                try:
+                    sig = _signature(path)
+                except FileNotFoundError:
+                    continue
+                if processed.get(path) == sig:
+                    continue
+                if pending.get(path) == sig:
+                    ready.append(path)
+                else:
+                    pending[path] = sig
+
+            if ready:
+                print(f"\n📥 처리 대상: {', '.join(p.name for p in ready)}")
+                try:
+                    failed = set(run_once(ready, engine, max_workers=max_workers, csv=csv))
+                except Exception as e:
+                    print(f"❌ 처리 실패: {e}")
+                    failed = set(ready)
+                # 성공한 파일만 처리 완료로 기록, 실패한 파일은 pending 에 남겨 다음 주기에 다시 시도
+                for path in ready:
+                    if path not in failed:
+                        processed[path] = pending.pop(path)
+                if failed:
+                    print(f"🔁 다음 주기에 다시 시도: {', '.join(p.name for p in sorted(failed))}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n👋 감시 종료")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="운행일지 워크북 통합 수집")
+    parser.add_argument('workbooks', nargs='*', help="처리할 워크북 (기본: data/raw/*.xlsx 전체)")
+    parser.add_argument('--raw-dir', default=str(RAW_DIR), help="원본 워크북 폴더")
+    parser.add_argument('--append-db', action='store_true', help="신규 (vehicle_id, date) 행만 DB 에 추가")
+    parser.add_argument('--watch', action='store_true', help="드롭 폴더를 감시하며 새 파일 처리 (--append-db 포함)")
+    parser.add_argument('--interval', type=float, default=30, help="감시 주기 (초)")
+    parser.add_argument('--workers', type=int, default=None, help="시트 파싱 프로세스 수")
+    parser.add_argument('--csv', action='store_true', help="Parquet 과 함께 CSV(utf-8-sig)도 내보내기")
+    args = parser.parse_args()
+
+    raw_dir = Path(args.raw_dir)
+    engine = get_engine() if (args.append_db or args.watch) else None
+
+    if args.watch:
+        watch(raw_dir, engine, args.interval, max_workers=args.workers, csv=args.csv)
+        return
+
+    workbooks = [raw_dir / name if not Path(name).exists() else Path(name) for name in args.workbooks]
+    workbooks = workbooks or discover_workbooks(raw_dir)
+    missing = [p for p in workbooks if not p.exists()]
+    if missing:
+        print(f"❌ 원본 파일을 찾을 수 없습니다: {', '.join(str(p) for p in missing)}")
+        return
+    if not workbooks:
+        print(f"⚠️ 처리할 워크북이 없습니다: {raw_dir}")
+        return
+
+    print(f"🚚 워크북 {len(workbooks)}개 처리 시작")
+    start = time.perf_counter()
+    failed = run_once(workbooks, engine, max_workers=args.workers, csv=args.csv)
+    if failed:
+        print(f"⚠️ 실패 {len(failed)}개: {', '.join(p.name for p in failed)}")
+    print(f"🎉 완료 ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
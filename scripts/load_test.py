@@ -0,0 +1,194 @@
+# 동시 세션 부하 테스트 (Streamlit AppTest 기반)
+# N명의 로그인된 사용자가 날짜 구간 / 보기 방식을 바꿔가며 대시보드를 rerun 하는 상황을
+# 하나의 프로세스 안에서 재현하고, rerun 지연시간 백분위수 / 메모리 증가량 / DB 쿼리 수를 보고
+#
+# 사용법:
+#   python scripts/load_test.py --users 8 --reruns 20 --rows 100k
+#   python scripts/load_test.py --users 16 --reruns 50 --rows 1M --think 0.2
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+APP_SCRIPT = PROJECT_ROOT / 'app' / 'main.py'
+
+from synthetic_data import build_sqlite_fixture, parse_size, format_size  # noqa: E402
+
+RESAMPLE_OPTIONS = ["일별 (Daily)", "주별 (Weekly)", "월별 (Monthly)"]
+
+# 부하 테스트 전용 인증 설정 (세션 상태로 로그인 처리하므로 비밀번호는 사용되지 않음)
+LOADTEST_CONFIG = """
+credentials:
+  usernames:
+    loadtest:
+      email: loadtest@example.com
+      name: Load Tester
+      password: "not-used"
+cookie:
+  name: kilostone_loadtest
+  key: kilostone-loadtest-key
+  expiry_days: 1
+"""
+
+
+class QueryCounter:
+    """SQLAlchemy 엔진 전체에서 실행된 SQL 문 수 집계"""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def install(self):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+        event.listen(Engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        with self._lock:
+            self.count += 1
+
+
+def current_rss_mb():
+    """현재 프로세스 RSS (MB, Linux 전용 / 그 외 환경은 None)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError):
+        return None
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+def simulate_user(user_idx, reruns, think, timeout, latencies, errors, barrier):
+    """로그인된 사용자 1명: 최초 렌더 후 위젯을 바꿔가며 reruns 회 rerun"""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(user_idx)
+    at = AppTest.from_file(str(APP_SCRIPT), default_timeout=timeout)
+    at.session_state['authentication_status'] = True
+    at.session_state['name'] = f"Load Tester {user_idx}"
+    at.session_state['username'] = 'loadtest'
+
+    barrier.wait()
+
+    def timed_run(label):
+        start = time.perf_counter()
+        at.run()
+        latencies.append((label, time.perf_counter() - start))
+        if at.exception:
+            errors.append(f"user{user_idx}/{label}: {at.exception[0].message}")
+
+    timed_run('initial')
+    if not at.date_input:
+        errors.append(f"user{user_idx}: 대시보드가 렌더링되지 않았습니다 (date_input 없음)")
+        return
+
+    min_date = at.date_input[0].min
+    max_date = at.date_input[0].max
+    span_days = max(1, (max_date - min_date).days)
+
+    for _ in range(reruns):
+        if think > 0:
+            time.sleep(rng.uniform(0, think))
+        if rng.random() < 0.5:
+            length = rng.choice([7, 30, 90, 365, span_days])
+            start_offset = rng.randint(0, max(0, span_days - length))
+            start = min_date + timedelta(days=start_offset)
+            end = min(max_date, start + timedelta(days=length))
+            at.date_input[0].set_value((start, end))
+            timed_run('date_range')
+        else:
+            at.radio[0].set_value(rng.choice(RESAMPLE_OPTIONS))
+            timed_run('resample')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 세션 부하 테스트")
+    parser.add_argument('--users', type=int, default=8, help="동시 사용자 수")
+    parser.add_argument('--reruns', type=int, default=20, help="사용자당 상호작용(rerun) 횟수")
+    parser.add_argument('--rows', default='100k', help="대체 DB 데이터 크기 (예: 10k, 1M)")
+    parser.add_argument('--think', type=float, default=0.0, help="상호작용 사이 최대 대기시간 (초)")
+    parser.add_argument('--timeout', type=float, default=120, help="rerun 1회 타임아웃 (초)")
+    args = parser.parse_args()
+
+    # 1. 대체 DB 및 인증 설정 준비 (앱 모듈 import 전에 환경변수 설정)
+    n_rows = parse_size(args.rows)
+    db_path = PROJECT_ROOT / 'data' / 'benchmarks' / f"fleet_{format_size(n_rows)}.db"
+    print(f"🗄️ 대체 DB 준비: {db_path}")
+    build_sqlite_fixture(n_rows, db_path).dispose()
+
+    config_dir = tempfile.mkdtemp(prefix='kilostone_loadtest_')
+    config_path = Path(config_dir) / 'config.yaml'
+    config_path.write_text(LOADTEST_CONFIG, encoding='utf-8')
+    os.environ['DATABASE_URL'] = f"sqlite:///{db_path}"
+    os.environ['KILOSTONE_CONFIG'] = str(config_path)
+
+    counter = QueryCounter()
+    counter.install()
+
+    # 2. 동시 실행
+    latencies, errors = [], []
+    barrier = threading.Barrier(args.users)
+    rss_start = current_rss_mb()
+    print(f"🚀 사용자 {args.users}명 × rerun {args.reruns}회 실행 중...")
+    wall_start = time.perf_counter()
+    threads = [
+        threading.Thread(
+            target=simulate_user,
+            args=(i, args.reruns, args.think, args.timeout, latencies, errors, barrier),
+            name=f"loadtest-user-{i}",
+        )
+        for i in range(args.users)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - wall_start
+    rss_end = current_rss_mb()
+
+    # 3. 리포트
+    print("\n" + "=" * 60)
+    print(f"총 rerun: {len(latencies)}회 / 소요: {wall:.1f}s / 처리량: {len(latencies) / wall:.1f} rerun/s")
+    print(f"DB 쿼리 수: {counter.count}회 (rerun 당 {counter.count / max(1, len(latencies)):.3f}회)")
+    if rss_start is not None and rss_end is not None:
+        print(f"메모리(RSS): {rss_start:,.0f}MB → {rss_end:,.0f}MB (+{rss_end - rss_start:,.0f}MB)")
+
+    print(f"\n{'action':<12} {'count':>6} {'p50(ms)':>9} {'p90(ms)':>9} {'p99(ms)':>9} {'max(ms)':>9}")
+    groups = {}
+    for label, sec in latencies:
+        groups.setdefault(label, []).append(sec * 1000)
+    groups['ALL'] = [sec * 1000 for _, sec in latencies]
+    for label, values in groups.items():
+        values.sort()
+        print(f"{label:<12} {len(values):>6} {percentile(values, 0.5):>9.1f} {percentile(values, 0.9):>9.1f} "
+              f"{percentile(values, 0.99):>9.1f} {values[-1] if values else 0:>9.1f}")
+    if groups['ALL']:
+        print(f"\n평균 rerun: {statistics.mean(groups['ALL']):.1f}ms")
+    print("=" * 60)
+
+    if errors:
+        print(f"🚨 오류 {len(errors)}건:")
+        for err in errors[:10]:
+            print(f"   - {err}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,22 @@ import pandas as pd
 from pathlib import Path
 import numpy as np
 
+from pipeline_schema import CLEANED_2016_2020, DRIVING_LOG_SCHEMA, read_table, table_exists
+
 def main():
     # 1. 파일 로드
     current_dir = Path(__file__).resolve().parent
-    file_path = current_dir.parent / 'data' / 'processed' / 'driving_log_2016_2020_cleaned.csv'
+    file_path = current_dir.parent / 'data' / 'processed' / CLEANED_2016_2020
     
-    if not file_path.exists():
+    if not table_exists(file_path):
         print("❌ 파일이 없습니다. ETL 스크립트를 먼저 실행하세요.")
         return
 
     print("🚀 Messy Data QA (구조적 무결성 검사) 시작")
     print("="*60)
     
-    df = pd.read_csv(file_path)
-    df['date'] = pd.to_datetime(df['date']) # 날짜 타입 변환
+    # 공용 스키마로 저장된 Parquet 은 date 가 이미 datetime (예전 CSV 는 읽으면서 변환)
+    df = read_table(file_path, schema=DRIVING_LOG_SCHEMA)
 
     # ---------------------------------------------------------
     # CHECK 1: 데이터 타입 및 결측치 현황 (Data Types & Nulls)
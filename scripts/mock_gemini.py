@@ -0,0 +1,203 @@
+# Gemini API 목 서버 (aiohttp, 오프라인 테스트 / 처리량 벤치마크용)
+# - POST /v1beta/models/{model}:generateContent : 요청의 [Data to Analyze] 행을 읽어 미리 정한 제안(canned)을 반환
+# - POST /v1beta/cachedContents, DELETE /v1beta/cachedContents/{name} : 컨텍스트 캐시 흉내
+# - GET /stats : 요청 수 / 상태 코드별 건수 / 수신 바이트 / 최대 동시 요청 수
+#
+# 장애 주입:
+#   응답 지연은 로그정규분포 (중앙값 --latency-ms, 퍼짐 --latency-sigma)
+#   --rate-429 / --rate-500 확률로 오류 응답, --quota-rpm 을 넘는 요청은 429 (Retry-After 포함)
+#   --malformed 확률로 JSON 이 깨진 본문(text) 반환
+#
+# 사용법:
+#   python scripts/mock_gemini.py --port 8089 --latency-ms 800 --rate-429 0.05 --malformed 0.01
+#   python scripts/cleaning_dirty_2016_2020.py --api-base http://127.0.0.1:8089 --no-cache
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter, deque
+from pathlib import Path
+
+from aiohttp import web
+
+DEFAULT_CANNED = [
+    {"target": "manual_check", "original": None, "proposed": None, "reference": None, "reason": "Mock proposal."},
+]
+DATA_MARKER = '[Data to Analyze]'
+
+
+def extract_rows(prompt):
+    """프롬프트의 [Data to Analyze] 뒤 JSON 배열 (해석 불가면 [])"""
+    _, _, tail = prompt.partition(DATA_MARKER)
+    try:
+        rows = json.loads(tail.strip())
+    except ValueError:
+        return []
+    return rows if isinstance(rows, list) else []
+
+
+class MockGemini:
+    """목 서버 상태(설정 + 집계)와 핸들러"""
+
+    def __init__(self, latency_ms=500.0, latency_sigma=0.3, rate_429=0.0, rate_500=0.0, malformed=0.0,
+                 quota_rpm=None, retry_after=1.0, proposal_rate=0.2, canned=None, seed=None):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.rate_429 = rate_429
+        self.rate_500 = rate_500
+        self.malformed = malformed
+        self.quota_rpm = quota_rpm
+        self.retry_after = retry_after
+        self.proposal_rate = proposal_rate
+        self.canned = canned or DEFAULT_CANNED
+        self.rng = random.Random(seed)
+        self.window = deque()       # 최근 60초 요청 시각 (quota_rpm)
+        self.counts = Counter()
+        self.requests = 0
+        self.bytes_in = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.caches = set()
+
+    # ---------------------------------------------------------
+    # 응답 생성
+    # ---------------------------------------------------------
+    def _latency(self):
+        if self.latency_ms <= 0:
+            return 0.0
+        return self.latency_ms / 1000 * self.rng.lognormvariate(0, self.latency_sigma)
+
+    def _over_quota(self):
+        if not self.quota_rpm:
+            return None
+        now = time.monotonic()
+        while self.window and now - self.window[0] >= 60:
+            self.window.popleft()
+        if len(self.window) >= self.quota_rpm:
+            return 60 - (now - self.window[0])
+        self.window.append(now)
+        return None
+
+    def proposals(self, rows):
+        """행마다 proposal_rate 확률로 canned 제안 하나 (id 는 해당 행)"""
+        out = []
+        for row in rows:
+            if self.rng.random() < self.proposal_rate:
+                out.append({**self.rng.choice(self.canned), 'id': row.get('id')})
+        return out
+
+    def _respond(self, status, **kwargs):
+        self.counts[status] += 1
+        if 'text' in kwargs:
+            return web.Response(status=status, **kwargs)
+        return web.json_response(status=status, **kwargs)
+
+    # ---------------------------------------------------------
+    # 핸들러
+    # ---------------------------------------------------------
+    async def generate(self, request):
+        raw = await request.read()
+        self.requests += 1
+        self.bytes_in += len(raw)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._latency())
+
+            wait = self._over_quota()
+            if wait is not None:
+                return self._respond(429, text='quota exceeded', headers={'Retry-After': f"{wait:.1f}"})
+            roll = self.rng.random()
+            if roll < self.rate_429:
+                return self._respond(429, text='rate limited', headers={'Retry-After': f"{self.retry_after:g}"})
+            if roll < self.rate_429 + self.rate_500:
+                return self._respond(500, text='internal error')
+
+            body = json.loads(raw)
+            if body.get('cachedContent') and body['cachedContent'] not in self.caches:
+                return self._respond(404, text='cached content not found')
+            prompt = body['contents'][0]['parts'][0]['text']
+            text = json.dumps(self.proposals(extract_rows(prompt)), ensure_ascii=False)
+            if self.rng.random() < self.malformed:
+                text = text[:max(1, len(text) // 2)]
+                self.counts['malformed'] += 1
+            return self._respond(200, data={"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}}]})
+        finally:
+            self.in_flight -= 1
+
+    async def create_cache(self, request):
+        await request.read()
+        name = f"cachedContents/mock-{len(self.caches) + 1}"
+        self.caches.add(name)
+        return web.json_response({'name': name})
+
+    async def delete_cache(self, request):
+        self.caches.discard(f"cachedContents/{request.match_info['name']}")
+        return web.json_response({})
+
+    async def stats(self, request):
+        return web.json_response(self.summary())
+
+    def summary(self):
+        return {
+            'requests': self.requests, 'bytes_in': self.bytes_in, 'peak_in_flight': self.peak_in_flight,
+            'statuses': {str(k): v for k, v in self.counts.items()},
+        }
+
+    def app(self):
+        app = web.Application(client_max_size=32 * 1024 * 1024)
+        app.router.add_post('/v1beta/models/{model}', self.generate)
+        app.router.add_post('/v1beta/cachedContents', self.create_cache)
+        app.router.add_delete('/v1beta/cachedContents/{name}', self.delete_cache)
+        app.router.add_get('/stats', self.stats)
+        return app
+
+    async def start(self, host='127.0.0.1', port=0):
+        """현재 이벤트 루프에서 서버 시작 → (runner, base URL) (port=0 이면 빈 포트 자동 선택)"""
+        runner = web.AppRunner(self.app())
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return runner, f"http://{host}:{port}"
+
+
+def add_mock_arguments(parser):
+    """목 서버 설정 인자 (mock_gemini / benchmark_cleaning 공용)"""
+    parser.add_argument('--latency-ms', type=float, default=500.0, help="응답 지연 중앙값 (ms)")
+    parser.add_argument('--latency-sigma', type=float, default=0.3, help="응답 지연 로그정규분포 sigma (0 이면 고정)")
+    parser.add_argument('--rate-429', type=float, default=0.0, help="429 응답 확률")
+    parser.add_argument('--rate-500', type=float, default=0.0, help="500 응답 확률")
+    parser.add_argument('--malformed', type=float, default=0.0, help="JSON 이 깨진 응답 확률")
+    parser.add_argument('--quota-rpm', type=int, default=None, help="분당 허용 요청 수 (초과 시 429)")
+    parser.add_argument('--retry-after', type=float, default=1.0, help="주입된 429 의 Retry-After (초)")
+    parser.add_argument('--proposal-rate', type=float, default=0.2, help="행마다 제안을 반환할 확률")
+    parser.add_argument('--canned', default=None, help="제안 템플릿 JSON 파일 (목록, id 는 자동 채움)")
+    parser.add_argument('--seed', type=int, default=None, help="난수 시드")
+
+
+def mock_from_args(args):
+    canned = json.loads(Path(args.canned).read_text(encoding='utf-8')) if args.canned else None
+    return MockGemini(
+        latency_ms=args.latency_ms, latency_sigma=args.latency_sigma, rate_429=args.rate_429, rate_500=args.rate_500,
+        malformed=args.malformed, quota_rpm=args.quota_rpm, retry_after=args.retry_after,
+        proposal_rate=args.proposal_rate, canned=canned, seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gemini API 목 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    mock = mock_from_args(args)
+    print(f"🧪 Gemini 목 서버: http://{args.host}:{args.port} (통계: /stats)")
+    web.run_app(mock.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+# driving_logs 연도 파티션 관리 (MariaDB)
+# - driving_logs 는 YEAR(date) 기준 RANGE 파티션 (db_initializer.create_table_sql 참고)
+# - 연도 하나만 재구성/보관/재적재하므로 나머지 연도 데이터와 대시보드 조회에는 영향 없음
+#
+# 사용법:
+#   python scripts/partition_maintenance.py status                 # 파티션별 행 수 / 크기
+#   python scripts/partition_maintenance.py ensure --ahead 1       # pmax 에서 내년 파티션까지 분할
+#   python scripts/partition_maintenance.py rebuild 2021           # p2021 재구성 + 통계 갱신
+#   python scripts/partition_maintenance.py archive 2016           # p2016 → driving_logs_archive_2016 로 분리
+#   python scripts/partition_maintenance.py restore 2016           # 보관 테이블을 다시 p2016 으로
+#   python scripts/partition_maintenance.py reload 2019 data/processed/driving_log_2016_2020_final.parquet
+#                                                                  # 파일(Parquet/CSV)의 2019년 행으로 p2019 교체
+#
+# 기존(파티션 없는) driving_logs 는 db_initializer.py --reload 로 파티션 테이블로 전환됨
+# (staging 테이블이 파티션 구조로 생성된 뒤 RENAME TABLE 로 교체)
+
+import argparse
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import inspect, text
+
+from bulk_loader import (
+    DEFAULT_BATCH_SIZE, ensure_schema, ensure_updated_at_precision, load_data_infile, prepare_frame, upsert_batches,
+)
+from db_initializer import DB_COLUMNS, TABLE_NAME, create_table_sql, get_engine, partition_name
+from pipeline_schema import DRIVING_LOG_SCHEMA, read_table
+
+
+def archive_table(year):
+    return f"{TABLE_NAME}_archive_{year}"
+
+
+def load_table(year):
+    return f"{TABLE_NAME}_load_{year}"
+
+
+def list_partitions(conn, table=TABLE_NAME):
+    """파티션 목록 (information_schema 기준, 파티션 순서대로)"""
+    return pd.read_sql(text("""
+        SELECT PARTITION_NAME AS name, PARTITION_DESCRIPTION AS less_than,
+               TABLE_ROWS AS table_rows, DATA_LENGTH + INDEX_LENGTH AS bytes
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table
+        ORDER BY PARTITION_ORDINAL_POSITION
+    """), conn, params={'table': table})
+
+
+def _require_partition(conn, year):
+    names = set(list_partitions(conn)['name'].dropna())
+    if not names:
+        raise RuntimeError(f"'{TABLE_NAME}' 은 파티션 테이블이 아닙니다. 먼저 db_initializer.py --reload 로 전환하세요.")
+    if partition_name(year) not in names:
+        raise RuntimeError(f"'{TABLE_NAME}' 에 {partition_name(year)} 파티션이 없습니다. (ensure 로 생성)")
+
+
+def _year_count(conn, table, year):
+    # 반개구간 조건 → 해당 연도 파티션만 탐색
+    return conn.execute(
+        text(f"SELECT COUNT(*) FROM {table} WHERE date >= :start AND date < :end"),
+        {'start': date(year, 1, 1), 'end': date(year + 1, 1, 1)},
+    ).scalar()
+
+
+def status(engine):
+    with engine.connect() as conn:
+        parts = list_partitions(conn)
+    if parts.empty or parts['name'].isna().all():
+        print(f"⚠️ '{TABLE_NAME}' 은 파티션 테이블이 아닙니다.")
+        return parts
+    print(f"📊 {TABLE_NAME} 파티션 ({len(parts)}개, 행 수는 통계 기준 추정치)")
+    for row in parts.itertuples():
+        print(f"   - {row.name:<6} < {row.less_than:<8} {int(row.table_rows or 0):>10,}행 {(row.bytes or 0) / 1024 ** 2:>8.1f} MB")
+    return parts
+
+
+def ensure(engine, ahead=1):
+    """
+    올해 + ahead 년까지 파티션이 있도록 pmax 를 분할
+    - pmax 가 비어 있으면 REORGANIZE 는 메타데이터 작업에 가까워 빠름 (새해 전에 미리 실행 권장)
+    """
+    target = date.today().year + ahead
+    with engine.begin() as conn:
+        names = set(list_partitions(conn)['name'].dropna())
+        if not names:
+            raise RuntimeError(f"'{TABLE_NAME}' 은 파티션 테이블이 아닙니다.")
+        years = sorted(int(n[1:]) for n in names if n != 'pmax')
+        missing = list(range(years[-1] + 1, target + 1)) if years else []
+        if not missing:
+            print(f"✅ {partition_name(target)} 까지 파티션이 이미 있습니다.")
+            return []
+        new_parts = ", ".join(
+            f"PARTITION {partition_name(y)} VALUES LESS THAN ({y + 1})" for y in missing
+        )
+        conn.execute(text(
+            f"ALTER TABLE {TABLE_NAME} REORGANIZE PARTITION pmax INTO "
+            f"({new_parts}, PARTITION pmax VALUES LESS THAN MAXVALUE)"
+        ))
+    print(f"🔨 파티션 추가: {', '.join(partition_name(y) for y in missing)}")
+    return missing
+
+
+def rebuild(engine, year):
+    """한 연도 파티션만 재구성(단편화 정리) 후 통계 갱신"""
+    part = partition_name(year)
+    with engine.begin() as conn:
+        _require_partition(conn, year)
+        conn.execute(text(f"ALTER TABLE {TABLE_NAME} REBUILD PARTITION {part}"))
+        conn.execute(text(f"ALTER TABLE {TABLE_NAME} ANALYZE PARTITION {part}"))
+    print(f"🔧 {part} 재구성 및 통계 갱신 완료")
+
+
+def archive(engine, year):
+    """
+    연도 파티션을 별도 테이블(driving_logs_archive_YYYY)로 분리
+    - EXCHANGE PARTITION 은 데이터 복사 없이 파티션과 테이블을 맞바꿈 → 파티션은 빈 상태로 남음
+    """
+    part, archived = partition_name(year), archive_table(year)
+    with engine.begin() as conn:
+        _require_partition(conn, year)
+        if inspect(conn).has_table(archived) and _count_all(conn, archived):
+            raise RuntimeError(f"보관 테이블 '{archived}' 에 이미 데이터가 있습니다. (restore 후 다시 실행)")
+        conn.execute(text(f"DROP TABLE IF EXISTS {archived}"))
+        conn.execute(text(create_table_sql(archived, partitioned=False)))
+        conn.execute(text(f"ALTER TABLE {TABLE_NAME} EXCHANGE PARTITION {part} WITH TABLE {archived}"))
+        moved = _count_all(conn, archived)
+    print(f"📦 {part} → {archived} ({moved:,}행 보관)")
+    return moved
+
+
+def restore(engine, year):
+    """보관 테이블을 비어 있는 연도 파티션으로 되돌림"""
+    part, archived = partition_name(year), archive_table(year)
+    with engine.begin() as conn:
+        _require_partition(conn, year)
+        if not inspect(conn).has_table(archived):
+            raise RuntimeError(f"보관 테이블 '{archived}' 이 없습니다.")
+        if _year_count(conn, TABLE_NAME, year):
+            raise RuntimeError(f"{part} 에 데이터가 있어 되돌릴 수 없습니다. (reload 로 교체하거나 먼저 archive)")
+        # 예전(초 단위 updated_at)에 보관한 테이블은 구조를 맞춘 뒤 교환
+        ensure_updated_at_precision(conn, archived)
+        conn.execute(text(f"ALTER TABLE {TABLE_NAME} EXCHANGE PARTITION {part} WITH TABLE {archived}"))
+        conn.execute(text(f"DROP TABLE {archived}"))
+        restored = _year_count(conn, TABLE_NAME, year)
+    print(f"📥 {archived} → {part} ({restored:,}행 복원)")
+    return restored
+
+
+def _count_all(conn, table):
+    return conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+
+def reload_year(engine, year, path, method='auto', batch_size=DEFAULT_BATCH_SIZE):
+    """
+    파일(공용 스키마 Parquet, 예전 CSV 도 가능)의 해당 연도 행만으로 연도 파티션을 통째로 교체
+    - 파티션 없는 적재 테이블(driving_logs_load_YYYY)에 먼저 적재/검증한 뒤 EXCHANGE PARTITION
+    - 교체 후 적재 테이블에는 이전 파티션 데이터가 남음 (되돌리려면 같은 EXCHANGE 를 다시 수행)
+    """
+    part, staged_table = partition_name(year), load_table(year)
+    df = read_table(path, columns=DB_COLUMNS, schema=DRIVING_LOG_SCHEMA)
+    dates = pd.to_datetime(df['date'], errors='coerce')
+    df = df[(dates >= pd.Timestamp(year, 1, 1)) & (dates < pd.Timestamp(year + 1, 1, 1))]
+    if df.empty:
+        raise RuntimeError(f"{path} 에 {year}년 데이터가 없습니다.")
+    df = prepare_frame(df)
+
+    with engine.begin() as conn:
+        _require_partition(conn, year)
+        conn.execute(text(f"DROP TABLE IF EXISTS {staged_table}"))
+        conn.execute(text(create_table_sql(staged_table, partitioned=False)))
+        # 새 행의 id 가 운영 테이블 id 뒤로 이어지도록 (대시보드 증분 로드는 id 기준)
+        next_id = conn.execute(text(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {TABLE_NAME}")).scalar()
+        conn.execute(text(f"ALTER TABLE {staged_table} AUTO_INCREMENT = {int(next_id)}"))
+
+    used = 'upsert'
+    if method in ('auto', 'infile'):
+        try:
+            load_data_infile(engine, df, staged_table, upsert=False)
+            used = 'infile'
+        except Exception as e:
+            if method == 'infile':
+                raise
+            print(f"   - LOAD DATA LOCAL INFILE 사용 불가, 배치 INSERT 로 대체: {e.__class__.__name__}")
+    if used == 'upsert':
+        upsert_batches(engine, df, staged_table, batch_size)
+
+    with engine.begin() as conn:
+        staged = _count_all(conn, staged_table)
+        if staged != len(df) or _year_count(conn, staged_table, year) != staged:
+            raise RuntimeError(f"검증 실패: {staged_table} {staged:,}행 / 대상 {len(df):,}행 (교체하지 않음)")
+        before = _year_count(conn, TABLE_NAME, year)
+        conn.execute(text(f"ALTER TABLE {TABLE_NAME} EXCHANGE PARTITION {part} WITH TABLE {staged_table}"))
+    print(f"🔁 {part} 교체 완료 ({before:,}행 → {staged:,}행, {used}), 이전 데이터는 {staged_table}")
+    return staged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="driving_logs 연도 파티션 관리")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('status', help="파티션별 행 수 / 크기")
+    p = sub.add_parser('ensure', help="pmax 를 분할하여 앞으로의 연도 파티션 생성")
+    p.add_argument('--ahead', type=int, default=1, help="올해 이후 몇 년치까지 만들지 (기본 1)")
+    for name, help_text in [('rebuild', "연도 파티션 재구성 + 통계 갱신"),
+                            ('archive', "연도 파티션을 보관 테이블로 분리"),
+                            ('restore', "보관 테이블을 연도 파티션으로 복원")]:
+        sub.add_parser(name, help=help_text).add_argument('year', type=int)
+    p = sub.add_parser('reload', help="파일(Parquet/CSV)의 해당 연도 행으로 연도 파티션 교체")
+    p.add_argument('year', type=int)
+    p.add_argument('path', help="적재할 Parquet/CSV (예: data/processed/driving_log_2016_2020_final.parquet)")
+    p.add_argument('--method', choices=['auto', 'infile', 'upsert'], default='auto')
+    p.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    engine = get_engine()
+    if engine.dialect.name != 'mysql':
+        print(f"❌ 파티션 관리는 MariaDB/MySQL 에서만 지원합니다 (현재: {engine.dialect.name})")
+        return
+    try:
+        if args.command in ('archive', 'restore', 'reload'):
+            # 교환 테이블은 현재 DDL 로 만들어지므로 운영 테이블 구조(updated_at 정밀도 등)를 먼저 맞춤
+            ensure_schema(engine)
+        if args.command == 'status':
+            status(engine)
+        elif args.command == 'ensure':
+            ensure(engine, args.ahead)
+        elif args.command == 'rebuild':
+            rebuild(engine, args.year)
+        elif args.command == 'archive':
+            archive(engine, args.year)
+        elif args.command == 'restore':
+            restore(engine, args.year)
+        elif args.command == 'reload':
+            reload_year(engine, args.year, args.path, method=args.method, batch_size=args.batch_size)
+    except Exception as e:
+        print(f"❌ 작업 실패: {e}")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
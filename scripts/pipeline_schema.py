@@ -0,0 +1,133 @@
+# 파이프라인 단계 간 중간 산출물 공용 스키마 / 입출력 (Parquet)
+#   cleaning_messy / ingest → *_cleaned.parquet → cleaning_dirty → cleaning_proposal_ai_*.parquet
+#   → apply_corrections → *_final.parquet → dirty_check / db_initializer
+# - 스키마(PyArrow)를 명시해서 저장 → 단계마다 dtype 재추론 / 날짜 재파싱 없이 같은 타입으로 읽힘
+# - 읽을 때는 필요한 컬럼만 로드 (read_table(path, columns=[...]))
+# - csv=True 면 사람이 열어볼 CSV(utf-8-sig)를 같은 이름으로 함께 저장 (선택)
+# - Parquet 이 없고 예전 CSV 만 있으면 CSV 를 읽어 같은 스키마로 맞춰 반환 (기존 산출물 / 직접 지정한 CSV 호환)
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# 운행일지 (정제 결과 / 최종 결과 공통, 컬럼 순서 = DB 적재 순서)
+DRIVING_LOG_SCHEMA = pa.schema([
+    ('date', pa.timestamp('ns')),
+    ('vehicle_id', pa.string()),
+    ('fuel_efficiency', pa.float64()),
+    ('speed', pa.float64()),
+    ('time', pa.string()),              # 'HH:MM:SS' (25시, 90분 같은 입력 오류도 그대로 보존)
+    ('distance', pa.float64()),
+    ('cumulative_distance', pa.float64()),
+    ('consumed_fuel', pa.float64()),
+    ('refuel', pa.float64()),
+    ('reurea', pa.float64()),
+])
+
+# AI / 규칙 보정 제안 (original / proposed / reference 는 숫자·시간 문자열이 섞이므로 문자열로 보관)
+PROPOSAL_SCHEMA = pa.schema([
+    ('id', pa.int64()),
+    ('date', pa.timestamp('ns')),
+    ('vehicle_id', pa.string()),
+    ('target', pa.string()),
+    ('original', pa.string()),
+    ('proposed', pa.string()),
+    ('reference', pa.string()),
+    ('reason', pa.string()),
+])
+
+PARQUET_COMPRESSION = 'zstd'
+
+# 정제 결과 파일 이름 (cleaning_messy / ingest 가 쓰고 messy_check / cleaning_dirty / apply_corrections 가 읽음)
+CLEANED_SUFFIX = '_cleaned.parquet'
+
+
+def cleaned_name(workbook):
+    """워크북 → 정제 결과 파일 이름 (driving_log_2016_2020.xlsx → driving_log_2016_2020_cleaned.parquet)"""
+    return f"{Path(workbook).stem}{CLEANED_SUFFIX}"
+
+
+CLEANED_2016_2020 = cleaned_name('driving_log_2016_2020.xlsx')
+
+
+def _as_string(values):
+    """결측은 None, 나머지는 str() (20.0 → '20.0', '03:27:00' 그대로)"""
+    values = pd.Series(values, dtype=object)
+    return values.astype(str).where(values.notna(), None)
+
+
+def conform(df, schema, columns=None):
+    """
+    df 를 schema 타입으로 맞춘 새 DataFrame (스키마 컬럼 순서, 스키마에 없는 컬럼은 제외)
+    - columns: 이 컬럼만 변환 (None 이면 스키마 전체, df 에 없는 컬럼은 결측으로 추가)
+    """
+    names = [name for name in schema.names if columns is None or name in columns]
+    out = pd.DataFrame(index=df.index)
+    for name in names:
+        field_type = schema.field(name).type
+        values = df[name] if name in df else pd.Series(None, index=df.index, dtype=object)
+        if pa.types.is_timestamp(field_type):
+            out[name] = pd.to_datetime(values, errors='coerce').astype('datetime64[ns]')
+        elif pa.types.is_floating(field_type):
+            out[name] = pd.to_numeric(values, errors='coerce').astype(float)
+        elif pa.types.is_integer(field_type):
+            out[name] = pd.to_numeric(values, errors='coerce').astype('Int64')
+        else:
+            out[name] = _as_string(values)
+    return out
+
+
+def write_table(df, path, schema, csv=False):
+    """
+    schema 로 맞춰 Parquet 저장 (임시 파일에 쓴 뒤 교체) → 저장 경로 반환
+    - csv=True: 같은 이름의 .csv 도 함께 저장 (내보내기용)
+    """
+    path = Path(path).with_suffix('.parquet')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = conform(df, schema)
+    table = pa.Table.from_pandas(data, schema=schema, preserve_index=False)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    pq.write_table(table, tmp, compression=PARQUET_COMPRESSION)
+    tmp.replace(path)
+    if csv:
+        data.to_csv(path.with_suffix('.csv'), index=False, encoding='utf-8-sig')
+    return path
+
+
+def _locate(path):
+    """주어진 경로가 있으면 그대로, 없으면 같은 이름의 .parquet → .csv 순서로 찾음 (없으면 None)"""
+    path = Path(path)
+    for candidate in (path, path.with_suffix('.parquet'), path.with_suffix('.csv')):
+        if candidate.suffix in ('.parquet', '.csv') and candidate.exists():
+            return candidate
+    return None
+
+
+def table_exists(path):
+    return _locate(path) is not None
+
+
+def read_table(path, columns=None, schema=None):
+    """
+    Parquet 또는 CSV 로드 (경로의 파일이 없으면 같은 이름의 다른 형식, 예전 CSV 산출물 호환)
+    - columns: 필요한 컬럼만 읽음 (Parquet 은 해당 컬럼 청크만 디스크에서 읽음, 파일에 없는 컬럼은 무시)
+    - schema: CSV 로 읽을 때 타입을 맞출 스키마 (Parquet 은 저장된 타입 그대로)
+    """
+    found = _locate(path)
+    if found is None:
+        raise FileNotFoundError(path)
+    if found.suffix == '.parquet':
+        if columns is not None:
+            available = set(pq.read_schema(found).names)
+            columns = [c for c in columns if c in available]
+        return pd.read_parquet(found, columns=columns)
+    # 문자열 컬럼은 추론 없이 문자열로 읽음 ('0830' 같은 값 보존, 숫자/문자 혼재 경고 방지)
+    text = {f.name: str for f in schema if pa.types.is_string(f.type)} if schema is not None else None
+    df = pd.read_csv(found, usecols=(lambda c: c in columns) if columns is not None else None, dtype=text)
+    if schema is not None:
+        typed = conform(df, schema, columns=list(df.columns))
+        df = df.assign(**{name: typed[name] for name in typed.columns})
+    return df
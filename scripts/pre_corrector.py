@@ -0,0 +1,237 @@
+# 규칙 기반 사전 보정 (Gemini 호출 전에 기계적으로 판단 가능한 오류를 먼저 처리)
+# - 요소수 한 자리 값(1, 2, 6) → 표준 보충량 20L
+# - 거리 == 연료 (복사 오류) → 속도×시간과 맞는 쪽을 남기고 나머지를 연비로 재계산
+# - 거리 / 연료 / 연비의 숫자 오타 → 한 글자 편집(삽입/삭제/치환) 또는 소수점 이동 후보 중
+#   참조값(ref_dist_fuel / ref_fuel / ref_efficiency)과 MATCH_TOLERANCE 이내이면서 다른 후보보다 확실히 가까울 때만 확정
+# - 누적거리 역전 → 수기 확인 필요 (proposed 없음)
+#
+# 후보 생성/비교는 고유값 단위 문자열 연산 + merge 로 한 번에 처리 (행 단위 루프 없음)
+# 확정하지 못한 행(후보가 없거나 여러 개, 다른 컬럼과 충돌)은 그대로 AI 검토 대상으로 남김
+
+import numpy as np
+import pandas as pd
+
+from cleaning_kernels import TEXT_DTYPE, reference_columns
+from quality_rules import LIMITS, SUSPECT_RULES, evaluate, prepare
+
+PROPOSAL_COLUMNS = ['id', 'date', 'vehicle_id', 'target', 'original', 'proposed', 'reference', 'reason']
+
+MATCH_TOLERANCE = 0.02   # 편집 후보 vs 참조값 허용 오차 (2%)
+MISMATCH_MIN = 0.10      # 원래 값이 참조값과 이 이상 차이날 때만 오타 후보 탐색
+AMBIGUITY_RATIO = 2.0    # 가장 가까운 후보가 다음 후보보다 이 배수 이상 가까워야 확정
+REUREA_STANDARD = 20     # 요소수 표준 보충량 (L)
+
+# (대상 컬럼, 참조 컬럼, 제안값 반올림 자릿수)
+TYPO_TARGETS = [
+    ('distance', 'ref_dist_fuel', 1),
+    ('consumed_fuel', 'ref_fuel', 2),
+    ('fuel_efficiency', 'ref_efficiency', 2),
+]
+
+# 편집 종류별 우선순위 (같은 값이 여러 편집으로 만들어지면 앞쪽 설명 사용)
+EDIT_PRIORITY = {'shift': 0, 'delete': 1, 'substitute': 2, 'insert': 3}
+
+# 숫자 키패드 배열 (7 8 9 / 4 5 6 / 1 2 3 / 0) 에서 상하좌우로 붙어 있는 키
+_KEYPAD = ['789', '456', '123', ' 0 ']
+KEYPAD_NEIGHBORS = {
+    _KEYPAD[r][c]: {_KEYPAD[rr][cc] for rr, cc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+                    if 0 <= rr < 4 and 0 <= cc < 3 and _KEYPAD[rr][cc] != ' '}
+    for r in range(4) for c in range(3) if _KEYPAD[r][c] != ' '
+}
+
+
+def _number_text(values):
+    """숫자 → 입력 당시 표기에 가까운 문자열 (5305.0 → '5305', 36.9 → '36.9')"""
+    return pd.Series(values).astype(str).str.replace(r'\.0$', '', regex=True).astype(TEXT_DTYPE)
+
+
+def edit_candidates(values):
+    """
+    값별 편집 후보 DataFrame: code(values 위치), candidate, kind, old, new
+    - insert: 임의 위치에 숫자 하나 추가 (앞자리/중간 자리 누락)
+    - delete: 숫자 하나 삭제 (두 번 눌림)
+    - substitute: 숫자 하나를 다른 숫자로 (키패드 옆 숫자 등)
+    - shift: 소수점 이동 (×10, ×100, ÷10, ÷100)
+    """
+    values = pd.Series(values, dtype=float).reset_index(drop=True)
+    text = _number_text(values)
+    length = text.str.len().to_numpy()
+    codes = np.arange(len(values))
+    parts = []
+
+    def add(mask, candidate, kind, old, new):
+        mask = np.asarray(mask, dtype=bool)
+        if mask.any():
+            parts.append(pd.DataFrame({
+                'code': codes[mask], 'candidate': candidate[mask], 'kind': kind,
+                'old': np.asarray(old, dtype=object)[mask] if not isinstance(old, str) else old, 'new': new,
+            }))
+
+    for pos in range(int(length.max(initial=0)) + 1):
+        left, rest, right = text.str[:pos], text.str[pos:], text.str[pos + 1:]
+        char = text.str[pos:pos + 1]
+        can_insert = length >= pos
+        is_digit = (length > pos) & char.str.isdigit().fillna(False).to_numpy(dtype=bool)
+        old = char.to_numpy(dtype=object)
+        for digit in '0123456789':
+            add(can_insert, (left + digit + rest).to_numpy(dtype=object), 'insert', '', digit)
+            add(is_digit & (old != digit), (left + digit + right).to_numpy(dtype=object), 'substitute', old, digit)
+        add(is_digit, (left + right).to_numpy(dtype=object), 'delete', old, '')
+
+    numbers = values.to_numpy()
+    for factor in (10, 100, 0.1, 0.01):
+        add(np.isfinite(numbers), numbers * factor, 'shift', '', f'x{factor:g}')
+
+    if not parts:
+        return pd.DataFrame(columns=['code', 'candidate', 'kind', 'old', 'new'])
+    out = pd.concat(parts, ignore_index=True)
+    out['candidate'] = pd.to_numeric(out['candidate'], errors='coerce')
+    return out
+
+
+def _edit_reason(kind, old, new, original, proposed, ref_name):
+    change = f"({original:g} -> {proposed:g})"
+    if kind == 'insert':
+        text = f"Missing digit '{new}' detected {change}."
+    elif kind == 'delete':
+        text = f"Extra digit '{old}' removed (fat finger) {change}."
+    elif kind == 'substitute':
+        typo = 'Keypad typo' if new in KEYPAD_NEIGHBORS.get(old, ()) else 'Digit typo'
+        text = f"{typo} suspected ({old}->{new}) {change}."
+    else:
+        text = f"Decimal point error {change}."
+    return f"[Rule] {text} Matches {ref_name}."
+
+
+def _limits_ok(target, values):
+    if target == 'distance':
+        return (values > 0) & (values <= LIMITS['DISTANCE_MAX'])
+    if target == 'fuel_efficiency':
+        return (values >= LIMITS['EFFICIENCY_MIN']) & (values <= LIMITS['EFFICIENCY_MAX'])
+    return values > 0
+
+
+def typo_fixes(f, refs, rows):
+    """
+    rows(원본 index) 중 거리/연료/연비 오타로 확정되는 보정 목록
+    - 참조값과 MATCH_TOLERANCE 이내인 후보 중 가장 가까운 값이 다음 값보다 AMBIGUITY_RATIO 배 이상 가까울 때만 확정
+    - 거리 보정은 속도×시간(있으면)과도 DIST_CALC_TOLERANCE 이내여야 하고,
+      연료/연비 보정은 원래 거리가 속도×시간과 맞을 때(또는 속도×시간이 없을 때)만 확정
+    - 한 행에 두 컬럼 이상 확정되면 어느 쪽이 오타인지 알 수 없으므로 모두 제외
+    """
+    phys = f['calc_dist']
+    tol = LIMITS['DIST_CALC_TOLERANCE']
+    distance_ok = ~((phys > 0) & ((f['distance'] - phys).abs() / f['distance'] > tol))
+    fixes = []
+    for target, ref_name, decimals in TYPO_TARGETS:
+        value, ref = f[target], refs[ref_name]
+        eligible = f.index.isin(rows) & (value > 0) & (ref > 0) & ((value - ref).abs() / ref > MISMATCH_MIN)
+        if target != 'distance':
+            eligible &= distance_ok.to_numpy()
+        if not eligible.any():
+            continue
+        codes, uniques = pd.factorize(value[eligible])
+        candidates = edit_candidates(uniques)
+        pairs = pd.DataFrame({'row': value.index[eligible.to_numpy()], 'code': codes,
+                              'original': value[eligible].to_numpy(), 'reference': ref[eligible].to_numpy()})
+        m = pairs.merge(candidates, on='code')
+        m = m[m['candidate'].notna() & (m['candidate'] != m['original'])]
+        m = m[((m['candidate'] - m['reference']).abs() / m['reference'] <= MATCH_TOLERANCE)
+              & _limits_ok(target, m['candidate'])]
+        if target == 'distance':
+            p = phys.reindex(m['row']).to_numpy()
+            m = m[~((p > 0) & (np.abs(m['candidate'] - p) / m['candidate'] > tol))]
+        if m.empty:
+            continue
+        m = m.assign(value=m['candidate'].round(6), priority=m['kind'].map(EDIT_PRIORITY),
+                     error=(m['candidate'] - m['reference']).abs() / m['reference'])
+        # 행별로 서로 다른 후보 값을 오차순으로 정렬 → 1등이 2등보다 AMBIGUITY_RATIO 배 이상 가까울 때만 확정
+        m = m.sort_values(['row', 'error', 'priority']).drop_duplicates(['row', 'value'])
+        by_row = m.groupby('row')['error']
+        runner_up = by_row.shift(-1).fillna(np.inf)
+        m = m[(by_row.cumcount() == 0) & (runner_up >= AMBIGUITY_RATIO * m['error'])]
+        fixes.append(pd.DataFrame({
+            'row': m['row'].to_numpy(), 'target': target, 'original': m['original'].to_numpy(),
+            'proposed': m['candidate'].round(decimals).to_numpy(), 'reference': m['reference'].round(2).to_numpy(),
+            'reason': [_edit_reason(k, o, n, orig, prop, ref_name) for k, o, n, orig, prop in
+                       zip(m['kind'], m['old'], m['new'], m['original'], m['candidate'].round(decimals))],
+        }))
+    if not fixes:
+        return pd.DataFrame(columns=['row', 'target', 'original', 'proposed', 'reference', 'reason'])
+    fixes = pd.concat(fixes, ignore_index=True)
+    return fixes[fixes.groupby('row')['target'].transform('size') == 1]
+
+
+def copy_fixes(f):
+    """
+    거리 == 연료 (한쪽 값을 다른 칸에 복사) → 속도×시간과 맞는 쪽을 정답으로 보고 다른 쪽을 연비로 재계산
+    - 연료가 맞으면 거리 = 연료 × 연비, 거리가 맞으면 연료 = 거리 / 연비
+    - 속도×시간이 없거나 둘 다 맞지 않으면 확정하지 않음 (AI 검토)
+    """
+    eff, phys = f['fuel_efficiency'], f['calc_dist']
+    tol = LIMITS['DIST_CALC_TOLERANCE']
+    copied = ((f['distance'] == f['consumed_fuel']) & (f['distance'] > 0) & (phys > 0)
+              & (eff >= LIMITS['EFFICIENCY_MIN']) & (eff <= LIMITS['EFFICIENCY_MAX']))
+    c = f[copied]
+    new_dist = c['consumed_fuel'] * eff[copied]
+    err_fuel_ok = (new_dist - c['calc_dist']).abs() / new_dist     # 연료가 맞다고 볼 때
+    err_dist_ok = (c['distance'] - c['calc_dist']).abs() / c['distance']  # 거리가 맞다고 볼 때
+    fix_dist = (err_fuel_ok <= tol) & (err_fuel_ok < err_dist_ok) & (new_dist <= LIMITS['DISTANCE_MAX'])
+    fix_fuel = (err_dist_ok <= tol) & (err_dist_ok < err_fuel_ok)
+
+    d, u = c[fix_dist], c[fix_fuel]
+    return pd.concat([
+        pd.DataFrame({'row': d.index, 'target': 'distance', 'original': d['distance'].to_numpy(),
+                      'proposed': new_dist[fix_dist].round(1).to_numpy(),
+                      'reference': new_dist[fix_dist].round(2).to_numpy(),
+                      'reason': "[Rule] Copy error (Dist=Fuel). Recalculated distance using fuel * efficiency."}),
+        pd.DataFrame({'row': u.index, 'target': 'consumed_fuel', 'original': u['consumed_fuel'].to_numpy(),
+                      'proposed': (u['distance'] / u['fuel_efficiency']).round(2).to_numpy(),
+                      'reference': (u['distance'] / u['fuel_efficiency']).round(2).to_numpy(),
+                      'reason': "[Rule] Copy error (Dist=Fuel). Recalculated fuel using distance / efficiency."}),
+    ], ignore_index=True)
+
+
+def pre_correct(df, quality=None, violations=None):
+    """
+    규칙으로 확정되는 보정 제안과 AI 검토가 여전히 필요한 행 마스크 반환
+    - 반환: (proposals: PROPOSAL_COLUMNS 형식 DataFrame, residual: 원본 index 기준 boolean Series)
+    - residual: 확정 보정을 반영한 값으로 의심 규칙을 다시 평가했을 때 남는 행
+      (누적거리 역전은 수기 확인 제안으로 처리되므로 재평가에서 제외)
+    """
+    f = prepare(df) if quality is None else quality
+    if violations is None:
+        violations = evaluate(df, SUSPECT_RULES, frame=f)
+    refs = reference_columns(df, decimals=None)
+
+    reurea = f[violations['reurea_unit']]
+    regression = f[violations['cumulative_regression']]
+    copied = copy_fixes(f)
+    math_rows = f.index[(violations['efficiency_vs_fuel'] | violations['distance_vs_speed_time'])
+                        & (f['distance'] != f['consumed_fuel'])]
+    proposals = pd.concat([
+        pd.DataFrame({'row': reurea.index, 'target': 'reurea', 'original': reurea['reurea'].to_numpy(),
+                      'proposed': float(REUREA_STANDARD), 'reference': np.nan,
+                      'reason': [f"[Rule] Unit error correction (Force {v:g} -> {REUREA_STANDARD}L). Standard refill volume."
+                                 for v in reurea['reurea']]}),
+        copied,
+        typo_fixes(f, refs, math_rows),
+        pd.DataFrame({'row': regression.index, 'target': 'cumulative_distance',
+                      'original': regression['cumulative_distance'].to_numpy(), 'proposed': np.nan,
+                      'reference': regression['prev_cum'].to_numpy(),
+                      'reason': "[Rule] Logic Error: Cumulative distance regression. Manual Check Required."}),
+    ], ignore_index=True)
+
+    # 확정 보정을 반영한 값으로 의심 규칙 재평가
+    corrected = df.copy()
+    for target, group in proposals[proposals['proposed'].notna()].groupby('target'):
+        corrected[target] = pd.to_numeric(corrected[target], errors='coerce')
+        corrected.loc[group['row'], target] = pd.to_numeric(group['proposed'], errors='coerce').to_numpy(dtype=float)
+    residual_rules = [r for r in SUSPECT_RULES if r != 'cumulative_regression']
+    residual = evaluate(corrected, residual_rules).any(axis=1)
+
+    rows = proposals['row']
+    proposals.insert(0, 'id', df['id'].reindex(rows).to_numpy() if 'id' in df else rows.to_numpy())
+    proposals['date'] = df['date'].reindex(rows).to_numpy()
+    proposals['vehicle_id'] = df['vehicle_id'].reindex(rows).to_numpy()
+    return proposals[PROPOSAL_COLUMNS], residual
@@ -0,0 +1,58 @@
+# 배치 작업 진행 기록 (JSONL, 추가 전용)
+# - 배치가 끝날 때마다 {배치 키, 결과, 건수, 시각} 한 줄을 기록하고 바로 디스크에 반영(fsync)
+# - 중단/오류 후 --resume 으로 다시 실행하면 'done' 으로 기록된 배치는 건너뜀
+# - 마지막 줄이 쓰다 만 상태로 남아 있으면(강제 종료) 그 줄만 무시
+#
+# 결과 파일(cleaning_proposal_ai_<시각>.csv) 옆에 같은 이름의 .journal.jsonl 로 저장
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+JOURNAL_SUFFIX = '.journal.jsonl'
+
+
+def journal_path(output_path):
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.stem + JOURNAL_SUFFIX)
+
+
+class ProgressJournal:
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def load(self):
+        """배치 키 → 마지막 기록 (같은 키가 여러 번 있으면 나중 기록 우선)"""
+        entries = {}
+        if not self.path.exists():
+            return entries
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                entries[entry['key']] = entry
+        return entries
+
+    def completed(self):
+        return {key for key, entry in self.load().items() if entry.get('status') == 'done'}
+
+    def _ends_cleanly(self):
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return True
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def record(self, key, status, **info):
+        entry = {'key': key, 'status': status, 'at': datetime.now().isoformat(timespec='seconds'), **info}
+        line = json.dumps(entry, ensure_ascii=False, default=str) + '\n'
+        if not self._ends_cleanly():
+            # 쓰다 만 마지막 줄과 붙지 않도록 줄바꿈부터
+            line = '\n' + line
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
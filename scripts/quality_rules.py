@@ -0,0 +1,173 @@
+# 운행일지 데이터 품질 규칙 (dirty_check / cleaning_dirty 공용)
+# - 임계값(LIMITS)과 규칙(RULES)을 한 곳에서 선언하고, 컬럼 단위 연산으로 한 번에 평가
+# - 규칙 평가 결과는 규칙별 boolean 마스크 (행 단위 루프 없음)
+#   · dirty_check: 최종 데이터 점검 리포트 (issues_report)
+#   · cleaning_dirty: AI 검토 대상(의심 행) 선별 (suspect_mask)
+#
+# 임계값을 바꿀 때는 이 파일의 LIMITS 만 수정할 것
+
+from string import Formatter
+from typing import Callable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from cleaning_kernels import hms_parts, reference_columns
+
+# ---------------------------------------------------------
+# 설정: 임계값 (Thresholds)
+# ---------------------------------------------------------
+LIMITS = {
+    'SPEED_MAX': 110,             # 트럭 최고 속도 제한 (km/h)
+    'EFFICIENCY_MIN': 1.5,        # 최소 연비 (짐 가득 실었을 때)
+    'EFFICIENCY_MAX': 5.5,        # 최대 연비 (내리막/공차)
+    'DISTANCE_MAX': 1000,         # 하루 최대 주행 거리 (km)
+    'TIME_MAX_HOURS': 20,         # 하루 최대 운전 시간 (물리적 한계 → 명백한 오류)
+    'TIME_SUSPECT_HOURS': 16,     # 이 시간 이상이면 입력 오류 의심 (AI 검토 대상)
+    'DIST_CALC_TOLERANCE': 0.20,  # 거리 vs 속도×시간 허용 오차 (20%)
+    'FUEL_CALC_TOLERANCE': 0.01,  # 연비 vs 거리/연료 허용 오차 (1%)
+    'REUREA_UNIT_ERRORS': (1, 2, 6),  # 요소수 단위 입력 오류로 보이는 값 (정상 보충량은 10L 단위)
+}
+
+NUMERIC_COLUMNS = ['distance', 'speed', 'fuel_efficiency', 'consumed_fuel', 'cumulative_distance', 'reurea']
+# 규칙 평가(prepare)에 쓰이는 입력 컬럼 (파일에서 이 컬럼만 읽으면 충분)
+INPUT_COLUMNS = ['date', 'vehicle_id', 'time', *NUMERIC_COLUMNS]
+
+
+def prepare(df):
+    """
+    규칙 평가용 파생 컬럼을 한 번에 계산한 프레임 (원본 index 유지, 원본 df 는 수정하지 않음)
+    - 숫자 컬럼은 숫자로 변환, time_h: 실수 시간, time_hour/minute/second: 'HH:MM:SS' 분해 값
+    - calc_dist: 속도×시간, dist_error / fuel_error: 계산값 대비 오차 비율
+    - prev_cum: 같은 차량의 직전(값이 있는) 누적거리, cum_diff: 누적거리 증가분
+    """
+    f = pd.DataFrame(index=df.index)
+    for col in NUMERIC_COLUMNS:
+        f[col] = pd.to_numeric(df[col], errors='coerce') if col in df else np.nan
+    f['vehicle_id'] = df['vehicle_id'] if 'vehicle_id' in df else None
+    f['date'] = pd.to_datetime(df['date'], errors='coerce') if 'date' in df else pd.NaT
+    f['time'] = df['time'] if 'time' in df else None
+
+    refs = reference_columns(df, decimals=None)
+    f['time_h'] = refs['time_num']
+    f['calc_dist'] = refs['ref_dist_phys']
+    hms = hms_parts(f['time'])
+    f['has_colon'] = hms['colon']
+    f['time_hour'], f['time_minute'], f['time_second'] = hms['h'], hms['m'], hms['s']
+
+    f['dist_error'] = (f['distance'] - f['calc_dist']).abs() / f['distance']
+    f['dist_error_pct'] = f['dist_error'] * 100
+    f['fuel_error'] = ((f['distance'] / f['consumed_fuel'] - f['fuel_efficiency']) / f['fuel_efficiency']).abs()
+
+    # 누적거리 역전: 차량별·날짜순으로 값이 있는 행끼리 groupby().diff()
+    known = f[f['cumulative_distance'].notna()].sort_values(['vehicle_id', 'date'], kind='stable')
+    by_vehicle = known.groupby('vehicle_id', sort=False)['cumulative_distance']
+    f['cum_diff'] = by_vehicle.diff()
+    f['prev_cum'] = by_vehicle.shift(1)
+    return f
+
+
+# ---------------------------------------------------------
+# 규칙 선언
+# ---------------------------------------------------------
+class Rule(NamedTuple):
+    name: str
+    issue_type: str
+    column: str
+    check: Callable      # check(f, limits) → boolean Series
+    value: str           # 리포트의 value 템플릿 (f 컬럼 + LIMITS 로 format)
+    message: str         # 리포트의 message 템플릿
+
+
+RULES = [
+    Rule('cumulative_regression', 'Logic Error', 'cumulative_distance',
+         lambda f, L: f['cum_diff'] < 0,
+         '{cumulative_distance}', "누적거리 역전 발생 (이전: {prev_cum} > 현재: {cumulative_distance})"),
+    Rule('speed_max', 'Outlier', 'speed',
+         lambda f, L: f['speed'] > L['SPEED_MAX'],
+         '{speed}', "속도 과다 ({speed} > {SPEED_MAX} km/h)"),
+    Rule('efficiency_min', 'Outlier', 'fuel_efficiency',
+         lambda f, L: f['fuel_efficiency'] < L['EFFICIENCY_MIN'],
+         '{fuel_efficiency}', "연비 과소 ({fuel_efficiency} < {EFFICIENCY_MIN})"),
+    Rule('efficiency_max', 'Outlier', 'fuel_efficiency',
+         lambda f, L: f['fuel_efficiency'] > L['EFFICIENCY_MAX'],
+         '{fuel_efficiency}', "연비 과다 ({fuel_efficiency} > {EFFICIENCY_MAX})"),
+    Rule('time_max', 'Outlier', 'time',
+         lambda f, L: f['time_h'] > L['TIME_MAX_HOURS'],
+         '{time}', "운행 시간 과다 ({time_h:.1f}h > {TIME_MAX_HOURS}h)"),
+    Rule('time_suspect', 'Format Error', 'time',
+         lambda f, L: f['has_colon'] & (
+             f['time_second'].isna() | (f['time_hour'] >= L['TIME_SUSPECT_HOURS']) | (f['time_minute'] >= 60)),
+         '{time}', "시간 형식 오류 또는 {TIME_SUSPECT_HOURS}시간 이상 ({time})"),
+    Rule('distance_vs_speed_time', 'Math Mismatch', 'distance/speed/time',
+         lambda f, L: (f['distance'] > 0) & (f['dist_error'] > L['DIST_CALC_TOLERANCE']),
+         'Dist:{distance} vs Calc:{calc_dist:.1f}', "물리적 거리 불일치 ({dist_error_pct:.1f}%)"),
+    Rule('efficiency_vs_fuel', 'Math Mismatch', 'distance/consumed_fuel/fuel_efficiency',
+         lambda f, L: (f['consumed_fuel'] > 0) & (f['fuel_efficiency'] > 0) & (f['fuel_error'] > L['FUEL_CALC_TOLERANCE']),
+         'Eff:{fuel_efficiency} vs Calc:{distance}/{consumed_fuel}', "연비 계산 불일치 ({fuel_error:.1%})"),
+    Rule('reurea_unit', 'Unit Error', 'reurea',
+         lambda f, L: f['reurea'].isin(L['REUREA_UNIT_ERRORS']),
+         '{reurea}', "요소수 단위 입력 오류 의심 ({reurea}L)"),
+]
+RULES_BY_NAME = {rule.name: rule for rule in RULES}
+
+# 최종 데이터 점검(dirty_check) 리포트 대상
+REPORT_RULES = [
+    'cumulative_regression', 'speed_max', 'efficiency_min', 'efficiency_max', 'time_max', 'distance_vs_speed_time',
+]
+# AI 검토 대상 선별(cleaning_dirty) 기준
+SUSPECT_RULES = [
+    'efficiency_vs_fuel', 'distance_vs_speed_time', 'time_suspect', 'reurea_unit', 'cumulative_regression',
+]
+
+
+def _fields(*templates):
+    return {name for t in templates for _, name, _, _ in Formatter().parse(t) if name}
+
+
+def _select(rules):
+    return [RULES_BY_NAME[r] if isinstance(r, str) else r for r in (rules or RULES)]
+
+
+def evaluate(df, rules=None, limits=None, frame=None):
+    """규칙별 위반 마스크 DataFrame (컬럼 = 규칙 이름, 결측으로 판단 불가한 값은 False)"""
+    limits = {**LIMITS, **(limits or {})}
+    f = prepare(df) if frame is None else frame
+    return pd.DataFrame(
+        {rule.name: rule.check(f, limits).reindex(f.index).fillna(False).astype(bool) for rule in _select(rules)},
+        index=f.index,
+    )
+
+
+def suspect_mask(df, rules=SUSPECT_RULES, limits=None, frame=None):
+    """규칙 중 하나라도 위반한 행"""
+    return evaluate(df, rules, limits, frame).any(axis=1)
+
+
+def issues_report(df, rules=REPORT_RULES, limits=None):
+    """
+    위반 내역을 리포트 형태로 반환: id, date, issue_type, column, value, message
+    - 문구는 위반한 행에 대해서만 만들어지므로 대용량에서도 비용이 작음
+    """
+    limits = {**LIMITS, **(limits or {})}
+    f = prepare(df)
+    masks = evaluate(df, rules, limits, frame=f)
+    ids = df['id'] if 'id' in df else pd.Series(df.index, index=df.index)
+
+    reports = []
+    for rule in _select(rules):
+        hit = f[masks[rule.name]]
+        if hit.empty:
+            continue
+        # 템플릿에 쓰인 컬럼만 꺼내서 문구 생성
+        records = hit[sorted(_fields(rule.value, rule.message) - set(limits))].to_dict('records')
+        reports.append(pd.DataFrame({
+            'id': ids.loc[hit.index].values,
+            'date': hit['date'].values,
+            'issue_type': rule.issue_type,
+            'column': rule.column,
+            'value': [rule.value.format(**r, **limits) for r in records],
+            'message': [rule.message.format(**r, **limits) for r in records],
+        }))
+    columns = ['id', 'date', 'issue_type', 'column', 'value', 'message']
+    return pd.concat(reports, ignore_index=True) if reports else pd.DataFrame(columns=columns)
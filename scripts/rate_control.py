@@ -0,0 +1,133 @@
+# Gemini 호출 속도 제어 (비동기)
+# - 토큰 버킷: 분당 요청 수(RPM) 한도를 넘지 않도록 요청 시작 간격을 조절 (짧은 폭주는 burst 만큼 허용)
+# - AIMD 동시성: 성공하면 동시 요청 수를 천천히 늘리고(+1 / 현재 한도만큼 성공), 429 를 받으면 절반으로 줄임
+#   (429 가 한꺼번에 몰려와도 cooldown 동안은 한 번만 줄임)
+# - 429/5xx 재시도 대기: Retry-After 헤더를 우선 사용하고, 없으면 지터를 섞은 지수 백오프
+#   대기 중에는 버킷 전체를 멈춰서 다른 요청들이 동시에 다시 몰려가지 않도록 함
+# - 상태 코드별 / 예외별 건수 집계 (실행 종료 시 요약 출력)
+
+import asyncio
+import random
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """지수 백오프 + full jitter: 0 ~ min(cap, base * 2^attempt) 사이 임의 값"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_retry_after(value):
+    """Retry-After 헤더 → 대기 초 (초 단위 숫자 또는 HTTP 날짜, 해석 불가면 None)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """분당 rpm 회, 최대 burst 회까지 몰아서 허용하는 토큰 버킷"""
+
+    def __init__(self, rpm, burst=None):
+        self.rate = rpm / 60.0
+        self.capacity = burst or max(1, rpm // 10)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds):
+        """seconds 동안 새 요청 시작을 막음 (Retry-After 대응)"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AdaptiveRateLimiter:
+    """
+    토큰 버킷(RPM) + AIMD 동시성 제한 + 상태별 집계
+    사용법:
+        async with limiter.slot():
+            ... 요청 ...
+        limiter.record(status) / limiter.throttled(retry_after)
+    """
+
+    def __init__(self, rpm=60, initial=5, min_concurrency=1, max_concurrency=20, cooldown=5.0):
+        self.bucket = TokenBucket(rpm)
+        self.limit = float(initial)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.peak = initial
+        self.last_decrease = 0.0
+        self.counts = Counter()
+        self._cond = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        try:
+            await self.bucket.acquire()
+            yield
+        finally:
+            async with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    def record(self, label):
+        """응답 상태 코드 또는 예외 이름 집계 (200 이면 동시성 한도 증가)"""
+        self.counts[label] += 1
+        if label == 200:
+            # additive increase: 한도만큼 성공하면 +1
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self.peak = max(self.peak, int(self.limit))
+            self._notify()
+
+    def throttled(self, retry_after=None, attempt=0):
+        """
+        429 처리: 동시성 한도를 절반으로 (cooldown 내 중복 감소 없음), 버킷을 대기 시간만큼 멈춤
+        - 반환: 이번 요청이 재시도 전에 기다릴 시간(초)
+        """
+        now = time.monotonic()
+        if now - self.last_decrease >= self.cooldown:
+            self.limit = max(self.min_concurrency, self.limit / 2)
+            self.last_decrease = now
+        delay = retry_after if retry_after is not None else backoff_delay(attempt, base=2.0)
+        self.bucket.pause(delay)
+        return delay
+
+    def _notify(self):
+        async def wake():
+            async with self._cond:
+                self._cond.notify_all()
+        try:
+            asyncio.get_running_loop().create_task(wake())
+        except RuntimeError:
+            pass
+
+    def summary(self):
+        counts = ", ".join(f"{k}: {v}" for k, v in sorted(self.counts.items(), key=lambda kv: str(kv[0])))
+        return f"응답 집계 [{counts or '없음'}], 동시성 한도 현재 {int(self.limit)} / 최대 {self.peak}"
@@ -0,0 +1,67 @@
+# Gemini 응답 디스크 캐시 (내용 주소 기반)
+# - 키: sha256(모델 이름 + 생성 설정(generationConfig) + 공통 지시문(systemInstruction) + 프롬프트 전문)
+#   → 배치 데이터·월 평균·지시문·모델 중 하나라도 바뀌면 다른 키가 되어 API 를 다시 호출
+# - 값: 파싱이 끝난 응답(JSON) + 저장 시각 (data/processed/cache/gemini/<키 앞 2자리>/<키>.json)
+# - ttl(초)을 지정하면 그보다 오래된 항목은 없는 것으로 간주
+#
+# 파싱에 성공한 응답만 저장 (오류/빈 응답은 다음 실행에서 다시 호출)
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+
+def default_cache_dir():
+    return Path(__file__).resolve().parent.parent / 'data' / 'processed' / 'cache' / 'gemini'
+
+
+def cache_key(model, generation_config, prompt, system_instruction=None):
+    payload = json.dumps(
+        {'model': model, 'generation_config': generation_config, 'prompt': prompt,
+         'system_instruction': system_instruction},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """파싱된 Gemini 응답을 키별 JSON 파일로 저장/조회"""
+
+    def __init__(self, cache_dir=None, ttl=None):
+        self.cache_dir = Path(cache_dir or default_cache_dir())
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """저장된 응답 (없거나 만료/손상되었으면 None)"""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+        if self.ttl is not None and time.time() - entry.get('created_at', 0) > self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry['response']
+
+    def put(self, key, response, model=None):
+        """응답 저장 (임시 파일에 쓴 뒤 교체 → 동시 실행/중단 시에도 반쯤 쓰인 파일이 남지 않음)"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {'created_at': time.time(), 'model': model, 'response': response}
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding='utf-8')
+        tmp.replace(path)
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0
+        return f"캐시 적중 {self.hits}건 / 호출 {self.misses}건 (적중률 {rate:.0%})"
@@ -0,0 +1,77 @@
+# 시트 단위 파싱 결과 캐시 (내용 해시 기반 증분 ETL)
+# - 키: 시트 XML + 참조 공유 문자열 + 스타일 해시 + CACHE_VERSION (excel_reader.sheet_fingerprints)
+# - 값: 정제된 시트 DataFrame 을 Parquet 로 저장 (data/processed/cache/<워크북 이름>-<경로 해시>/<해시>.parquet)
+#   (다른 폴더의 같은 이름 워크북이 서로의 캐시 조각을 지우지 않도록 절대 경로 해시로 구분)
+# - 내용이 바뀐 시트만 다시 파싱하고, 최종 결과는 캐시 조각을 이어 붙여 재구성
+#
+# 정제 로직(process_sheet 등)이 바뀌면 CACHE_VERSION 을 올려서 전체 캐시를 무효화할 것
+
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from excel_reader import process_workbook, sheet_fingerprints
+
+CACHE_VERSION = '1'
+MANIFEST_NAME = 'manifest.json'
+
+
+def default_cache_dir():
+    return Path(__file__).resolve().parent.parent / 'data' / 'processed' / 'cache'
+
+
+def workbook_cache_dir(path, cache_dir=None):
+    """워크북별 캐시 폴더 (이름은 사람이 알아보기 쉽게 stem, 뒤에 절대 경로의 짧은 해시)"""
+    path = Path(path)
+    digest = hashlib.sha256(str(path.resolve()).encode('utf-8')).hexdigest()[:12]
+    return Path(cache_dir or default_cache_dir()) / f"{path.stem}-{digest}"
+
+
+def _write_part(df, path):
+    """시트 결과를 Parquet 로 저장 (임시 파일에 쓴 뒤 교체)"""
+    tmp = path.with_suffix('.tmp')
+    df.to_parquet(tmp, index=False)
+    tmp.replace(path)
+
+
+def process_workbook_cached(path, processor, columns, cache_dir=None, max_workers=None, executor=None):
+    """
+    process_workbook 의 캐시 버전
+    - processor(sheet_name, head_df, body_df) 결과를 시트 해시별로 저장/재사용
+    - 결과가 없는 시트(None)도 columns 로 만든 빈 프레임으로 캐시하여 다음 실행에서 건너뜀
+    - 반환: [(sheet_name, DataFrame 또는 None, 오류 메시지 또는 None, 캐시 적중 여부)] (시트 순서 유지)
+    """
+    path = Path(path)
+    cache_dir = workbook_cache_dir(path, cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    fingerprints = sheet_fingerprints(path, salt=CACHE_VERSION)
+    parts = {name: cache_dir / f"{digest}.parquet" for name, digest in fingerprints.items()}
+    stale = [name for name, part in parts.items() if not part.exists()]
+
+    fresh = {}
+    processed = process_workbook(path, processor, sheet_names=stale, max_workers=max_workers, executor=executor)
+    for sheet_name, df, error in processed:
+        fresh[sheet_name] = (df, error)
+        if error is None:
+            _write_part(pd.DataFrame(columns=columns) if df is None else df, parts[sheet_name])
+
+    results = []
+    for sheet_name, part in parts.items():
+        if sheet_name in fresh:
+            df, error = fresh[sheet_name]
+            results.append((sheet_name, df, error, False))
+        else:
+            results.append((sheet_name, pd.read_parquet(part), None, True))
+
+    # 현재 워크북에서 더 이상 참조하지 않는 캐시 조각 정리
+    keep = {part.name for part in parts.values()}
+    for old in cache_dir.glob('*.parquet'):
+        if old.name not in keep:
+            old.unlink(missing_ok=True)
+    manifest = {'version': CACHE_VERSION, 'source': str(path), 'sheets': fingerprints}
+    (cache_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    return results
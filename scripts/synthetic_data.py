@@ -0,0 +1,207 @@
+# 벤치마크/부하 테스트용 합성 운행 데이터 생성기
+# 실제 driving_logs 와 동일한 스키마 및 데이터 특성을 재현:
+#   - 2019-05 스키마 변화: 이전에는 speed/time 기록, 이후에는 cumulative_distance 기록
+#   - 여러 차량, 'HH:MM:SS' 문자열 시간, 주유/요소수의 간헐적 기록(NaN), 일부 결측 및 오타
+#
+# 사용법:
+#   python scripts/synthetic_data.py --rows 100000                       # data/benchmarks/fleet_100k.db (SQLite)
+#   python scripts/synthetic_data.py --rows 1M --url mysql+pymysql://...  # MariaDB 에 적재
+
+import argparse
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, inspect, text
+
+START_DATE = pd.Timestamp('2016-01-01')
+END_DATE = pd.Timestamp('2020-12-31')
+SCHEMA_SHIFT_DATE = pd.Timestamp('2019-05-01')
+
+BASE_VEHICLES = ['MAN TGX', 'Daewoo Prima', 'Scania']
+
+DB_COLUMNS = [
+    'date', 'vehicle_id', 'fuel_efficiency', 'speed', 'time',
+    'distance', 'cumulative_distance', 'consumed_fuel', 'refuel', 'reurea'
+]
+
+# SQLite 대체 DB 용 DDL (db_initializer 의 MariaDB 스키마와 동일한 컬럼 구성)
+SQLITE_DDL = """
+CREATE TABLE driving_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date DATE,
+    vehicle_id VARCHAR(50),
+    fuel_efficiency FLOAT,
+    speed FLOAT,
+    time VARCHAR(20),
+    distance FLOAT,
+    cumulative_distance FLOAT,
+    consumed_fuel FLOAT,
+    refuel FLOAT,
+    reurea FLOAT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def parse_size(value):
+    """'10k', '1M', '250000' → 정수"""
+    value = str(value).strip().lower().replace('_', '')
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(value[-1], 1)
+    number = value[:-1] if value[-1] in 'km' else value
+    return int(float(number) * multiplier)
+
+
+def format_size(n):
+    """정수 → '10k', '1M' 형식"""
+    if n >= 1_000_000 and n % 1_000_000 == 0:
+        return f"{n // 1_000_000}M"
+    if n >= 1_000 and n % 1_000 == 0:
+        return f"{n // 1_000}k"
+    return str(n)
+
+
+def _vehicle_names(n_vehicles):
+    names = list(BASE_VEHICLES[:n_vehicles])
+    names += [f"Truck-{i:04d}" for i in range(len(names) + 1, n_vehicles + 1)]
+    return names
+
+
+def _format_hms(hours):
+    """실수 시간 배열 → 'HH:MM:SS' 문자열 (NaN 은 None)"""
+    valid = ~np.isnan(hours)
+    total_minutes = np.zeros(len(hours), dtype=np.int64)
+    total_minutes[valid] = np.round(hours[valid] * 60).astype(np.int64)
+    h = pd.Series(total_minutes // 60).astype(str).str.zfill(2)
+    m = pd.Series(total_minutes % 60).astype(str).str.zfill(2)
+    out = h + ':' + m + ':00'
+    return out.where(valid, None)
+
+
+def generate_driving_logs(n_rows, n_vehicles=None, seed=42):
+    """
+    합성 운행 데이터 생성 (날짜 오름차순, 차량별 하루 1행)
+    - n_vehicles 가 없으면 2016~2020 기간에 n_rows 가 들어가도록 차량 수를 자동 결정
+    """
+    rng = np.random.default_rng(seed)
+    n_days = (END_DATE - START_DATE).days + 1
+    if n_vehicles is None:
+        n_vehicles = max(len(BASE_VEHICLES), math.ceil(n_rows / n_days))
+
+    idx = np.arange(n_rows)
+    vehicle_idx = idx % n_vehicles
+    dates = START_DATE + pd.to_timedelta(idx // n_vehicles, unit='D')
+    vehicles = np.array(_vehicle_names(n_vehicles), dtype=object)[vehicle_idx]
+
+    # 운행량: 휴무일(약 10%)은 거리 0
+    distance = np.round(rng.gamma(shape=9.0, scale=50.0, size=n_rows), 1)
+    distance[rng.random(n_rows) < 0.10] = 0.0
+    efficiency = np.round(np.clip(rng.normal(3.2, 0.4, n_rows), 1.8, 5.0), 2)
+    consumed_fuel = np.round(distance / efficiency, 2)
+
+    # 2019-05 이전: 속도/시간 기록, 이후: 누적 주행거리 기록
+    old_schema = np.asarray(dates < SCHEMA_SHIFT_DATE)
+    speed = np.round(np.clip(rng.normal(62, 8, n_rows), 25, 105), 1)
+    hours = np.where(speed > 0, distance / speed, np.nan)
+    speed = np.where(old_schema, speed, np.nan)
+    hours = np.where(old_schema & (distance > 0), hours, np.nan)
+
+    odometer_base = rng.uniform(100_000, 400_000, n_vehicles)
+    cumulative = pd.Series(distance).groupby(vehicle_idx).cumsum().to_numpy() + odometer_base[vehicle_idx]
+    cumulative = np.where(old_schema, np.nan, np.round(cumulative, 0))
+
+    # 주유: 약 1/3 일자에만 기록, 요소수: 5% 일자에 20L (일부 1/2/6 단위 오기)
+    refuel = np.where(rng.random(n_rows) < 0.33, np.round(rng.uniform(150, 400, n_rows), 1), np.nan)
+    reurea = np.where(rng.random(n_rows) < 0.05, 20.0, np.nan)
+    typo = rng.random(n_rows) < 0.005
+    reurea[typo] = rng.choice([1.0, 2.0, 6.0], size=int(typo.sum()))
+
+    df = pd.DataFrame({
+        'date': dates.date,
+        'vehicle_id': vehicles,
+        'fuel_efficiency': efficiency,
+        'speed': speed,
+        'time': _format_hms(hours),
+        'distance': distance,
+        'cumulative_distance': cumulative,
+        'consumed_fuel': consumed_fuel,
+        'refuel': refuel,
+        'reurea': reurea,
+    })
+
+    # 수기 입력 특유의 산발적 결측 (1%)
+    for col in ['fuel_efficiency', 'consumed_fuel']:
+        df.loc[rng.random(n_rows) < 0.01, col] = np.nan
+
+    return df[DB_COLUMNS]
+
+
+def load_into_database(df, url, chunksize=50_000):
+    """driving_logs 테이블을 새로 만들고 데이터 적재 후 엔진 반환"""
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS driving_logs"))
+        if engine.dialect.name == 'sqlite':
+            conn.execute(text(SQLITE_DDL))
+        else:
+            conn.execute(text(SQLITE_DDL.replace('INTEGER PRIMARY KEY AUTOINCREMENT', 'INT AUTO_INCREMENT PRIMARY KEY')))
+    df.to_sql('driving_logs', engine, if_exists='append', index=False, chunksize=chunksize)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE INDEX idx_driving_logs_date ON driving_logs (date)"))
+        conn.execute(text("CREATE UNIQUE INDEX uq_vehicle_date ON driving_logs (vehicle_id, date)"))
+    return engine
+
+
+def build_sqlite_fixture(n_rows, path, seed=42):
+    """SQLite 대체 DB 파일 생성 (이미 있으면 재사용, 예전 스키마면 다시 생성)"""
+    path = Path(path)
+    if path.exists():
+        engine = create_engine(f"sqlite:///{path}")
+        if 'updated_at' in {c['name'] for c in inspect(engine).get_columns('driving_logs')}:
+            return engine
+        engine.dispose()
+        path.unlink()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df = generate_driving_logs(n_rows, seed=seed)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.unlink(missing_ok=True)
+    load_into_database(df, f"sqlite:///{tmp_path}").dispose()
+    tmp_path.rename(path)
+    return create_engine(f"sqlite:///{path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 운행 데이터 생성 및 DB 적재")
+    parser.add_argument('--rows', default='100k', help="생성할 행 수 (예: 10k, 1M, 10M)")
+    parser.add_argument('--vehicles', type=int, default=None, help="차량 수 (기본: 자동)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--url', default=None, help="적재 대상 SQLAlchemy URL (기본: SQLite 파일)")
+    parser.add_argument('--csv', default=None, help="CSV 로도 저장할 경로 (선택)")
+    args = parser.parse_args()
+
+    n_rows = parse_size(args.rows)
+    project_root = Path(__file__).resolve().parent.parent
+    url = args.url or f"sqlite:///{project_root / 'data' / 'benchmarks' / f'fleet_{format_size(n_rows)}.db'}"
+    if url.startswith('sqlite:///'):
+        Path(url[len('sqlite:///'):]).parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"🚚 합성 데이터 생성 중... ({n_rows:,}행)")
+    start = time.perf_counter()
+    df = generate_driving_logs(n_rows, n_vehicles=args.vehicles, seed=args.seed)
+    print(f"   - 생성 완료: {time.perf_counter() - start:.1f}s, 차량 {df['vehicle_id'].nunique()}대, "
+          f"기간 {df['date'].min()} ~ {df['date'].max()}")
+
+    if args.csv:
+        df.to_csv(args.csv, index=False, encoding='utf-8-sig')
+        print(f"   - CSV 저장: {args.csv}")
+
+    start = time.perf_counter()
+    load_into_database(df, url).dispose()
+    print(f"🎉 DB 적재 완료: {url} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()